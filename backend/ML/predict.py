@@ -2,7 +2,6 @@
 import sys
 sys.path.append('/app')
 
-import redis
 import pandas as pd
 import numpy as np
 
@@ -12,6 +11,7 @@ from sklearn.preprocessing import LabelEncoder
 from datetime import datetime, timedelta
 import requests
 from database.redis_client import PedestrianRedisClient
+from database.calendar_bitmaps import DAY_FLAGS, HOUR_FLAGS
 import config
 import logging
 
@@ -255,13 +255,39 @@ def create_weather_features(df):
     df = pd.concat([df, pd.get_dummies(df['temp_band'], prefix='temp')], axis=1)
     return df
 
-def add_wurzburg_events(df):
-    eventsDf = pd.read_csv("data/events_daily.csv")
-    lecturesDf = pd.read_csv("data/lectures_daily.csv")
+def load_calendar_features(redis_client, dates):
+    """
+    Builds the calendar feature tables (same columns as data/*_daily.csv) from
+    the Redis calendar bitmaps in one round trip. Returns None if the bitmaps
+    have not been built, so the CSV files are used instead.
+    """
+    start, end = min(dates), max(dates)
+    try:
+        flags = redis_client.get_calendar_flags(start, end)
+    except ValueError as e:
+        logger.warning(f"{e}, using CSV calendar data")
+        return None
+
+    days = pd.date_range(start, end, freq='D').strftime('%Y-%m-%d')
+    daily = pd.DataFrame({'date': days, **{flag: flags[flag].astype('int64') for flag in DAY_FLAGS}})
+    hourly = pd.DataFrame({
+        'date': np.repeat(days, 24),
+        'hour': np.tile(np.arange(24, dtype='int64'), len(days)),
+        **{flag: flags[flag].reshape(-1).astype('int64') for flag in HOUR_FLAGS}
+    })
+    return daily, hourly
 
-    # Split up date in eventsDf into date and hour
-    eventsDf['hour'] = pd.to_datetime(eventsDf['date']).dt.hour.astype('int64')
-    eventsDf['date'] = pd.to_datetime(eventsDf['date']).dt.date.astype('str')
+def add_wurzburg_events(df, calendar=None):
+    if calendar is not None:
+        daily, eventsDf = calendar
+        lecturesDf = daily[['date', 'lecture_period_jmu']]
+    else:
+        eventsDf = pd.read_csv("data/events_daily.csv")
+        lecturesDf = pd.read_csv("data/lectures_daily.csv")
+
+        # Split up date in eventsDf into date and hour
+        eventsDf['hour'] = pd.to_datetime(eventsDf['date']).dt.hour.astype('int64')
+        eventsDf['date'] = pd.to_datetime(eventsDf['date']).dt.date.astype('str')
 
     df = df.merge(eventsDf, on=['date', 'hour'], how='left')
     df = df.merge(lecturesDf, on='date', how='left')
@@ -270,9 +296,14 @@ def add_wurzburg_events(df):
 
     return df
 
-def add_enhanced_holiday_features(df):
-    publicHolidaysDf = pd.read_csv("data/bavarian_public_holidays_daily.csv")
-    schoolHolidaysDf = pd.read_csv("data/bavarian_school_holidays_daily.csv")
+def add_enhanced_holiday_features(df, calendar=None):
+    if calendar is not None:
+        daily, _ = calendar
+        publicHolidaysDf = daily[['date', 'public_holiday', 'nationwide']]
+        schoolHolidaysDf = daily[['date', 'school_holiday']]
+    else:
+        publicHolidaysDf = pd.read_csv("data/bavarian_public_holidays_daily.csv")
+        schoolHolidaysDf = pd.read_csv("data/bavarian_school_holidays_daily.csv")
 
     df = df.merge(publicHolidaysDf, on='date', how='left')
 
@@ -322,14 +353,14 @@ def create_seasonal_features(df):
     df['is_weekend_tourist_season'] = (df['is_weekend'] & df['is_tourist_season']).astype(int)
     return df
 
-def create_all_features(df, is_train=True, train_avg_values=None):
+def create_all_features(df, is_train=True, train_avg_values=None, calendar=None):
     original_index = df.index
     df = create_base_time_features(df)
     df = create_time_block_features(df)
     df = create_weather_features(df)
     df = create_seasonal_features(df)
-    df = add_wurzburg_events(df)
-    df = add_enhanced_holiday_features(df)
+    df = add_wurzburg_events(df, calendar)
+    df = add_enhanced_holiday_features(df, calendar)
     df = create_interaction_features(df)
     df = add_street_features(df)
     
@@ -398,12 +429,7 @@ def predict_model(input_csv: str, model_path: str, output_csv: str = "prediction
 
 def run_predictions_and_store():
     # Redis connection
-    r = redis.Redis(
-        host=config.REDIS_HOST,
-        port=config.REDIS_PORT,
-        db=0,
-        decode_responses=True
-    )
+    redis_client = PedestrianRedisClient(host=config.REDIS_HOST, port=config.REDIS_PORT)
 
     logger.info("Starting prediction generation...")
 
@@ -433,7 +459,8 @@ def run_predictions_and_store():
 
         # FEATURE ENGINEERING
         logging.info("Creating features...")
-        df_features = create_all_features(df_future, is_train=False)
+        calendar = load_calendar_features(redis_client, df_future['date'])
+        df_features = create_all_features(df_future, is_train=False, calendar=calendar)
 
         # LOAD MODEL AND PREDICT
         print(" Loading trained model...")
@@ -445,7 +472,8 @@ def run_predictions_and_store():
         df_features["n_pedestrians"] = model.predict(X_future)
 
         # STORE PREDICTIONS IN REDIS
-        total_predictions = 0
+        predictions = []
+        generated_at = datetime.now().isoformat()
 
         base_cols = [
             'id', 'streetname', 'date', 'hour', 'temperature', 'weather_condition',
@@ -458,9 +486,6 @@ def run_predictions_and_store():
             date = row["date"]
             hour = str(int(row["hour"]))
 
-            # PREDICTION key prefix
-            key = f"pedestrian:hourly:prediction:{street_normalized}:{date}:{hour}"
-
             # Build data dict
             data = {
                 "id": row["id"],
@@ -475,18 +500,16 @@ def run_predictions_and_store():
                 "incidents": row["incidents"],
                 'collection_type': row['collection_type'],
                 "data_type": "prediction",
-                "generated_at": datetime.now().isoformat()
+                "generated_at": generated_at,
+                "timestamp": f"{date}T{hour.zfill(2)}:00:00"
             }
 
             # Remove null values
             data = {k: v for k, v in data.items() if pd.notna(v) and str(v).strip()}
+            predictions.append(data)
 
-            # Store in Redis
-            r.hset(key, mapping=data)
-            r.expire(key, 60 * 60 * 24 * 9) # 9-days
-
-            # Counter
-            total_predictions += 1
+        # One pipeline: prediction hashes, per-street index and status hash
+        total_predictions = redis_client.store_predictions(predictions, ttl=60 * 60 * 24 * 9) # 9-days
         
         logger.info(f"Total predictions stored: {total_predictions}")
 
@@ -18,51 +18,110 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import lightgbm as lgb
 import xgboost as xgb
 from sklearn.preprocessing import LabelEncoder
+import json
 import requests
 from tqdm import tqdm
 
+try:
+    import pyarrow as pa
+except ImportError:  # ohne pyarrow: NDJSON-Stream
+    pa = None
+
 BASE_URL = "http://localhost:8000"
 
+PEDESTRIAN_COLUMNS = [
+    "id", "streetname", "city", "date", "hour", "n_pedestrians", "n_pedestrians_towards",
+    "n_pedestrians_away", "temperature", "weather_condition", "incidents", "collection_type"
+]
+
+def _normalize_incidents(value):
+    return value if value in ["incidents", "no_incident"] else "no_incident"
+
+def _fetch_pedestrian_frame_arrow(base_url, street):
+    """
+    Fast path: typed Arrow IPC stream, read batch by batch without JSON parsing.
+    """
+    response = requests.get(
+        f"{base_url}/api/pedestrians/all",
+        params={"street": street, "format": "arrow"},
+        stream=True
+    )
+    response.raise_for_status()
+
+    batches = []
+    with response, tqdm(desc=f"Loading pedestrian entries for {street}", unit=" rows") as progress:
+        reader = pa.ipc.open_stream(response.raw)
+        for batch in reader:
+            batches.append(batch)
+            progress.update(batch.num_rows)
+
+    df = pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+    df = df.rename(columns={"street": "streetname"})
+    # Dictionary-Spalten kommen als Categorical; Feature-Code erwartet Strings
+    for col in df.select_dtypes(include="category").columns:
+        df[col] = df[col].astype(object)
+    df["incidents"] = df["incidents"].map(_normalize_incidents)
+    return df[PEDESTRIAN_COLUMNS]
+
+def _fetch_pedestrian_frame_ndjson(base_url, street):
+    """
+    Fallback without pyarrow: NDJSON stream, rows are processed while the server is still reading.
+    """
+    response = requests.get(
+        f"{base_url}/api/pedestrians/all",
+        params={"street": street, "format": "ndjson"},
+        stream=True
+    )
+    response.raise_for_status()
+
+    records = []
+    with response:
+        try:
+            lines = response.iter_lines(chunk_size=64 * 1024)
+            for line in tqdm(lines, desc=f"Processing pedestrian entries for {street}", unit=" rows"):
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                    records.append({
+                        "id": item.get("id"),
+                        "streetname": item.get("street"),
+                        "city": item.get("city"),
+                        "date": item.get("date"),
+                        "hour": item.get("hour"),
+                        "n_pedestrians": item.get("n_pedestrians"),
+                        "n_pedestrians_towards": item.get("n_pedestrians_towards"),
+                        "n_pedestrians_away": item.get("n_pedestrians_away"),
+                        "temperature": item.get("temperature"),
+                        "weather_condition": item.get("weather_condition"),
+                        "incidents": _normalize_incidents(item.get("incidents", "no_incident")),
+                        "collection_type": item.get("collection_type")
+                    })
+                except Exception as e:
+                    print(f" Skipped entry due to error: {e}")
+        except Exception as e:
+            # Stream abgebrochen: bereits gelesene Zeilen behalten
+            print(f"Pedestrian data stream for {street} interrupted: {e}")
+
+    return pd.DataFrame(records, columns=PEDESTRIAN_COLUMNS)
+
 def load_pedestrian_data_from_api(base_url=f"{BASE_URL}"):
     """
     Fetch all available pedestrian data from the API for all streets and return as a single DataFrame.
+    Uses the Arrow format when pyarrow is installed, otherwise the NDJSON stream.
     """
     streets = ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]
-    all_records = []
+    fetch = _fetch_pedestrian_frame_arrow if pa is not None else _fetch_pedestrian_frame_ndjson
+    frames = []
 
     for street in streets:
         try:
-            response = requests.get(f"{base_url}/api/pedestrians/all", params={"street": street})
-            response.raise_for_status()
-            data = response.json().get("data", [])
+            frames.append(fetch(base_url, street))
         except Exception as e:
             print(f"Failed to fetch pedestrian data for {street}: {e}")
             continue
 
-        for item in tqdm(data, desc=f"Processing pedestrian entries for {street}"):
-            try:
-                incidents_value = item.get("incidents", "no_incident")
-                if incidents_value not in ["incidents", "no_incident"]:
-                    incidents_value = "no_incident"
-
-                all_records.append({
-                    "id": item.get("id"),
-                    "streetname": item.get("street"),
-                    "city": item.get("city"),
-                    "date": item.get("date"),
-                    "hour": item.get("hour"),
-                    "n_pedestrians": item.get("n_pedestrians"),
-                    "n_pedestrians_towards": item.get("n_pedestrians_towards"),
-                    "n_pedestrians_away": item.get("n_pedestrians_away"),
-                    "temperature": item.get("temperature"),
-                    "weather_condition": item.get("weather_condition"),
-                    "incidents": incidents_value,
-                    "collection_type": item.get("collection_type")
-                })
-            except Exception as e:
-                print(f" Skipped entry due to error: {e}")
-
-    df = pd.DataFrame(all_records)
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PEDESTRIAN_COLUMNS)
 
     # ✅ Fix dtypes
     df['date'] = pd.to_datetime(df['date'], errors='coerce')
@@ -0,0 +1,68 @@
+# backend/api/conditional.py
+"""
+Bedingte GETs (ETag / If-None-Match) für die Lese-Endpoints.
+
+Das ETag wird aus den Versionszählern der betroffenen Daten und der Anfrage
+gebildet, nicht aus der Antwort: Hourly-Schreibpfade zählen
+``pedestrian:version:{street}`` hoch (``history``/``all``, siehe
+database/day_cache.py), ``store_predictions`` das Feld ``predictions``, die
+Import-Skripte ``reference:version`` (siehe database/reference_data.py). Ein
+Endpoint liest nur diese Zähler (ein HMGET) und antwortet bei passendem
+``If-None-Match`` mit 304, ohne die Daten-Keys anzufassen.
+
+Abgeschlossene Zeiträume (Ende vor dem Nachlade-Fenster des Schedulers) hängen
+nur vom ``history``-Zähler ab und dürfen ``HTTP_CLOSED_RANGE_MAX_AGE`` Sekunden
+gecacht werden; alles andere mit ``no-cache`` (Browser fragt jedes Mal per
+If-None-Match nach).
+"""
+import hashlib
+import json
+from typing import Dict, Optional
+
+from fastapi import Response
+
+import config
+from database.day_cache import mutable_cutoff
+
+
+def is_closed_range(end_date: str) -> bool:
+    return end_date < mutable_cutoff(config.DAY_CACHE_MUTABLE_DAYS)
+
+
+def range_version(versions: Dict[str, int], end_date: str) -> tuple:
+    """Maßgeblicher Zähler für einen Zeitraum: history (abgeschlossen) oder all"""
+    field = 'history' if is_closed_range(end_date) else 'all'
+    return field, versions.get(field, 0)
+
+
+def data_etag(scope: str, versions, **query) -> str:
+    """Starkes ETag aus Endpoint, Versionszählern und Anfrageparametern"""
+    payload = json.dumps([scope, versions, sorted(query.items())], default=str, ensure_ascii=False)
+    return '"' + hashlib.sha256(payload.encode()).hexdigest()[:32] + '"'
+
+
+def cache_control(end_date: Optional[str] = None) -> str:
+    if end_date is not None and is_closed_range(end_date) and config.HTTP_CLOSED_RANGE_MAX_AGE:
+        return f"public, max-age={config.HTTP_CLOSED_RANGE_MAX_AGE}"
+    return "no-cache"
+
+
+def validators(etag: str, cache: str) -> Dict[str, str]:
+    return {'ETag': etag, 'Cache-Control': cache}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match vergleicht schwach: W/-Präfix ignorieren
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(','))
+    return etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+
+
+def not_modified(if_none_match: Optional[str], headers: Dict[str, str]) -> Optional[Response]:
+    """304-Antwort, wenn der Client den aktuellen Stand hat; sonst None"""
+    if etag_matches(if_none_match, headers['ETag']):
+        return Response(status_code=304, headers=headers)
+    return None
@@ -0,0 +1,222 @@
+# backend/api/export.py
+"""
+Export-Formate für ``/api/pedestrians/all``, ``/historical`` und ``/predictions``.
+
+``json`` liefert wie bisher ein Dokument. ``ndjson`` und ``csv`` werden als
+StreamingResponse erzeugt: pro ``EXPORT_CHUNK_SIZE`` Datensätze ein Chunk, der
+Speicherbedarf der API bleibt unabhängig von der Länge der Historie und der
+Client kann sofort parsen.
+
+``arrow`` (IPC-Stream) und ``parquet`` sind spaltenweise und typisiert
+(``HISTORY_COLUMNS`` / ``PREDICTION_COLUMNS``): pro Chunk ein RecordBatch bzw.
+eine Row-Group, direkt aus den Datensätzen der Redis-Abfrage, ohne Antwort-Dicts
+und JSON. pyarrow wird erst beim ersten Arrow/Parquet-Export importiert.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+EXPORT_CHUNK_SIZE = 1000
+
+# Starlette hängt bei text/* selbst "; charset=utf-8" an
+EXPORT_MEDIA_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Spaltenreihenfolge im CSV (Felder eines Stunden-Datensatzes)
+EXPORT_FIELDS = (
+    'id', 'street', 'city', 'date', 'hour', 'weekday',
+    'n_pedestrians', 'n_pedestrians_towards', 'n_pedestrians_away',
+    'temperature', 'weather_condition', 'incidents', 'collection_type', 'timestamp',
+)
+
+# (Feld, Typ) der Spalten; category = Dictionary-kodierter String
+HISTORY_COLUMNS = (
+    ('id', 'string'), ('street', 'category'), ('city', 'category'), ('date', 'date'), ('hour', 'int8'),
+    ('weekday', 'category'), ('n_pedestrians', 'int32'), ('n_pedestrians_towards', 'int32'),
+    ('n_pedestrians_away', 'int32'), ('temperature', 'float64'), ('weather_condition', 'category'),
+    ('incidents', 'category'), ('collection_type', 'category'), ('timestamp', 'string'),
+)
+PREDICTION_COLUMNS = (
+    ('id', 'string'), ('street', 'category'), ('city', 'category'), ('date', 'date'), ('hour', 'int8'),
+    ('weekday', 'category'), ('n_pedestrians', 'float64'), ('temperature', 'float64'),
+    ('weather_condition', 'category'), ('incidents', 'category'), ('collection_type', 'category'),
+    ('data_type', 'category'), ('prediction_generated_at', 'string'), ('timestamp', 'string'),
+)
+
+
+def negotiate_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """``?format=`` hat Vorrang, sonst Accept-Header; Standard ist json"""
+    if requested:
+        if requested not in EXPORT_MEDIA_TYPES:
+            raise ValueError(f"Unknown export format: {requested} ({', '.join(EXPORT_MEDIA_TYPES)})")
+        return requested
+
+    for part in (accept or '').split(','):
+        media_type = part.split(';')[0].strip()
+        for name, candidate in EXPORT_MEDIA_TYPES.items():
+            if media_type == candidate:
+                return name
+    return 'json'
+
+
+def encode_ndjson(records: Iterable[Dict]) -> str:
+    return ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
+
+
+def encode_csv(records: Iterable[Dict], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction='ignore', lineterminator='\n')
+    if header:
+        writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+async def stream_records(records: AsyncIterator[Dict], export_format: str,
+                         chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[str]:
+    """Datensätze blockweise als NDJSON- bzw. CSV-Text (CSV mit Kopfzeile im ersten Chunk)"""
+    first = True
+    chunk: List[Dict] = []
+
+    def encode() -> str:
+        if export_format == 'csv':
+            return encode_csv(chunk, header=first)
+        return encode_ndjson(chunk)
+
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield encode()
+            first = False
+            chunk = []
+
+    if chunk or (first and export_format == 'csv'):
+        yield encode()
+
+
+# ============================================
+# SPALTENFORMATE (ARROW / PARQUET)
+# ============================================
+
+def _arrow_type(pa, kind: str):
+    return {
+        'string': pa.string(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'date': pa.date32(),
+        'int8': pa.int8(),
+        'int32': pa.int32(),
+        'float64': pa.float64(),
+    }[kind]
+
+
+def arrow_schema(columns: Tuple):
+    import pyarrow as pa
+    return pa.schema([(field, _arrow_type(pa, kind)) for field, kind in columns])
+
+
+def _numbers(records: List[Dict], field: str) -> np.ndarray:
+    # Hash-Codec liefert Strings, Record-Codec int/float; fehlend -> NaN
+    return np.array([
+        value if (value := record.get(field)) not in (None, '') else np.nan for record in records
+    ], dtype=np.float64)
+
+
+def records_to_batch(records: List[Dict], columns: Tuple):
+    """Datensätze -> typisierter RecordBatch (eine Spalte pro Feld, fehlende Werte null)"""
+    import pyarrow as pa
+
+    arrays = []
+    for field, kind in columns:
+        if kind in ('int8', 'int32', 'float64'):
+            values = _numbers(records, field)
+            arrays.append(pa.array(values, mask=np.isnan(values)).cast(_arrow_type(pa, kind)))
+            continue
+
+        values = pa.array(
+            [str(value) if (value := record.get(field)) not in (None, '') else None for record in records],
+            type=pa.string()
+        )
+        if kind == 'date':
+            values = values.cast(pa.date32())
+        elif kind == 'category':
+            values = values.dictionary_encode()
+        arrays.append(values)
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema(columns))
+
+
+class _ChunkSink:
+    """Dateiobjekt für pyarrow-Writer; geschriebene Bytes werden per ``drain`` abgeholt"""
+
+    def __init__(self):
+        self._parts = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._parts = b''.join(self._parts), []
+        return data
+
+
+def _columnar_writer(sink: _ChunkSink, export_format: str, columns: Tuple):
+    import pyarrow as pa
+
+    schema = arrow_schema(columns)
+    if export_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        return writer, lambda batch: writer.write_table(pa.Table.from_batches([batch]))
+    writer = pa.ipc.new_stream(sink, schema)
+    return writer, writer.write_batch
+
+
+async def stream_columnar(records: AsyncIterator[Dict], export_format: str, columns: Tuple,
+                          chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Arrow-IPC-Stream bzw. Parquet-Datei, pro Chunk ein RecordBatch / eine Row-Group.
+    Arrow kann der Client batchweise lesen; Parquet erst nach dem Footer (Ende).
+    """
+    sink = _ChunkSink()
+    writer, write = _columnar_writer(sink, export_format, columns)
+    chunk: List[Dict] = []
+
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            write(records_to_batch(chunk, columns))
+            chunk = []
+            yield sink.drain()
+
+    if chunk:
+        write(records_to_batch(chunk, columns))
+    writer.close()
+    yield sink.drain()
+
+
+async def iterate(records: Iterable[Dict]) -> AsyncIterator[Dict]:
+    """Bereits geladene Datensätze als AsyncIterator (für stream_records / stream_columnar)"""
+    for record in records:
+        yield record
+
+
+def export_stream(records: AsyncIterator[Dict], export_format: str, columns: Tuple = HISTORY_COLUMNS):
+    """Passender Chunk-Generator für ein gestreamtes Format"""
+    if export_format in ('arrow', 'parquet'):
+        return stream_columnar(records, export_format, columns)
+    return stream_records(records, export_format)
@@ -1,17 +1,47 @@
 # backend/api/main.py
-from fastapi import FastAPI, HTTPException, Path, Query
+from fastapi import FastAPI, HTTPException, Path, Query, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from datetime import datetime, timedelta
 from database.redis_client import PedestrianRedisClient
+from database.async_redis_client import AsyncPedestrianRedisClient
+from database.aggregation import parse_heatmap_metric
+from database.rollups import GRANULARITIES
+from api.conditional import (
+    data_etag, range_version, cache_control, validators, not_modified
+)
+from api.export import (
+    EXPORT_MEDIA_TYPES, HISTORY_COLUMNS, PREDICTION_COLUMNS, negotiate_format, export_stream, iterate
+)
 from pydantic import BaseModel, Field
+import asyncio
+import json
 import config
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Synchroner Client für selten genutzte Endpoints (laufen im Threadpool)
+redis_client = PedestrianRedisClient(host=config.REDIS_HOST, port=config.REDIS_PORT)
+
+# Asynchroner Client für die Dashboard-Endpoints, wird im Lifespan erstellt
+async_redis_client: Optional[AsyncPedestrianRedisClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global async_redis_client
+    async_redis_client = AsyncPedestrianRedisClient(host=config.REDIS_HOST, port=config.REDIS_PORT)
+    try:
+        yield
+    finally:
+        await async_redis_client.close()
+        async_redis_client = None
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Pedestrian Prediction API",
     description="""
     ## Würzburg Passantenzählungs- und Vorhersage-API
@@ -50,8 +80,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-redis_client = PedestrianRedisClient(host=config.REDIS_HOST, port=config.REDIS_PORT)
-
 # ============================================
 # PYDANTIC MODELS
 # ============================================
@@ -128,6 +156,19 @@ class PredictionData(BaseModel):
             }
         }
 
+# ============================================
+# CONDITIONAL GET (ETAG)
+# ============================================
+
+async def range_validators(scope: str, street: str, start_date: str, end_date: str, **query) -> dict:
+    """ETag und Cache-Control eines Zeitraum-Endpoints aus den Versionszählern der Straße (ein HMGET)"""
+    versions = await async_redis_client.get_data_versions([street])
+    etag = data_etag(
+        scope, range_version(versions[street], end_date),
+        street=street, start_date=start_date, end_date=end_date, **query
+    )
+    return validators(etag, cache_control(end_date))
+
 # ============================================
 # ENDPOINTS
 # ============================================
@@ -144,32 +185,94 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "historical": "/api/pedestrians/historical",
+            "summary": "/api/pedestrians/summary",
             "predictions": "/api/pedestrians/predictions",
             "streets": "/api/streets",
-            "statistics": "/api/statistics/{street}",
+            "statistics": "/api/pedestrians/statistics",
+            "heatmap": "/api/pedestrians/heatmap",
+            "rollup": "/api/pedestrians/rollup",
             "calendar": "/api/calendar/{date}",
+            "calendar_range": "/api/calendar",
             "events": "/api/events/{date}",
             "all_events": "/api/events/all_dates",
             "locations": "/api/locations"
         }
     }
 
+@app.get(
+    "/api/cache/stats",
+    summary="Day-Cache Statistiken",
+    description="Treffer, Fehlzugriffe, Verdrängungen und Speicherbedarf des In-Process-Caches für historische Tage; Stand des Stammdaten-Snapshots; Treffer des Vorhersage-Antwort-Caches.",
+    tags=["System"]
+)
+async def get_cache_stats():
+    snapshot = async_redis_client.reference_cache.snapshot
+    prediction_responses = async_redis_client.prediction_responses
+    return {
+        "day_cache": async_redis_client.get_cache_stats(),
+        "reference_data": snapshot.stats() if snapshot else None,
+        "prediction_responses": prediction_responses.stats() if prediction_responses else None,
+    }
+
 @app.get(
     "/api/pedestrians/all",
     summary="Alle historischen Passantendaten abrufen",
-    description="Ruft alle verfügbaren historischen Passantenzählungen für eine Straße ab (für Modelltraining).",
+    description="""
+    Ruft alle verfügbaren historischen Passantenzählungen für eine Straße ab (für Modelltraining).
+    
+    **Formate** (`format` oder Accept-Header):
+    - `json` (Standard): ein Dokument `{street, count, data}`
+    - `ndjson` (`application/x-ndjson`): ein Datensatz pro Zeile, gestreamt
+    - `csv` (`text/csv`): mit Kopfzeile, gestreamt
+    - `arrow` (`application/vnd.apache.arrow.stream`): typisierter Arrow-IPC-Stream
+    - `parquet` (`application/vnd.apache.parquet`): typisierte Parquet-Datei
+    
+    Die gestreamten Formate werden blockweise aus Redis gelesen und können
+    vom Client gelesen werden, bevor die letzte Zeile geschrieben ist (Parquet: erst am Ende).
+    """,
     tags=["Pedestrian Data"]
 )
-async def get_all_historical_data(street: str):
+async def get_all_historical_data(
+    response: Response,
+    street: str,
+    export_format: Optional[str] = Query(None, alias="format", description="json, ndjson, csv, arrow oder parquet"),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
     if street not in ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]:
         raise HTTPException(status_code=400, detail="Ungültiger Straßenname")
-    
+
     try:
-        # fetch everything at once using a very wide date range
-        data = redis_client.get_historical_range(street, "1900-01-01", "2100-12-31")
-        return {"street": street, "count": len(data), "data": data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        export_format = negotiate_format(export_format, accept)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Versionen und Daten vom selben Knoten (der Stream behält ihn bis zum Ende)
+    with async_redis_client.pinned_reads():
+        versions = await async_redis_client.get_data_versions([street])
+        headers = validators(
+            data_etag('all', ('all', versions[street]['all']), street=street, format=export_format),
+            cache_control()
+        )
+        cached = not_modified(if_none_match, headers)
+        if cached is not None:
+            return cached
+
+        if export_format != 'json':
+            records = async_redis_client.iter_historical_range(street, "1900-01-01", "2100-12-31")
+            return StreamingResponse(
+                export_stream(records, export_format, HISTORY_COLUMNS),
+                media_type=EXPORT_MEDIA_TYPES[export_format],
+                headers=headers
+            )
+
+        try:
+            # fetch everything at once using a very wide date range
+            data = await async_redis_client.get_historical_range(street, "1900-01-01", "2100-12-31")
+            response.headers.update(headers)
+            return {"street": street, "count": len(data), "data": data}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.get(
     "/api/streets",
@@ -186,7 +289,7 @@ async def get_all_historical_data(street: str):
     response_model=dict
 )
 async def get_streets():
-    locations = redis_client.get_all_locations()
+    locations = await async_redis_client.get_all_locations()
     
     return {
         "streets": [loc['street_name'] for loc in locations],
@@ -215,6 +318,7 @@ async def get_streets():
     - `start_date`: Startdatum im Format YYYY-MM-DD
     - `end_date`: Enddatum im Format YYYY-MM-DD
     - `limit`: (Optional) Maximale Anzahl Ergebnisse
+    - `format`: (Optional) json (Standard), ndjson, csv, arrow oder parquet; alternativ per Accept-Header
     
     **Beispiel:**
     GET /api/pedestrians/historical?street=Kaiserstraße&start_date=2019-04-02&end_date=2019-04-05
@@ -222,22 +326,48 @@ async def get_streets():
     tags=["Pedestrian Data"]
 )
 async def get_historical_data(
+    response: Response,
     street: str = Query(..., description="Straßenname", example="Kaiserstraße"),
     start_date: str = Query(..., description="Startdatum (YYYY-MM-DD)", example="2019-04-02"),
     end_date: str = Query(..., description="Enddatum (YYYY-MM-DD)", example="2019-04-05"),
-    limit: Optional[int] = Query(None, description="Max. Anzahl Ergebnisse", ge=1, le=10000)
+    limit: Optional[int] = Query(None, description="Max. Anzahl Ergebnisse", ge=1, le=10000),
+    export_format: Optional[str] = Query(None, alias="format", description="json, ndjson, csv, arrow oder parquet"),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
 ):
+    try:
+        export_format = negotiate_format(export_format, accept)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         if street not in ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]:
             raise HTTPException(status_code=400, detail="Ungültiger Straßenname. Verfügbar: Kaiserstraße, Spiegelstraße, Schönbornstraße")
         
         datetime.strptime(start_date, '%Y-%m-%d')
         datetime.strptime(end_date, '%Y-%m-%d')
-        
-        data = redis_client.get_historical_range(street, start_date, end_date)
+
+        with async_redis_client.pinned_reads():
+            headers = await range_validators(
+                'historical', street, start_date, end_date, limit=limit, format=export_format
+            )
+            cached = not_modified(if_none_match, headers)
+            if cached is not None:
+                return cached
+
+            data = await async_redis_client.get_historical_range(street, start_date, end_date)
         
         if limit:
             data = data[:limit]
+
+        if export_format != 'json':
+            return StreamingResponse(
+                export_stream(iterate(data), export_format, HISTORY_COLUMNS),
+                media_type=EXPORT_MEDIA_TYPES[export_format],
+                headers=headers
+            )
+
+        response.headers.update(headers)
         
         formatted_data = []
         for record in data:
@@ -251,7 +381,7 @@ async def get_historical_data(
                 "n_pedestrians": int(record.get('n_pedestrians', 0)),
                 "n_pedestrians_towards": int(record.get('n_pedestrians_towards', 0)),
                 "n_pedestrians_away": int(record.get('n_pedestrians_away', 0)),
-                "temperature": float(record.get('temperature', 0)) if record.get('temperature') else None,
+                "temperature": float(record.get('temperature', 0)) if record.get('temperature') not in (None, '') else None,
                 "weather_condition": record.get('weather_condition'),
                 "incidents": record.get('incidents', 'no_incident'),
                 "collection_type": record.get('collection_type', 'measured'),
@@ -274,6 +404,188 @@ async def get_historical_data(
         logger.error(f"Error fetching historical data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get(
+    "/api/pedestrians/summary",
+    summary="Kennzahlen eines Zeitraums",
+    description="""
+    Summe, Mittelwert, Spitzenstunde, Stundenprofil (0-23 Uhr) und Richtungsanteil
+    für einen Zeitraum, ohne die einzelnen Stundenwerte zu übertragen.
+    Im Hash-Layout direkt in Redis per Lua-Skript berechnet.
+    
+    **Beispiel:**
+    GET /api/pedestrians/summary?street=Kaiserstraße&start_date=2024-01-01&end_date=2024-12-31
+    """,
+    tags=["Pedestrian Data"]
+)
+async def get_pedestrian_summary(
+    response: Response,
+    street: str = Query(..., description="Straßenname", example="Kaiserstraße"),
+    start_date: str = Query(..., description="Startdatum (YYYY-MM-DD)", example="2024-01-01"),
+    end_date: str = Query(..., description="Enddatum (YYYY-MM-DD)", example="2024-12-31"),
+    if_none_match: Optional[str] = Header(None)
+):
+    if street not in ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]:
+        raise HTTPException(status_code=400, detail="Ungültiger Straßenname. Verfügbar: Kaiserstraße, Spiegelstraße, Schönbornstraße")
+
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ungültiges Datumsformat. Nutze YYYY-MM-DD")
+
+    try:
+        with async_redis_client.pinned_reads():
+            headers = await range_validators('summary', street, start_date, end_date)
+            cached = not_modified(if_none_match, headers)
+            if cached is not None:
+                return cached
+            response.headers.update(headers)
+            return await async_redis_client.get_range_summary(street, start_date, end_date)
+    except Exception as e:
+        logger.error(f"Error computing summary: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get(
+    "/api/pedestrians/statistics",
+    summary="Statistik-Kacheln eines Zeitraums",
+    description="""
+    Kennzahlen für die Summary-Cards des Dashboards (Format `StatisticsData` im Frontend):
+    Gesamtzahl, Mittel pro Stunde, stärkste Tagesstunde, Anteil Richtung Innenstadt (%)
+    und Einfluss der Temperatur (`low`/`medium`/`high` nach |Pearson-Korrelation|).
+    Serverseitig berechnet, statt alle Stundenwerte auszuliefern.
+    
+    **Beispiel:**
+    GET /api/pedestrians/statistics?street=Kaiserstraße&start_date=2024-01-01&end_date=2024-12-31
+    """,
+    tags=["Pedestrian Data"]
+)
+async def get_pedestrian_statistics(
+    response: Response,
+    street: str = Query(..., description="Straßenname", example="Kaiserstraße"),
+    start_date: str = Query(..., description="Startdatum (YYYY-MM-DD)", example="2024-01-01"),
+    end_date: str = Query(..., description="Enddatum (YYYY-MM-DD)", example="2024-12-31"),
+    if_none_match: Optional[str] = Header(None)
+):
+    if street not in ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]:
+        raise HTTPException(status_code=400, detail="Ungültiger Straßenname. Verfügbar: Kaiserstraße, Spiegelstraße, Schönbornstraße")
+
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ungültiges Datumsformat. Nutze YYYY-MM-DD")
+
+    try:
+        with async_redis_client.pinned_reads():
+            headers = await range_validators('statistics', street, start_date, end_date)
+            cached = not_modified(if_none_match, headers)
+            if cached is not None:
+                return cached
+            response.headers.update(headers)
+            return await async_redis_client.get_range_statistics(street, start_date, end_date)
+    except Exception as e:
+        logger.error(f"Error computing statistics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get(
+    "/api/pedestrians/heatmap",
+    summary="Heatmap Wochentag × Stunde",
+    description="""
+    7×24-Matrix der Passanten je Wochentag (Zeile 0 = Sonntag) und Stunde.
+    
+    **Metriken:** `mean` (Standard), `median`, `total`, Quantile `p1`-`p99` (z.B. `p90`)
+    
+    Matrizen abgeschlossener Zeiträume werden in Redis gespeichert (`cached: true`).
+    
+    **Beispiel:**
+    GET /api/pedestrians/heatmap?street=Kaiserstraße&start_date=2022-01-01&end_date=2024-12-31&metric=median
+    """,
+    tags=["Pedestrian Data"]
+)
+async def get_pedestrian_heatmap(
+    response: Response,
+    street: str = Query(..., description="Straßenname", example="Kaiserstraße"),
+    start_date: str = Query(..., description="Startdatum (YYYY-MM-DD)", example="2024-01-01"),
+    end_date: str = Query(..., description="Enddatum (YYYY-MM-DD)", example="2024-12-31"),
+    metric: str = Query("mean", description="mean, median, total oder p1-p99", example="mean"),
+    if_none_match: Optional[str] = Header(None)
+):
+    if street not in ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]:
+        raise HTTPException(status_code=400, detail="Ungültiger Straßenname. Verfügbar: Kaiserstraße, Spiegelstraße, Schönbornstraße")
+
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+        parse_heatmap_metric(metric)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Ungültiger Parameter: {e}")
+
+    try:
+        with async_redis_client.pinned_reads():
+            headers = await range_validators('heatmap', street, start_date, end_date, metric=metric)
+            cached = not_modified(if_none_match, headers)
+            if cached is not None:
+                return cached
+            response.headers.update(headers)
+            return await async_redis_client.get_range_heatmap(street, start_date, end_date, metric)
+    except Exception as e:
+        logger.error(f"Error computing heatmap: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get(
+    "/api/pedestrians/rollup",
+    summary="Tages-, Wochen- und Monatssummen",
+    description="""
+    Summen (gesamt, Richtung Innenstadt/weg), gezählte Stunden, Spitzenstunde und
+    Durchschnittstemperatur pro Tag, ISO-Woche oder Monat aus den gepflegten Rollups.
+    Wochen und Monate werden vollständig geliefert, auch wenn der Zeitraum mitten darin beginnt.
+    
+    **Granularität:** `day` (Standard), `week`, `month`
+    
+    **Beispiel:**
+    GET /api/pedestrians/rollup?street=Kaiserstraße&start_date=2022-01-01&end_date=2024-12-31&granularity=month
+    """,
+    tags=["Pedestrian Data"]
+)
+async def get_pedestrian_rollup(
+    response: Response,
+    street: str = Query(..., description="Straßenname", example="Kaiserstraße"),
+    start_date: str = Query(..., description="Startdatum (YYYY-MM-DD)", example="2024-01-01"),
+    end_date: str = Query(..., description="Enddatum (YYYY-MM-DD)", example="2024-12-31"),
+    granularity: str = Query("day", description="day, week oder month", example="month"),
+    if_none_match: Optional[str] = Header(None)
+):
+    if street not in ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]:
+        raise HTTPException(status_code=400, detail="Ungültiger Straßenname. Verfügbar: Kaiserstraße, Spiegelstraße, Schönbornstraße")
+
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ungültiges Datumsformat. Nutze YYYY-MM-DD")
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=400, detail="Ungültige Granularität. Verfügbar: day, week, month")
+
+    try:
+        with async_redis_client.pinned_reads():
+            headers = await range_validators('rollup', street, start_date, end_date, granularity=granularity)
+            cached = not_modified(if_none_match, headers)
+            if cached is not None:
+                return cached
+            response.headers.update(headers)
+            rollups = await async_redis_client.get_rollup(street, granularity, start_date, end_date)
+            return {
+                "street": street,
+                "granularity": granularity,
+                "start_date": start_date,
+                "end_date": end_date,
+                "count": len(rollups),
+                "rollups": rollups
+            }
+    except Exception as e:
+        logger.error(f"Error computing rollup: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get(
     "/api/pedestrians/detailed/{street}/{date}/{hour}",
     summary="Detaillierte Passantendaten",
@@ -302,7 +614,7 @@ async def get_detailed_pedestrian_data(
         if street not in ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]:
             raise HTTPException(status_code=400, detail="Ungültiger Straßenname")
         
-        data = redis_client.get_hourly_data(street, date, hour)
+        data = await async_redis_client.get_hourly_data(street, date, hour)
         
         if not data:
             raise HTTPException(status_code=404, detail="Keine Daten gefunden für diese Zeit")
@@ -325,7 +637,7 @@ async def get_detailed_pedestrian_data(
                 "children": int(data.get('n_child', 0))
             },
             "weather": {
-                "temperature": float(data.get('temperature', 0)) if data.get('temperature') else None,
+                "temperature": float(data.get('temperature', 0)) if data.get('temperature') not in (None, '') else None,
                 "condition": data.get('weather_condition')
             },
             "metadata": {
@@ -339,6 +651,92 @@ async def get_detailed_pedestrian_data(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def format_calendar_day(public_holiday: Optional[dict], school_holiday_period: Optional[dict],
+                        event_info: Optional[dict], lecture_info: Optional[dict]) -> dict:
+    return {
+        "is_public_holiday": public_holiday is not None,
+        "public_holiday_name": public_holiday['name'] if public_holiday else None,
+        "is_nationwide_holiday": public_holiday['is_nationwide'] if public_holiday else False,
+        "is_school_holiday": school_holiday_period is not None,
+        "school_holiday_name": school_holiday_period['holiday_name'] if school_holiday_period else None,
+        "school_holiday_period": {
+            "start": school_holiday_period['start_date'],
+            "end": school_holiday_period['end_date']
+        } if school_holiday_period else None,
+        "has_event": event_info['has_event'] if event_info else False,
+        "has_concert": event_info['has_concert'] if event_info else False,
+        "is_jmu_lecture_period": lecture_info['jmu_lecture'] if lecture_info else False,
+        "is_thws_lecture_period": lecture_info['thws_lecture'] if lecture_info else False,
+        "is_special_day": (
+            (public_holiday is not None) or 
+            (school_holiday_period is not None) or
+            (event_info and event_info['has_event'])
+        )
+    }
+
+@app.get(
+    "/api/calendar",
+    summary="Kalender-Informationen für einen Zeitraum",
+    description="""
+    Kalender-Informationen aller Tage eines Zeitraums in einer Anfrage
+    (Felder wie `/api/calendar/{date}`, zusätzlich `events` mit den Event-Details).
+    
+    Ersetzt die Einzelabfragen pro Tag: alle Tage werden gebündelt in wenigen
+    Redis-Round-Trips gelesen. Maximal `CALENDAR_RANGE_MAX_DAYS` Tage (Standard 400).
+    
+    **Beispiel:**
+    GET /api/calendar?start_date=2019-04-01&end_date=2019-04-30
+    
+    **Rückgabe:** `{start_date, end_date, count, days: {YYYY-MM-DD: {...}}}`
+    """,
+    tags=["Calendar Features"]
+)
+async def get_calendar_range(
+    response: Response,
+    start_date: str = Query(..., description="Startdatum (YYYY-MM-DD)", example="2019-04-01"),
+    end_date: str = Query(..., description="Enddatum (YYYY-MM-DD)", example="2019-04-30"),
+    if_none_match: Optional[str] = Header(None)
+):
+    try:
+        start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+        end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ungültiges Datumsformat. Nutze YYYY-MM-DD")
+
+    if start_dt > end_dt:
+        raise HTTPException(status_code=400, detail="start_date muss vor end_date liegen")
+    if (end_dt - start_dt).days + 1 > config.CALENDAR_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Zeitraum zu lang (maximal {config.CALENDAR_RANGE_MAX_DAYS} Tage)"
+        )
+
+    versions = await async_redis_client.get_reference_versions()
+    headers = validators(
+        data_etag('calendar', versions, start_date=start_date, end_date=end_date), cache_control()
+    )
+    cached = not_modified(if_none_match, headers)
+    if cached is not None:
+        return cached
+    response.headers.update(headers)
+
+    days = await async_redis_client.get_calendar_range(start_date, end_date)
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "count": len(days),
+        "days": {
+            date: {
+                **format_calendar_day(
+                    day['public_holiday'], day['school_holiday_period'], day['event'], day['lecture']
+                ),
+                "events": day['events']
+            }
+            for date, day in days.items()
+        }
+    }
+
 @app.get(
     "/api/calendar/{date}",
     summary="Kalender-Informationen",
@@ -357,36 +755,30 @@ async def get_detailed_pedestrian_data(
     tags=["Calendar Features"]
 )
 async def get_calendar_info(
-    date: str = Path(..., description="Datum (YYYY-MM-DD)", example="2019-04-02")
+    response: Response,
+    date: str = Path(..., description="Datum (YYYY-MM-DD)", example="2019-04-02"),
+    if_none_match: Optional[str] = Header(None)
 ):
     try:
         datetime.strptime(date, '%Y-%m-%d')
+
+        versions = await async_redis_client.get_reference_versions()
+        headers = validators(data_etag('calendar', versions, date=date), cache_control())
+        cached = not_modified(if_none_match, headers)
+        if cached is not None:
+            return cached
+        response.headers.update(headers)
         
-        public_holiday = redis_client.get_detailed_holiday_info(date)
-        school_holiday_period = redis_client.get_school_holiday_period(date)
-        event_info = redis_client.get_event_info(date)
-        lecture_info = redis_client.get_lecture_info(date)
+        public_holiday, school_holiday_period, event_info, lecture_info = await asyncio.gather(
+            async_redis_client.get_detailed_holiday_info(date),
+            async_redis_client.get_school_holiday_period(date),
+            async_redis_client.get_event_info(date),
+            async_redis_client.get_lecture_info(date)
+        )
         
         return {
             "date": date,
-            "is_public_holiday": public_holiday is not None,
-            "public_holiday_name": public_holiday['name'] if public_holiday else None,
-            "is_nationwide_holiday": public_holiday['is_nationwide'] if public_holiday else False,
-            "is_school_holiday": school_holiday_period is not None,
-            "school_holiday_name": school_holiday_period['holiday_name'] if school_holiday_period else None,
-            "school_holiday_period": {
-                "start": school_holiday_period['start_date'],
-                "end": school_holiday_period['end_date']
-            } if school_holiday_period else None,
-            "has_event": event_info['has_event'] if event_info else False,
-            "has_concert": event_info['has_concert'] if event_info else False,
-            "is_jmu_lecture_period": lecture_info['jmu_lecture'] if lecture_info else False,
-            "is_thws_lecture_period": lecture_info['thws_lecture'] if lecture_info else False,
-            "is_special_day": (
-                (public_holiday is not None) or 
-                (school_holiday_period is not None) or
-                (event_info and event_info['has_event'])
-            )
+            **format_calendar_day(public_holiday, school_holiday_period, event_info, lecture_info)
         }
     
     except ValueError:
@@ -397,7 +789,7 @@ async def get_calendar_info(
     summary="Alle Events",
     tags=["Calendar Features"]
 )
-async def get_all_events():
+def get_all_events():
     try:
         raw_events = redis_client.get_all_events()
         normalized = []
@@ -478,12 +870,21 @@ async def get_all_events():
     tags=["Calendar Features"]
 )
 async def get_events_for_date(
-    date: str = Path(..., description="Datum (YYYY-MM-DD)", example="2019-03-03")
+    response: Response,
+    date: str = Path(..., description="Datum (YYYY-MM-DD)", example="2019-03-03"),
+    if_none_match: Optional[str] = Header(None)
 ):
     try:
         datetime.strptime(date, '%Y-%m-%d')
+
+        versions = await async_redis_client.get_reference_versions()
+        headers = validators(data_etag('events', versions['events'], date=date), cache_control())
+        cached = not_modified(if_none_match, headers)
+        if cached is not None:
+            return cached
+        response.headers.update(headers)
         
-        event_info = redis_client.get_detailed_event_info(date)
+        event_info = await async_redis_client.get_detailed_event_info(date)
         
         if not event_info or not event_info.get('has_event'):
             return {
@@ -520,35 +921,31 @@ async def get_latest_pedestrian_record(
         raise HTTPException(status_code=400, detail="Ungültiger Straßenname")
 
     try:
-        # Hole ALLE Daten aus Redis (kann später optimiert werden)
-        all_data = redis_client.get_historical_range(street, "1900-01-01", "2100-12-31")
-
-        if not all_data:
-            raise HTTPException(status_code=404, detail=f"Keine Daten für {street} gefunden")
-
-        # Wähle den Datensatz mit dem neuesten Timestamp
-        latest = max(all_data, key=lambda x: x.get("timestamp") or "")
-
-        return {
-            "street": street,
-            "latest_record": {
-                "date": latest.get("date"),
-                "hour": int(latest.get("hour", 0)),
-                "timestamp": latest.get("timestamp")
-            }
-        }
-
+        # Latest-Zeiger: ein ZRANGE statt der kompletten Historie
+        latest = await async_redis_client.get_latest_record(street)
     except Exception as e:
         logger.error(f"Fehler beim Abrufen des letzten Datensatzes für {street}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not latest:
+        raise HTTPException(status_code=404, detail=f"Keine Daten für {street} gefunden")
+
+    return {
+        "street": street,
+        "latest_record": {
+            "date": latest.get("date"),
+            "hour": int(latest.get("hour", 0)),
+            "timestamp": latest.get("timestamp")
+        }
+    }
+
 @app.get(
     "/api/holiday/all",
     summary="Alle Feiertage abrufen",
     description="Gibt alle Feiertage zurück (für Modelltraining)",
     tags=["Calendar Features"]
 )
-async def get_all_holidays():
+def get_all_holidays():
     try:
         holidays = redis_client.get_all_public_holidays()  # implement in Redis client
         results = []
@@ -570,7 +967,7 @@ async def get_all_holidays():
     summary="Alle Vorlesungsperioden abrufen",
     tags=["Calendar Features"]
 )
-async def get_all_lectures():
+def get_all_lectures():
     try:
         # Get all dates from both universities
         all_dates = redis_client.get_all_lecture_dates()
@@ -608,7 +1005,7 @@ async def get_all_lectures():
     tags=["Calendar Features"]
 )
 async def get_all_school_holiday_periods():
-    periods = redis_client.get_all_school_holiday_periods()
+    periods = await async_redis_client.get_all_school_holiday_periods()
     return {
         "count": len(periods),
         "periods": periods
@@ -620,7 +1017,7 @@ async def get_all_school_holiday_periods():
     description="Gibt alle Schulferien zurück (für Modelltraining)",
     tags=["Calendar Features"]
 )
-async def get_all_school_holidays():
+def get_all_school_holidays():
     try:
         school_holidays = redis_client.get_all_school_holiday_dates()  # implement in Redis client
         results = [{"date": d, "is_school_holiday": 1} for d in school_holidays]
@@ -647,7 +1044,7 @@ async def get_all_school_holidays():
     tags=["Locations"]
 )
 async def get_all_locations():
-    locations = redis_client.get_all_locations()
+    locations = await async_redis_client.get_all_locations()
     return {
         "count": len(locations),
         "locations": locations
@@ -667,13 +1064,94 @@ async def get_all_locations():
 async def get_location_info(
     street: str = Path(..., description="Straßenname", example="Kaiserstraße")
 ):
-    location = redis_client.get_location_by_street(street)
+    location = await async_redis_client.get_location_by_street(street)
     
     if not location:
         raise HTTPException(status_code=404, detail="Zählstation nicht gefunden")
     
     return location
 
+async def load_predictions(streets: List[str], start_date_str: str, end_date_str: str,
+                           end_dt: datetime, hours: Optional[int], limit: Optional[int]) -> List[dict]:
+    """Vorhersagen aller Straßen im Zeitraum, zeitlich sortiert (mit hours: bis einschließlich der End-Stunde)"""
+    all_predictions = []
+
+    # Alle Straßen in zwei Round-Trips (Index-Lookups, dann Hashes)
+    results = await async_redis_client.get_prediction_range_many(streets, start_date_str, end_date_str)
+    for predictions in results.values():
+        all_predictions.extend(predictions)
+
+    # If hours parameter was used, filter to exact hour range (stundengenau, damit die Antwort pro Stunde gleich bleibt)
+    if hours:
+        end_hour = end_dt.strftime('%Y-%m-%dT%H')
+        all_predictions = [
+            p for p in all_predictions
+            if p.get('timestamp', '')[:13] <= end_hour
+        ]
+
+    # Sort by timestamp
+    all_predictions.sort(key=lambda x: x.get('timestamp', ''))
+
+    # Apply limit if specified
+    if limit:
+        all_predictions = all_predictions[:limit]
+    return all_predictions
+
+def format_prediction_response(street: Optional[str], all_predictions: List[dict], start_date_str: str,
+                               end_date_str: str, start_dt: datetime, end_dt: datetime,
+                               hours: Optional[int]) -> dict:
+    # Format response
+    formatted_predictions = []
+    for pred in all_predictions:
+        try:
+            formatted_predictions.append({
+                "id": pred.get('id', ''),
+                "street": pred.get('street', ''),
+                "city": pred.get('city', 'Wuerzburg'),
+                "date": pred.get('date', ''),
+                "hour": pred.get('hour', ''),
+                "weekday": pred.get('weekday', ''),
+                "n_pedestrians": round(float(pred.get('n_pedestrians', 0)), 2),
+                "temperature": round(float(pred.get('temperature', 0)), 2) if pred.get('temperature') not in (None, '') else None,
+                "weather_condition": pred.get('weather_condition'),
+                "incidents": pred.get('incidents', 'no_incident'),
+                "collection_type": pred.get('collection_type', 'predicted'),
+                "data_type": pred.get('data_type', 'prediction'),
+                "prediction_generated_at": pred.get('prediction_generated_at'),
+                "timestamp": pred.get('timestamp')
+            })
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Skipping malformed prediction: {e}")
+            continue
+    
+    # Calculate actual time range covered
+    actual_start = formatted_predictions[0]['timestamp'] if formatted_predictions else None
+    actual_end = formatted_predictions[-1]['timestamp'] if formatted_predictions else None
+    
+    return {
+        "street": street if street else "all",
+        "requested_period": {
+            "start": start_date_str,
+            "end": end_date_str
+        },
+        "actual_coverage": {
+            "start": actual_start,
+            "end": actual_end,
+            "hours_covered": len(formatted_predictions)
+        },
+        "count": len(formatted_predictions),
+        "predictions": formatted_predictions,
+        "metadata": {
+            "prediction_horizon_hours": int((end_dt - start_dt).total_seconds() / 3600) if hours else None,
+            "generated_at": formatted_predictions[0].get('prediction_generated_at') if formatted_predictions else None,
+            "note": "Predictions are updated hourly and cover up to 8 days into the future"
+        }
+    }
+
+def encode_json(payload: dict) -> bytes:
+    """Wie FastAPIs JSONResponse (kompakt, UTF-8, kein NaN)"""
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
 @app.get(
     "/api/pedestrians/predictions",
     summary="Vorhersagen für Passantenströme",
@@ -686,6 +1164,8 @@ async def get_location_info(
     - `end_date`: (Optional) Enddatum im Format YYYY-MM-DD. Standard: start_date + 7 Tage
     - `hours`: (Optional) Anzahl Stunden in die Zukunft (1-192). Überschreibt end_date wenn angegeben.
     - `limit`: (Optional) Maximale Anzahl Ergebnisse
+    - `format`: (Optional) json (Standard), ndjson, csv, arrow oder parquet; alternativ per Accept-Header.
+      Die gestreamten Formate enthalten nur die Vorhersagen (ohne Metadaten).
     
     **Hinweis:** Vorhersagen werden stündlich aktualisiert und decken bis zu 8 Tage in die Zukunft ab.
     Nicht alle Stunden haben zwingend Vorhersagen verfügbar.
@@ -699,12 +1179,21 @@ async def get_location_info(
     response_model=dict
 )
 async def get_predictions(
+    response: Response,
     street: Optional[str] = Query(None, description="Straßenname (optional)", example="Kaiserstraße"),
     start_date: Optional[str] = Query(None, description="Startdatum (YYYY-MM-DD)", example="2025-10-28"),
     end_date: Optional[str] = Query(None, description="Enddatum (YYYY-MM-DD)", example="2025-10-30"),
     hours: Optional[int] = Query(None, description="Stunden voraus (überschreibt end_date)", ge=1, le=192),
-    limit: Optional[int] = Query(None, description="Max. Anzahl Ergebnisse", ge=1, le=10000)
+    limit: Optional[int] = Query(None, description="Max. Anzahl Ergebnisse", ge=1, le=10000),
+    export_format: Optional[str] = Query(None, alias="format", description="json, ndjson, csv, arrow oder parquet"),
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
 ):
+    try:
+        export_format = negotiate_format(export_format, accept)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         # Validate street if provided
         valid_streets = ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]
@@ -741,78 +1230,46 @@ async def get_predictions(
         
         # Get predictions from Redis
         streets_to_query = [street] if street else valid_streets
-        all_predictions = []
-        
-        for street_name in streets_to_query:
-            predictions = redis_client.get_prediction_range(
-                street_name, 
-                start_date_str, 
-                end_date_str
+
+        # Versionen, Antwort und Cache-Füllung vom selben Knoten: eine nachlaufende Replica
+        # darf keine alte Antwort unter dem Key der neuen Generation ablegen
+        with async_redis_client.pinned_reads():
+            # ETag: Vorhersage-Generation je Straße; mit hours zusätzlich die aktuelle Stunde
+            versions = await async_redis_client.get_data_versions(streets_to_query)
+            headers = validators(
+                data_etag(
+                    'predictions', [versions[s]['predictions'] for s in streets_to_query],
+                    streets=streets_to_query, start_date=start_date_str, end_date=end_date_str,
+                    hours=hours, now=now.strftime('%Y-%m-%dT%H') if hours else None,
+                    limit=limit, format=export_format
+                ),
+                cache_control()
             )
-            all_predictions.extend(predictions)
-        
-        # If hours parameter was used, filter to exact hour range
-        if hours:
-            end_timestamp = end_dt.isoformat()
-            all_predictions = [
-                p for p in all_predictions 
-                if p.get('timestamp', '') <= end_timestamp
-            ]
-        
-        # Sort by timestamp
-        all_predictions.sort(key=lambda x: x.get('timestamp', ''))
-        
-        # Apply limit if specified
-        if limit:
-            all_predictions = all_predictions[:limit]
-        
-        # Format response
-        formatted_predictions = []
-        for pred in all_predictions:
-            try:
-                formatted_predictions.append({
-                    "id": pred.get('id', ''),
-                    "street": pred.get('street', ''),
-                    "city": pred.get('city', 'Wuerzburg'),
-                    "date": pred.get('date', ''),
-                    "hour": pred.get('hour', ''),
-                    "weekday": pred.get('weekday', ''),
-                    "n_pedestrians": round(float(pred.get('n_pedestrians', 0)), 2),
-                    "temperature": round(float(pred.get('temperature', 0)), 2) if pred.get('temperature') else None,
-                    "weather_condition": pred.get('weather_condition'),
-                    "incidents": pred.get('incidents', 'no_incident'),
-                    "collection_type": pred.get('collection_type', 'predicted'),
-                    "data_type": pred.get('data_type', 'prediction'),
-                    "prediction_generated_at": pred.get('prediction_generated_at'),
-                    "timestamp": pred.get('timestamp')
-                })
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Skipping malformed prediction: {e}")
-                continue
-        
-        # Calculate actual time range covered
-        actual_start = formatted_predictions[0]['timestamp'] if formatted_predictions else None
-        actual_end = formatted_predictions[-1]['timestamp'] if formatted_predictions else None
-        
-        return {
-            "street": street if street else "all",
-            "requested_period": {
-                "start": start_date_str,
-                "end": end_date_str
-            },
-            "actual_coverage": {
-                "start": actual_start,
-                "end": actual_end,
-                "hours_covered": len(formatted_predictions)
-            },
-            "count": len(formatted_predictions),
-            "predictions": formatted_predictions,
-            "metadata": {
-                "prediction_horizon_hours": int((end_dt - start_dt).total_seconds() / 3600) if hours else None,
-                "generated_at": formatted_predictions[0].get('prediction_generated_at') if formatted_predictions else None,
-                "note": "Predictions are updated hourly and cover up to 8 days into the future"
-            }
-        }
+            cached = not_modified(if_none_match, headers)
+            if cached is not None:
+                return cached
+
+            if export_format != 'json':
+                all_predictions = await load_predictions(streets_to_query, start_date_str, end_date_str, end_dt, hours, limit)
+                return StreamingResponse(
+                    export_stream(iterate(all_predictions), export_format, PREDICTION_COLUMNS),
+                    media_type=EXPORT_MEDIA_TYPES[export_format],
+                    headers=headers
+                )
+
+            async def build_body() -> bytes:
+                all_predictions = await load_predictions(streets_to_query, start_date_str, end_date_str, end_dt, hours, limit)
+                return encode_json(format_prediction_response(
+                    street, all_predictions, start_date_str, end_date_str, start_dt, end_dt, hours
+                ))
+
+            # Gleiche Anfrage = gleiches ETag: fertige Antwort aus Redis, Fehlzugriffe zusammengefasst
+            response_cache = async_redis_client.prediction_responses
+            if response_cache is None:
+                body, source = await build_body(), 'off'
+            else:
+                body, source = await response_cache.get_or_compute(headers['ETag'].strip('"'), build_body)
+            return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": source})
     
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Ungültiges Datumsformat: {str(e)}")
@@ -833,8 +1290,10 @@ async def get_predictions(
     tags=["Predictions"]
 )
 async def get_predictions_for_street(
+    response: Response,
     street: str = Path(..., description="Straßenname", example="Kaiserstraße"),
-    hours: int = Query(24, description="Stunden voraus", ge=1, le=192)
+    hours: int = Query(24, description="Stunden voraus", ge=1, le=192),
+    if_none_match: Optional[str] = Header(None)
 ):
     if street not in ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]:
         raise HTTPException(
@@ -842,8 +1301,11 @@ async def get_predictions_for_street(
             detail="Ungültiger Straßenname. Verfügbar: Kaiserstraße, Spiegelstraße, Schönbornstraße"
         )
     
-    # Reuse the main predictions endpoint logic
-    return await get_predictions(street=street, hours=hours)
+    # Reuse the main predictions endpoint logic (alle Parameter explizit, sonst Query-Defaults)
+    return await get_predictions(
+        response, street=street, start_date=None, end_date=None, hours=hours, limit=None,
+        export_format=None, accept=None, if_none_match=if_none_match
+    )
 
 
 @app.get(
@@ -869,13 +1331,18 @@ async def get_prediction_status():
             "last_updated": None
         }
         
-        for street in streets:
-            count = redis_client.get_prediction_count(street)
-            latest_timestamp = redis_client.get_latest_prediction_timestamp(street)
-            
+        # Index + Status-Hash: ein Round-Trip pro Straße statt SCAN über den Keyspace
+        street_status = await asyncio.gather(*[async_redis_client.get_prediction_status(s) for s in streets])
+
+        for street, info in zip(streets, street_status):
+            count = info["count"]
+            latest_timestamp = info["latest_timestamp"]
             status["streets"][street] = {
                 "count": count,
-                "latest_timestamp": latest_timestamp
+                "latest_timestamp": latest_timestamp,
+                "horizon_start": info["horizon_start"],
+                "horizon_end": info["horizon_end"],
+                "generated_at": info["generated_at"]
             }
             status["total_predictions"] += count
             
@@ -5,5 +5,64 @@ load_dotenv()
 
 REDIS_HOST = os.getenv('REDIS_HOST', 'redis')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+# Redis Cluster: REDIS_HOST/REDIS_PORT ist ein beliebiger Startknoten
+REDIS_CLUSTER = os.getenv('REDIS_CLUSTER', 'false').lower() in ('1', 'true', 'yes')
+# Key-Schema (siehe database/keys.py): legacy | tagged (Hash-Tag pro Straße, für Cluster nötig)
+KEY_SCHEME = os.getenv('KEY_SCHEME', 'tagged' if REDIS_CLUSTER else 'legacy')
+CITY = os.getenv('CITY', 'Wuerzburg')
 OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY', '2f46f96ef57103c2851130426d6b6f61')
-API_BASE_URL = "https://opendata.wuerzburg.de"
\ No newline at end of file
+API_BASE_URL = "https://opendata.wuerzburg.de"
+
+# Speicherformat für stündliche Passantendaten:
+#   hash   - ein Hash pro Stunde + Sorted-Set-Index (Standard)
+#   packed - ein Binärwert pro Straße und Tag (siehe database/encoding.py)
+#   timeseries - RedisTimeSeries-Serien pro Straße und Messwert (redis-stack)
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'hash')
+# Format einzelner Stunden und Vorhersagen im hash-Backend:
+#   hash   - ein Redis-Hash mit Textfeldern (Standard)
+#   struct - ein Binärwert mit typisierten Feldern (database/encoding.py, encode_record)
+# Beide Formate können gemischt im Index stehen; Leser erkennen sie am Key.
+RECORD_CODEC = os.getenv('RECORD_CODEC', 'hash')
+
+# Connection-Pools: einer pro Ziel und Prozess (database/connection.py)
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', 20))
+REDIS_POOL_TIMEOUT = int(os.getenv('REDIS_POOL_TIMEOUT', 5))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30))
+
+# Read-Replicas (nur Einzelknoten), z.B. "redis-replica-1:6379,redis-replica-2:6379".
+# Lese-Methoden verteilen sich per Round-Robin auf gesunde Replicas, Schreibzugriffe
+# gehen an REDIS_HOST. Leer = alles über den Primary.
+REDIS_REPLICAS = [
+    (host, int(port or 6379))
+    for host, _, port in (
+        entry.strip().partition(':') for entry in os.getenv('REDIS_REPLICAS', '').split(',') if entry.strip()
+    )
+]
+REDIS_REPLICA_CHECK_INTERVAL = float(os.getenv('REDIS_REPLICA_CHECK_INTERVAL', 5))
+
+# Stammdaten-Snapshot (database/reference_data.py): Versionsprüfung höchstens alle n Sekunden
+REFERENCE_CHECK_INTERVAL = float(os.getenv('REFERENCE_CHECK_INTERVAL', 5))
+
+# In-Process-Cache für abgeschlossene Tage (get_historical_range), 0 = aus
+DAY_CACHE_MAX_BYTES = int(os.getenv('DAY_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Heute und die Tage davor, die der Scheduler noch nachlädt (fetch_latest_updates)
+DAY_CACHE_MUTABLE_DAYS = int(os.getenv('DAY_CACHE_MUTABLE_DAYS', 2))
+
+# Cache-Control max-age (Sekunden) für abgeschlossene Zeiträume, 0 = immer no-cache (siehe api/conditional.py)
+HTTP_CLOSED_RANGE_MAX_AGE = int(os.getenv('HTTP_CLOSED_RANGE_MAX_AGE', 3600))
+
+# Heatmap-Matrizen abgeschlossener Zeiträume in Redis (Sekunden), 0 = nicht speichern
+HEATMAP_CACHE_TTL = int(os.getenv('HEATMAP_CACHE_TTL', 60 * 60 * 24 * 30))
+
+# Maximale Länge eines Zeitraums für /api/calendar (Tage)
+CALENDAR_RANGE_MAX_DAYS = int(os.getenv('CALENDAR_RANGE_MAX_DAYS', 400))
+
+# Fertige JSON-Antworten der Vorhersage-Endpoints in Redis (Sekunden), 0 = aus.
+# Neue Vorhersagen ändern den Key; die TTL räumt nur alte Generationen ab.
+PREDICTION_RESPONSE_CACHE_TTL = int(os.getenv('PREDICTION_RESPONSE_CACHE_TTL', 3600))
+
+# Stündliche Rohdaten: TTL in Sekunden, 0 = kein Ablauf. Abgeschlossene Monate
+# werden von scripts/archive_cold_data.py komprimiert archiviert.
+LIVE_DATA_TTL = int(os.getenv('LIVE_DATA_TTL', 0))
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 90))
+ARCHIVE_COMPRESSION = os.getenv('ARCHIVE_COMPRESSION', 'zlib')  # zlib | lzma
@@ -1,9 +1,10 @@
 # backend/data_ingestion/api_fetcher.py
 import time
 import requests
-from typing import List, Dict, Generator
+from typing import List, Dict, Generator, Optional
 from datetime import datetime
 from database.redis_client import PedestrianRedisClient
+from database.write_buffer import BufferedWriter
 
 class APIFetcher:
     def __init__(self, base_url: str, redis_client: PedestrianRedisClient):
@@ -40,10 +41,16 @@ class APIFetcher:
     
     def fetch_latest_updates(self, hours_back: int = 2):
         """Holt nur die neuesten Daten (für stündliche Updates)"""
-        for street in self.streets:
-            print(f"Fetching latest data for {street}...")
-            data = self._fetch_recent(street, hours_back)
-            self._store_batch(street, data)
+        # Wenige Stunden pro Straße: alle Straßen gemeinsam schreiben
+        with self.redis_client.buffered_writer() as writer:
+            for street in self.streets:
+                print(f"Fetching latest data for {street}...")
+                data = self._fetch_recent(street, hours_back)
+                self._store_batch(street, data, writer)
+
+        totals = writer.totals
+        print(f"Stored {totals['records']} records in {totals['flushes']} flush(es) "
+              f"({totals['seconds'] * 1000:.0f}ms)")
     
     # ============================================
     # PRIVATE: API Calls
@@ -115,8 +122,8 @@ class APIFetcher:
     # PRIVATE: Daten-Transformation & Speicherung
     # ============================================
     
-    def _store_batch(self, street: str, records: List[Dict]) -> int:
-        """Speichert Batch - nutzt jetzt bulk_store für bessere Performance"""
+    def _store_batch(self, street: str, records: List[Dict], writer: Optional[BufferedWriter] = None) -> int:
+        """Speichert Batch - nutzt jetzt bulk_store für bessere Performance (oder den Schreibpuffer)"""
         if not records:
             return 0
         
@@ -131,7 +138,10 @@ class APIFetcher:
                     print(f"Error transforming record: {e}")
             
             # Bulk-Insert mit Indexierung
-            if transformed_data:
+            if transformed_data and writer is not None:
+                for data in transformed_data:
+                    writer.store_hourly_data(street, data)
+            elif transformed_data:
                 self.redis_client.bulk_store_hourly_data(street, transformed_data)
             
             return len(transformed_data)
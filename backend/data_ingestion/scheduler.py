@@ -36,10 +36,8 @@ scheduler = BackgroundScheduler(timezone="Europe/Berlin")
 def get_latest_data_timestamp(street: str) -> datetime:
     """Find the latest timestamp for a given street in Redis."""
     try:
-        index_key = f"pedestrian:index:{street}"
-        latest_entries = redis_client.client.zrange(index_key, -1, -1, withscores=True)
-        if latest_entries:
-            latest_ts = latest_entries[0][1]
+        latest_ts = redis_client.get_latest_hour_timestamp(street)
+        if latest_ts is not None:
             latest_dt = datetime.fromtimestamp(latest_ts)
             logger.info(f"Latest data for {street}: {latest_dt.isoformat()}")
             return latest_dt
@@ -0,0 +1,334 @@
+# backend/database/aggregation.py
+"""
+Kennzahlen über einen Zeitraum (Summary-Cards): Summe, Mittelwert, Peak,
+Stundenprofil (Summe/Anzahl/Maximum je Stunde des Tages) und Richtungsanteil.
+
+Im Hash-Layout rechnet ``RANGE_SUMMARY_LUA`` direkt in Redis über den Stunden-
+Index (``pedestrian:index:{street}``); pro Aufruf höchstens ``SUMMARY_PAGE_SIZE``
+Stunden, damit ein einzelnes Skript Redis nicht lange blockiert. Die Teilergebnisse
+werden mit ``merge_summary_page`` zusammengeführt. ``summarize_records`` rechnet
+dasselbe clientseitig (andere Speicherformate, Archiv, Scripting deaktiviert).
+
+``compute_statistics`` liefert die Summary-Cards des Frontends
+(``StatisticsData`` in frontend/lib/types.ts) inkl. Temperatur-Korrelation,
+``compute_heatmap`` die Wochentag×Stunde-Matrix der Heatmap.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SUMMARY_PAGE_SIZE = 5000
+
+# KEYS[1]: Stunden-Index, ARGV: min_score, max_score, limit
+# Die Hash-Keys stammen aus dem Index; im tagged-Schema liegen sie im selben Slot.
+# Record-Keys (RECORD_CODEC=struct) werden per GET gelesen und der Kopf
+# (encoding.RECORD_STRUCT, little-endian) byteweise dekodiert.
+RANGE_SUMMARY_LUA = """
+local function int32(raw, offset)
+    local b1, b2, b3, b4 = string.byte(raw, offset, offset + 3)
+    local value = b1 + b2 * 256 + b3 * 65536 + b4 * 16777216
+    if value >= 2147483648 then
+        value = value - 4294967296
+    end
+    return value
+end
+
+local function record_values(key)
+    local raw = redis.call('GET', key)
+    if not raw or #raw < 23 then
+        return {}
+    end
+    local date = string.match(key, ':(%d%d%d%d%-%d%d%-%d%d):%d+$')
+    return {int32(raw, 6), int32(raw, 10), int32(raw, 14), date, string.byte(raw, 5)}
+end
+
+local page = redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[1], ARGV[2], 'WITHSCORES', 'LIMIT', 0, tonumber(ARGV[3]))
+local total, hours, towards, away = 0, 0, 0, 0
+local peak, peak_date, peak_hour = -1, '', -1
+local by_hour = {}
+for hour = 0, 23 do
+    by_hour[hour * 3 + 1] = 0
+    by_hour[hour * 3 + 2] = 0
+    by_hour[hour * 3 + 3] = -1
+end
+
+for i = 1, #page, 2 do
+    local v
+    if string.sub(page[i], 1, 18) == 'pedestrian:record:' then
+        v = record_values(page[i])
+    else
+        v = redis.call('HMGET', page[i], 'n_pedestrians', 'n_pedestrians_towards', 'n_pedestrians_away', 'date', 'hour')
+    end
+    local hour = tonumber(v[5])
+    if hour then
+        local n = math.floor(tonumber(v[1]) or 0)
+        total = total + n
+        hours = hours + 1
+        towards = towards + math.floor(tonumber(v[2]) or 0)
+        away = away + math.floor(tonumber(v[3]) or 0)
+        if n > peak then
+            peak, peak_date, peak_hour = n, v[4], hour
+        end
+        local slot = hour * 3
+        by_hour[slot + 1] = by_hour[slot + 1] + n
+        by_hour[slot + 2] = by_hour[slot + 2] + 1
+        if n > by_hour[slot + 3] then
+            by_hour[slot + 3] = n
+        end
+    end
+end
+
+local last = ''
+if #page > 0 then
+    last = page[#page]
+end
+return {#page / 2, last, total, hours, towards, away, peak, peak_date, peak_hour, by_hour}
+"""
+
+
+def empty_summary() -> Dict:
+    return {
+        'total': 0,
+        'towards': 0,
+        'away': 0,
+        'hours': 0,
+        'peak_value': None,
+        'peak_hour': None,
+        'by_hour': [[0, 0, None] for _ in range(24)],
+    }
+
+
+def _add_hour(summary: Dict, date: str, hour: int, count: int, towards: int, away: int):
+    summary['total'] += count
+    summary['towards'] += towards
+    summary['away'] += away
+    summary['hours'] += 1
+    if summary['peak_value'] is None or count > summary['peak_value']:
+        summary['peak_value'] = count
+        summary['peak_hour'] = f"{date}T{hour:02d}:00:00"
+
+    slot = summary['by_hour'][hour]
+    slot[0] += count
+    slot[1] += 1
+    if slot[2] is None or count > slot[2]:
+        slot[2] = count
+
+
+def summarize_records(records: List[Dict], summary: Optional[Dict] = None) -> Dict:
+    """Clientseitige Variante von RANGE_SUMMARY_LUA (Datensätze zeitlich sortiert)"""
+    summary = summary or empty_summary()
+    for record in records:
+        if not record.get('date') or record.get('hour') in (None, ''):
+            continue
+        _add_hour(
+            summary, record['date'], int(record['hour']),
+            int(float(record.get('n_pedestrians') or 0)),
+            int(float(record.get('n_pedestrians_towards') or 0)),
+            int(float(record.get('n_pedestrians_away') or 0))
+        )
+    return summary
+
+
+def merge_summary_page(summary: Dict, reply: List):
+    """
+    Teilergebnis eines RANGE_SUMMARY_LUA-Aufrufs übernehmen.
+    Gibt den Score der letzten Stunde zurück, wenn die Seite voll war (weiterblättern).
+    """
+    size, last, total, hours, towards, away, peak, peak_date, peak_hour, by_hour = reply
+    summary['total'] += int(total)
+    summary['towards'] += int(towards)
+    summary['away'] += int(away)
+    summary['hours'] += int(hours)
+
+    # Seiten sind zeitlich sortiert: bei Gleichstand gewinnt die frühere Stunde
+    if int(hours) and (summary['peak_value'] is None or int(peak) > summary['peak_value']):
+        summary['peak_value'] = int(peak)
+        summary['peak_hour'] = f"{_text(peak_date)}T{int(peak_hour):02d}:00:00"
+
+    for hour in range(24):
+        page_sum, page_hours, page_max = (int(v) for v in by_hour[hour * 3:hour * 3 + 3])
+        slot = summary['by_hour'][hour]
+        slot[0] += page_sum
+        slot[1] += page_hours
+        if page_hours and (slot[2] is None or page_max > slot[2]):
+            slot[2] = page_max
+
+    return _text(last) if int(size) >= SUMMARY_PAGE_SIZE else None
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def finalize_summary(street: str, start_date: str, end_date: str, summary: Dict, source: str) -> Dict:
+    """Antwortformat mit abgeleiteten Kennzahlen (Mittelwerte, Richtungsanteil)"""
+    directional = summary['towards'] + summary['away']
+    return {
+        'street': street,
+        'start_date': start_date,
+        'end_date': end_date,
+        'total': summary['total'],
+        'hours': summary['hours'],
+        'mean': round(summary['total'] / summary['hours'], 2) if summary['hours'] else None,
+        'peak_value': summary['peak_value'],
+        'peak_hour': summary['peak_hour'],
+        'towards': summary['towards'],
+        'away': summary['away'],
+        'towards_ratio': round(summary['towards'] / directional, 4) if directional else None,
+        'by_hour': [
+            {
+                'hour': hour,
+                'total': total,
+                'hours': hours,
+                'mean': round(total / hours, 2) if hours else None,
+                'max': peak,
+            }
+            for hour, (total, hours, peak) in enumerate(summary['by_hour'])
+        ],
+        'source': source,
+    }
+
+
+# ============================================
+# STATISTICS-DATA (FRONTEND)
+# ============================================
+
+# |Pearson r| zwischen Temperatur und Passanten -> weatherImpact
+WEATHER_IMPACT_THRESHOLDS = ((0.7, 'high'), (0.4, 'medium'))
+MIN_TEMPERATURE_SAMPLES = 10
+
+
+def _column(records: List[Dict], field: str) -> np.ndarray:
+    """Feld aller Datensätze als float-Array; fehlende Werte als NaN"""
+    return np.array([
+        value if (value := record.get(field)) not in (None, '') else np.nan for record in records
+    ], dtype=np.float64)
+
+
+def _round_half_up(value: float) -> int:
+    # Wie Math.round im Frontend (round() rundet .5 zur geraden Zahl)
+    return int(np.floor(value + 0.5))
+
+
+def weather_impact(correlation: Optional[float]) -> str:
+    for threshold, impact in WEATHER_IMPACT_THRESHOLDS:
+        if correlation is not None and abs(correlation) > threshold:
+            return impact
+    return 'low'
+
+
+def compute_statistics(records: List[Dict]) -> Dict:
+    """
+    Kennzahlen wie ``PedestrianAPI.getStatistics`` im Frontend: Summe, Mittel pro
+    Stunde, stärkste Stunde des Tages (Summe über den Zeitraum), Anteil Richtung
+    Innenstadt in Prozent und Einfluss der Temperatur (Pearson-Korrelation).
+    """
+    if not records:
+        return {
+            'totalPedestrians': 0, 'avgHourlyCount': 0, 'peakHour': 0, 'peakCount': 0,
+            'directionRatio': 0, 'weatherImpact': 'low', 'hours': 0, 'temperatureCorrelation': None,
+        }
+
+    counts = np.nan_to_num(_column(records, 'n_pedestrians')).astype(np.int64)
+    towards = np.nan_to_num(_column(records, 'n_pedestrians_towards')).astype(np.int64)
+    hours = _column(records, 'hour').astype(np.int64)
+    temperatures = _column(records, 'temperature')
+
+    total = int(counts.sum())
+    by_hour = np.bincount(hours, weights=counts, minlength=24)
+    # argmax: bei Gleichstand die frühere Stunde (wie im Frontend)
+    peak_hour = int(by_hour.argmax())
+
+    correlation = None
+    valid = ~np.isnan(temperatures)
+    if valid.sum() >= MIN_TEMPERATURE_SAMPLES:
+        x, y = temperatures[valid], counts[valid].astype(np.float64)
+        if x.std() > 0 and y.std() > 0:
+            correlation = float(np.corrcoef(x, y)[0, 1])
+
+    return {
+        'totalPedestrians': total,
+        'avgHourlyCount': _round_half_up(total / len(records)),
+        'peakHour': peak_hour,
+        'peakCount': int(by_hour[peak_hour]),
+        'directionRatio': _round_half_up(int(towards.sum()) / total * 100) if total > 0 else 0,
+        'weatherImpact': weather_impact(correlation),
+        'hours': len(records),
+        'temperatureCorrelation': round(correlation, 4) if correlation is not None else None,
+    }
+
+
+# ============================================
+# HEATMAP (WOCHENTAG × STUNDE)
+# ============================================
+
+# Zeilen wie Date.getDay() im Frontend: 0 = Sonntag
+HEATMAP_DAYS = ('Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday')
+HEATMAP_METRICS = ('mean', 'median', 'total')
+
+
+def parse_heatmap_metric(metric: str) -> float:
+    """mean/median/total oder Quantil ``p<1-99>`` (z.B. p90) -> Quantil (mean/total: -1)"""
+    if metric in ('mean', 'total'):
+        return -1.0
+    if metric == 'median':
+        return 0.5
+    if metric.startswith('p') and metric[1:].isdigit() and 1 <= int(metric[1:]) <= 99:
+        return int(metric[1:]) / 100
+    raise ValueError(f"Unknown heatmap metric: {metric} (mean, median, total, p1-p99)")
+
+
+def _group_quantile(cells: np.ndarray, values: np.ndarray, quantile: float) -> np.ndarray:
+    """Quantil je Zelle (lineare Interpolation wie np.quantile), ohne Python-Schleife über Zellen"""
+    order = np.lexsort((values, cells))
+    cells, values = cells[order], values[order]
+    counts = np.bincount(cells, minlength=7 * 24)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    result = np.full(7 * 24, np.nan)
+    filled = counts > 0
+    position = (counts[filled] - 1) * quantile
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    low_values = values[starts[filled] + lower]
+    high_values = values[starts[filled] + upper]
+    result[filled] = low_values + (high_values - low_values) * (position - lower)
+    return result
+
+
+def compute_heatmap(records: List[Dict], metric: str = 'mean') -> Dict:
+    """
+    Passanten je Wochentag (Zeile, 0 = Sonntag) und Stunde (Spalte) als 7×24-Matrix.
+    Leere Zellen sind None; ``counts`` enthält die Anzahl Stunden je Zelle.
+    """
+    quantile = parse_heatmap_metric(metric)
+    valid = [
+        record for record in records
+        if record.get('date') and record.get('hour') not in (None, '')
+    ]
+
+    if valid:
+        days = np.array([record['date'] for record in valid], dtype='datetime64[D]').astype(np.int64)
+        # 1970-01-01 war ein Donnerstag (getDay() = 4)
+        cells = (days + 4) % 7 * 24 + _column(valid, 'hour').astype(np.int64)
+        values = np.nan_to_num(_column(valid, 'n_pedestrians'))
+    else:
+        cells, values = np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    counts = np.bincount(cells, minlength=7 * 24)
+    totals = np.bincount(cells, weights=values, minlength=7 * 24)
+    if metric == 'total':
+        matrix = totals
+    elif metric == 'mean':
+        matrix = np.divide(totals, counts, out=np.full(7 * 24, np.nan), where=counts > 0)
+    else:
+        matrix = _group_quantile(cells, values, quantile)
+
+    matrix = np.round(matrix, 2).reshape(7, 24)
+    return {
+        'metric': metric,
+        'days': list(HEATMAP_DAYS),
+        'matrix': [[None if np.isnan(v) else float(v) for v in row] for row in matrix],
+        'counts': counts.reshape(7, 24).tolist(),
+        'hours': len(valid),
+    }
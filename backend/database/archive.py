@@ -0,0 +1,110 @@
+# backend/database/archive.py
+"""
+Komprimiertes Archiv für abgeschlossene Monate.
+
+Pro Straße und Monat ein Binärwert ``pedestrian:archive:{street}:{YYYY-MM}``:
+ein Codec-Byte (``z`` = zlib, ``x`` = lzma), danach die komprimierten Spalten
+eines (Tage, 24)-Arrays mit ``DAY_SLOT_DTYPE``. Spaltenweise abgelegt, weil
+gleichartige Werte (Zählungen, Temperaturen, Enum-Codes) nebeneinander deutlich
+besser komprimieren als verschachtelte Slots. Hinter den Spalten folgt (optional)
+der Text-Anhang des Monats als JSON ``{date: {hour: {...}}}`` mit den nicht
+ableitbaren Textfeldern (siehe encode_hour_text); ältere Archive haben keinen.
+"""
+import calendar
+import json
+import lzma
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from database.keys import street_tag
+from database.encoding import DAY_SLOT_DTYPE, day_block_to_records, encode_hour_slot, encode_hour_text
+
+CODECS = {'zlib': b'z', 'lzma': b'x'}
+
+
+def archive_key(street: str, month: str) -> str:
+    return f"pedestrian:archive:{street_tag(street)}:{month}"
+
+
+def archive_index_key(street: str) -> str:
+    return f"pedestrian:archive:index:{street_tag(street)}"
+
+
+def month_dates(month: str) -> List[str]:
+    year, mon = map(int, month.split('-'))
+    return [f"{month}-{day:02d}" for day in range(1, calendar.monthrange(year, mon)[1] + 1)]
+
+
+def month_score(month: str) -> float:
+    return datetime.fromisoformat(f"{month}-01T00:00:00").timestamp()
+
+
+def bounds_from_archive_index(first: List, last: List) -> Optional[Tuple[str, str]]:
+    """Erster und letzter Tag aus ZRANGE 0 0 / -1 -1 des Archiv-Index"""
+    if not first or not last:
+        return None
+    return f"{first[0][0]}-01", month_dates(last[0][0])[-1]
+
+
+def records_to_month(month: str, records: List[Dict]) -> np.ndarray:
+    """Stündliche Datensätze (Hash-Format) in ein (Tage, 24)-Array"""
+    dates = month_dates(month)
+    blocks = np.zeros((len(dates), 24), dtype=DAY_SLOT_DTYPE)
+    for data in records:
+        day = int(data['date'][8:10]) - 1
+        blocks[day, int(data['hour'])] = np.frombuffer(encode_hour_slot(data), dtype=DAY_SLOT_DTYPE)[0]
+    return blocks
+
+
+def month_text(street: str, records: List[Dict]) -> Dict[str, Dict[str, Dict]]:
+    """Text-Anhang des Monats: date -> Stunde -> nicht ableitbare Textfelder"""
+    text = {}
+    for data in records:
+        hour_text = encode_hour_text(street, data)
+        if hour_text is not None:
+            text.setdefault(data['date'], {})[str(int(data['hour']))] = json.loads(hour_text)
+    return text
+
+
+def encode_month(blocks: np.ndarray, codec: str = 'zlib', text: Optional[Dict] = None) -> bytes:
+    columns = b''.join(np.ascontiguousarray(blocks[name]).tobytes() for name in DAY_SLOT_DTYPE.names)
+    if text:
+        columns += json.dumps(text, ensure_ascii=False).encode()
+    if codec == 'lzma':
+        return CODECS['lzma'] + lzma.compress(columns, preset=6)
+    return CODECS['zlib'] + zlib.compress(columns, 9)
+
+
+def decode_month(month: str, raw: bytes) -> np.ndarray:
+    return _unpack_month(month, raw)[0]
+
+
+def _unpack_month(month: str, raw: bytes) -> Tuple[np.ndarray, Dict]:
+    """(Tage x 24)-Array und Text-Anhang eines Archiv-Werts"""
+    codec, payload = raw[:1], raw[1:]
+    columns = lzma.decompress(payload) if codec == CODECS['lzma'] else zlib.decompress(payload)
+
+    shape = (len(month_dates(month)), 24)
+    blocks = np.zeros(shape, dtype=DAY_SLOT_DTYPE)
+    offset = 0
+    for name in DAY_SLOT_DTYPE.names:
+        field = DAY_SLOT_DTYPE[name]
+        size = field.itemsize * shape[0] * 24
+        blocks[name] = np.frombuffer(columns, dtype=field, count=shape[0] * 24, offset=offset).reshape(shape)
+        offset += size
+    text = json.loads(columns[offset:]) if len(columns) > offset else {}
+    return blocks, text
+
+
+def month_to_records(street: str, month: str, raw: bytes,
+                     start_date: str = '', end_date: str = '9999-12-31') -> List[Dict]:
+    """Datensätze eines archivierten Monats (Archiv-Wert), begrenzt auf [start_date, end_date]"""
+    blocks, text = _unpack_month(month, raw)
+    records = []
+    for date, block in zip(month_dates(month), blocks):
+        if start_date <= date <= end_date:
+            records.extend(day_block_to_records(street, date, block, text=text.get(date)))
+    return records
@@ -0,0 +1,711 @@
+# backend/database/async_redis_client.py
+from redis.exceptions import ResponseError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import config
+from database.encoding import (
+    timeseries_to_records, timeseries_dates, TS_METRICS
+)
+from database.aggregation import (
+    RANGE_SUMMARY_LUA, empty_summary, summarize_records, finalize_summary,
+    compute_statistics, compute_heatmap, parse_heatmap_metric
+)
+from database.keys import (
+    hourly_key, hourly_pattern, hourly_index_key, day_index_key,
+    prediction_index_key, prediction_status_key, prediction_streets_key, record_key, latest_key, version_key
+)
+from database.connection import check_key_scheme, connect_async, connect_async_cluster, AsyncReplicaRouter
+from database.calendar_bitmaps import (
+    DAY_FLAGS, HOUR_FLAGS, bitmap_key, byte_range, flag_ranges, decode_flags, missing_bitmaps
+)
+from database.archive import (
+    archive_key, archive_index_key, month_dates, month_score, month_to_records
+)
+from database.response_cache import ResponseCache
+from database.day_cache import DayCache, DATA_VERSION_FIELDS, parse_versions
+from database.redis_client import (
+    _date_range, _previous_day, _next_day, build_prediction_status, record_sort_key, parse_holiday, parse_detailed_holiday, parse_school_holiday_period,
+    parse_event_hour, parse_detailed_event_hour, parse_lecture,
+    queue_range_context, parse_range_context, merge_archived, queue_range_lookups, plan_range_fetch,
+    queue_range_fetch, assemble_range, prediction_candidate_keys, queue_stored_record, decode_stored_record,
+    REFERENCE_SOURCES, reference_source_keys, queue_reference_load, build_reference_snapshot,
+    heatmap_cacheable, queue_heatmap_lookup, parse_heatmap_lookup, queue_heatmap_store, heatmap_response,
+    queue_latest_pointer, parse_latest_pointer, queue_day_blocks, day_blocks_to_records, queue_calendar_days, build_calendar_range,
+    queue_day_text, day_text_replies, range_scores, scan_key_in_range, queue_scan_fetch, scan_results_to_records,
+    queue_index_page, index_page_records, next_page_score, merge_legacy_hours,
+    queue_summary_context, lua_summary_possible, summary_script_call, next_summary_score,
+    ts_range_ms, ts_mrange_filters, queue_ts_ranges, ts_range_series,
+    queue_event_days, parse_event_days, queue_event_hours, merge_event_day_hours,
+    rollup_index_scores, queue_rollup_hashes, parse_rollup_hashes, ts_rollup_queries, ts_rollups
+)
+from database.rollups import aggregate_records, rollup_index_key
+from database.reference_data import (
+    REFERENCE_VERSION_KEY, REFERENCE_DATASETS, ReferenceCache, ReferenceSnapshot, parse_reference_versions
+)
+
+class AsyncPedestrianRedisClient:
+    """
+    Nicht-blockierende Variante von PedestrianRedisClient für die FastAPI-Handler.
+
+    Gleiche Lese-Methoden und Key-Layouts wie der synchrone Client, aber auf
+    ``redis.asyncio`` mit begrenztem Connection-Pool. Wartet ein Request auf
+    Redis, können andere Requests weiterlaufen. Schreibzugriffe bleiben beim
+    synchronen Client (Scheduler, Import-Skripte, ML).
+    """
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, db: int = 0,
+                 max_connections: Optional[int] = None, storage_backend: Optional[str] = None,
+                 cluster: Optional[bool] = None, replicas: Optional[List[Tuple[str, int]]] = None):
+        host = host or config.REDIS_HOST
+        port = port or config.REDIS_PORT
+        max_connections = max_connections or config.REDIS_MAX_CONNECTIONS
+        self.cluster = config.REDIS_CLUSTER if cluster is None else cluster
+        check_key_scheme(self.cluster)
+
+        if self.cluster:
+            # RedisCluster verwaltet einen Pool pro Knoten selbst
+            self.client = connect_async_cluster(host, port, max_connections, decode_responses=True)
+            self.binary_client = connect_async_cluster(host, port, max_connections, decode_responses=False)
+        else:
+            # BlockingConnectionPool: bei Erschöpfung warten statt neue Verbindungen öffnen
+            self.client = connect_async(host, port, db, max_connections, decode_responses=True)
+            self.binary_client = connect_async(host, port, db, max_connections, decode_responses=False)
+
+        # Alle Methoden lesen: über self.reader / self.binary_reader (Replica oder Primary)
+        replicas = config.REDIS_REPLICAS if replicas is None else replicas
+        self.router = AsyncReplicaRouter((self.client, self.binary_client), [
+            (connect_async(r_host, r_port, db, max_connections, decode_responses=True),
+             connect_async(r_host, r_port, db, max_connections, decode_responses=False))
+            for r_host, r_port in replicas
+        ]) if replicas and not self.cluster else None
+        self._read_pair = ContextVar(f'async_read_pair_{id(self)}', default=None)
+        self._summary_script = self.client.register_script(RANGE_SUMMARY_LUA)
+        self._lua_summary = True
+        self.reference_cache = ReferenceCache(config.REFERENCE_CHECK_INTERVAL)
+        self.storage_backend = storage_backend or config.STORAGE_BACKEND
+        self.day_cache = DayCache(
+            config.DAY_CACHE_MAX_BYTES, config.DAY_CACHE_MUTABLE_DAYS
+        ) if config.DAY_CACHE_MAX_BYTES > 0 else None
+        # Serialisierte Vorhersage-Antworten (api/main.py), Key enthält die Vorhersage-Generation
+        self.prediction_responses = ResponseCache(
+            self.binary_client, 'pedestrian:prediction:response', config.PREDICTION_RESPONSE_CACHE_TTL
+        ) if config.PREDICTION_RESPONSE_CACHE_TTL > 0 else None
+        print(f"Async Redis pool for {host}:{port} (max {max_connections} connections, storage: {self.storage_backend})")
+
+    async def close(self):
+        clients = [self.client, self.binary_client]
+        if self.router is not None:
+            clients += [client for pair in self.router.replicas for client in pair]
+        for client in clients:
+            if self.cluster:
+                await client.aclose()
+            else:
+                # Eigene Pools (connect_async) mit schließen
+                await client.aclose(close_connection_pool=True)
+
+    def _readers(self) -> Tuple:
+        """(Text-Client, Binär-Client) für Lesezugriffe; innerhalb von _read_scope fest"""
+        pair = self._read_pair.get()
+        if pair is None:
+            pair = self.router.route() if self.router is not None else (self.client, self.binary_client)
+        return pair
+
+    @property
+    def reader(self):
+        return self._readers()[0]
+
+    @property
+    def binary_reader(self):
+        return self._readers()[1]
+
+    @contextmanager
+    def _read_scope(self, pair: Optional[Tuple] = None):
+        token = self._read_pair.set(pair or self._readers())
+        try:
+            yield
+        finally:
+            self._read_pair.reset(token)
+
+    def pinned_reads(self):
+        """Lesezugriffe im Block gegen einen Knoten (wie PedestrianRedisClient.pinned_reads)"""
+        return self._read_scope()
+
+    # ============================================
+    # PASSANTENDATEN
+    # ============================================
+
+    async def get_hourly_data(self, street: str, date: str, hour: int) -> Optional[Dict]:
+        """Holt stündliche Daten"""
+        if self.storage_backend != 'hash':
+            records = await self.get_historical_range(street, date, date)
+            for record in records:
+                if int(record.get('hour', -1)) == int(hour):
+                    return record
+
+        pipe = self.binary_reader.pipeline(transaction=False)
+        keys = (hourly_key(street, date, hour), record_key(street, date, hour))
+        for key in keys:
+            queue_stored_record(pipe, key)
+        data = next((r for r in map(decode_stored_record, keys, await pipe.execute()) if r), None)
+        if data:
+            return data
+        for record in await self._get_range_archived(street, date, date):
+            if int(record['hour']) == int(hour):
+                return record
+        return None
+
+    async def get_latest_record(self, street: str) -> Optional[Dict]:
+        """Neueste gespeicherte Stunde über den Latest-Zeiger (wie PedestrianRedisClient)"""
+        with self._read_scope():
+            latest = parse_latest_pointer(await self.reader.zrange(latest_key(street), -1, -1))
+            if latest is not None:
+                return latest
+
+            bounds, _ = await self._range_context(street)
+            if bounds is None:
+                return None
+            records = await self.get_historical_range(street, bounds[1], bounds[1])
+        if not records:
+            return None
+
+        pipe = self.client.pipeline(transaction=False)
+        queue_latest_pointer(pipe, street, records)
+        await pipe.execute()
+        return records[-1]
+
+    async def get_historical_range(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        """Range-Query mit automatischem Fallback und Day-Cache (wie PedestrianRedisClient)"""
+        with self._read_scope():
+            if self.day_cache is None:
+                return await self._fetch_range(street, start_date, end_date)
+
+            bounds, versions = await self._range_context(street)
+            if bounds is None:
+                return await self._fetch_range(street, start_date, end_date)
+
+            start_date = max(start_date, bounds[0])
+            end_date = min(end_date, bounds[1])
+            if start_date > end_date:
+                return []
+
+            dates = _date_range(start_date, end_date)
+            days, missing = self.day_cache.lookup(street, dates, versions)
+            if missing:
+                fetched = await self._fetch_range(street, missing[0], missing[-1])
+                days.update(self.day_cache.fill(street, missing, fetched, versions))
+
+            return [record for date in dates for record in days.get(date, ())]
+
+    async def get_historical_range_many(self, streets: List[str], start_date: str, end_date: str) -> Dict[str, List[Dict]]:
+        """Range-Query für mehrere Straßen in zwei Round-Trips (wie PedestrianRedisClient)"""
+        reader, binary_reader = self._readers()
+        streets = list(dict.fromkeys(streets))
+        timeseries = self.storage_backend == 'timeseries'
+
+        pipe = reader.pipeline(transaction=False)
+        sizes = [queue_range_lookups(pipe, street, start_date, end_date, timeseries) for street in streets]
+        replies = await pipe.execute(raise_on_error=False)
+
+        plans, offset = {}, 0
+        for street, size in zip(streets, sizes):
+            plans[street] = plan_range_fetch(
+                replies[offset:offset + size], start_date, end_date,
+                self.storage_backend, self.day_cache, street
+            )
+            offset += size
+
+        pipe = binary_reader.pipeline(transaction=False)
+        for street, plan in plans.items():
+            if plan is not None:
+                queue_range_fetch(pipe, street, plan)
+        replies = iter(await pipe.execute(raise_on_error=False) if len(pipe) else [])
+
+        results = {}
+        for street, plan in plans.items():
+            if plan is not None:
+                results[street] = assemble_range(street, plan, replies, self.day_cache)
+            else:
+                results[street] = await self.get_historical_range(street, start_date, end_date)
+        return results
+
+    async def _range_context(self, street: str):
+        pipe = self.reader.pipeline(transaction=False)
+        queue_range_context(pipe, street, self.storage_backend == 'timeseries')
+        return parse_range_context(await pipe.execute(raise_on_error=False))
+
+    async def get_date_bounds(self, street: str) -> Optional[Tuple[str, str]]:
+        bounds, _ = await self._range_context(street)
+        return bounds
+
+    def get_cache_stats(self) -> Optional[Dict]:
+        return self.day_cache.stats() if self.day_cache is not None else None
+
+    async def get_data_versions(self, streets: List[str]) -> Dict[str, Dict[str, int]]:
+        """Versionszähler (history/all/predictions) mehrerer Straßen in einem Round-Trip"""
+        pipe = self.reader.pipeline(transaction=False)
+        for street in streets:
+            pipe.hmget(version_key(street), *DATA_VERSION_FIELDS)
+        return {
+            street: dict(zip(DATA_VERSION_FIELDS, parse_versions(reply)))
+            for street, reply in zip(streets, await pipe.execute())
+        }
+
+    async def get_reference_versions(self) -> Dict[str, int]:
+        """Import-Zähler der Stammdaten (ohne den Snapshot zu laden)"""
+        reply = await self.reader.hmget(REFERENCE_VERSION_KEY, *REFERENCE_DATASETS)
+        return dict(zip(REFERENCE_DATASETS, parse_reference_versions(reply)))
+
+    async def _fetch_range(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        archived = await self._get_range_archived(street, start_date, end_date)
+        return merge_archived(archived, await self._fetch_live_range(street, start_date, end_date))
+
+    async def _get_range_archived(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        reader, binary_reader = self._readers()
+        end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+        months = await reader.zrangebyscore(archive_index_key(street), month_score(start_date[:7]), end_ts)
+        if not months:
+            return []
+
+        pipe = binary_reader.pipeline(transaction=False)
+        for month in months:
+            pipe.get(archive_key(street, month))
+
+        records = []
+        for month, raw in zip(months, await pipe.execute()):
+            if raw:
+                records.extend(month_to_records(street, month, raw, start_date, end_date))
+        return records
+
+    async def _fetch_live_range(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        if self.storage_backend == 'packed':
+            return await self._get_range_packed(street, start_date, end_date)
+        if self.storage_backend == 'timeseries':
+            return await self._get_range_timeseries(street, start_date, end_date)
+
+        if await self.reader.exists(hourly_index_key(street)):
+            return await self._get_range_via_index(street, start_date, end_date)
+        return await self._get_range_via_scan(street, start_date, end_date)
+
+    async def _get_range_via_index(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        return [record async for record in self._iter_range_via_index(street, start_date, end_date)]
+
+    async def _iter_range_via_index(self, street: str, start_date: str, end_date: str,
+                                    chunk_size: int = 5000) -> AsyncIterator[Dict]:
+        reader, binary_reader = self._readers()
+        index_key = hourly_index_key(street)
+        min_score, end_ts = range_scores(start_date, end_date)
+
+        while min_score is not None:
+            page = await reader.zrangebyscore(index_key, min_score, end_ts,
+                                              start=0, num=chunk_size, withscores=True)
+            if not page:
+                return
+
+            pipe = binary_reader.pipeline(transaction=False)
+            queue_index_page(pipe, page)
+            for data in index_page_records(page, await pipe.execute()):
+                yield data
+            min_score = next_page_score(page, chunk_size)
+
+    async def _get_range_via_scan(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        reader = self.reader
+        matching_keys = [
+            key async for key in reader.scan_iter(match=hourly_pattern(street), count=1000)
+            if scan_key_in_range(key, start_date, end_date)
+        ]
+        if not matching_keys:
+            return []
+
+        pipe = reader.pipeline(transaction=False)
+        queue_scan_fetch(pipe, matching_keys)
+        return scan_results_to_records(await pipe.execute())
+
+    def iter_historical_range(self, street: str, start_date: str, end_date: str,
+                              chunk_size: int = 1000) -> AsyncIterator[Dict]:
+        """Wie PedestrianRedisClient.iter_historical_range (ohne Day-Cache, ein Knoten je Iteration)"""
+        return self._iter_historical_range(self._readers(), street, start_date, end_date, chunk_size)
+
+    async def _iter_historical_range(self, pair: Tuple, street: str, start_date: str, end_date: str,
+                                     chunk_size: int) -> AsyncIterator[Dict]:
+        with self._read_scope(pair):
+            bounds, _ = await self._range_context(street)
+            if bounds is None:
+                for record in await self._fetch_range(street, start_date, end_date):
+                    yield record
+                return
+
+            start_date = max(start_date, bounds[0])
+            end_date = min(end_date, bounds[1])
+            if start_date > end_date:
+                return
+
+            end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+            months = await self.reader.zrangebyscore(archive_index_key(street), month_score(start_date[:7]), end_ts)
+
+            window_start = start_date
+            for month in months:
+                dates = month_dates(month)
+                first, last = max(dates[0], start_date), min(dates[-1], end_date)
+                if window_start < first:
+                    async for record in self._iter_live_range(street, window_start, _previous_day(first), chunk_size):
+                        yield record
+                for record in await self._fetch_range(street, first, last):
+                    yield record
+                window_start = _next_day(last)
+
+            if window_start <= end_date:
+                async for record in self._iter_live_range(street, window_start, end_date, chunk_size):
+                    yield record
+
+    async def _iter_live_range(self, street: str, start_date: str, end_date: str,
+                               chunk_size: int) -> AsyncIterator[Dict]:
+        if self.storage_backend == 'hash' and await self.reader.exists(hourly_index_key(street)):
+            async for record in self._iter_range_via_index(street, start_date, end_date, chunk_size):
+                yield record
+            return
+
+        window = timedelta(days=max(1, chunk_size // 24))
+        current = datetime.strptime(start_date, '%Y-%m-%d')
+        last = datetime.strptime(end_date, '%Y-%m-%d')
+        while current <= last:
+            window_end = min(current + window - timedelta(days=1), last)
+            for record in await self._fetch_live_range(
+                    street, current.strftime('%Y-%m-%d'), window_end.strftime('%Y-%m-%d')):
+                yield record
+            current = window_end + timedelta(days=1)
+
+    async def _get_range_packed(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        records = await self._get_range_packed_only(street, start_date, end_date)
+
+        # Während der Migration: Stunden, die nur im Hash-Layout liegen, ergänzen
+        if await self.reader.exists(hourly_index_key(street)):
+            records = merge_legacy_hours(records, await self._get_range_via_index(street, start_date, end_date))
+
+        return records
+
+    async def _get_range_packed_only(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        reader, binary_reader = self._readers()
+        dates = await reader.zrangebyscore(day_index_key(street), *range_scores(start_date, end_date))
+
+        records = []
+        if dates:
+            pipe = binary_reader.pipeline(transaction=False)
+            queue_day_blocks(pipe, street, dates)
+            records = day_blocks_to_records(street, dates, iter(await pipe.execute()))
+
+        return records
+
+    async def _get_range_timeseries(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        try:
+            series, = await self._ts_mrange_many(street, *ts_range_ms(start_date, end_date), [(TS_METRICS, {})])
+        except ResponseError:
+            return []
+
+        dates = timeseries_dates(series)
+        if not dates:
+            return []
+        pipe = self.reader.pipeline(transaction=False)
+        queue_day_text(pipe, street, dates)
+        return timeseries_to_records(street, series, text=day_text_replies(dates, iter(await pipe.execute())))
+
+    async def _ts_mrange_many(self, street: str, start_ms: int, end_ms: int, queries: List) -> List:
+        """TS.MRANGE-Abfragen, im Cluster TS.RANGE pro Serie (wie PedestrianRedisClient)"""
+        reader = self.reader
+        if not self.cluster:
+            return [
+                await reader.ts().mrange(start_ms, end_ms, filters=ts_mrange_filters(street, metrics), **aggregation)
+                for metrics, aggregation in queries
+            ]
+
+        pipe = reader.pipeline(transaction=False)
+        for metrics, aggregation in queries:
+            queue_ts_ranges(pipe, street, start_ms, end_ms, metrics, aggregation)
+        replies = iter(await pipe.execute(raise_on_error=False))
+        return [ts_range_series(street, metrics, replies) for metrics, _ in queries]
+
+    # ============================================
+    # KENNZAHLEN (LUA)
+    # ============================================
+
+    async def get_range_summary(self, street: str, start_date: str, end_date: str) -> Dict:
+        """Kennzahlen eines Zeitraums, serverseitig per Lua mit clientseitigem Fallback (wie PedestrianRedisClient)"""
+        with self._read_scope():
+            if self.storage_backend == 'hash' and self._lua_summary:
+                reader = self.reader
+                pipe = reader.pipeline(transaction=False)
+                queue_summary_context(pipe, street, start_date, end_date)
+
+                if lua_summary_possible(await pipe.execute()):
+                    try:
+                        summary = empty_summary()
+                        min_score, end_ts = range_scores(start_date, end_date)
+                        while min_score is not None:
+                            reply = await self._summary_script(client=reader, **summary_script_call(street, min_score, end_ts))
+                            min_score = next_summary_score(summary, reply)
+                        return finalize_summary(street, start_date, end_date, summary, 'lua')
+                    except ResponseError as e:
+                        print(f"⚠️  Lua aggregation unavailable, using client-side summary: {e}")
+                        self._lua_summary = False
+
+            records = await self.get_historical_range(street, start_date, end_date)
+        return finalize_summary(street, start_date, end_date, summarize_records(records), 'client')
+
+    async def get_range_statistics(self, street: str, start_date: str, end_date: str) -> Dict:
+        """
+        Summary-Cards des Frontends (StatisticsData, siehe database/aggregation.py)
+        aus den Stundenwerten des Zeitraums; abgeschlossene Tage kommen aus dem Day-Cache.
+        """
+        return compute_statistics(await self.get_historical_range(street, start_date, end_date))
+
+    async def get_range_heatmap(self, street: str, start_date: str, end_date: str, metric: str = 'mean') -> Dict:
+        """Wochentag×Stunde-Matrix, abgeschlossene Zeiträume aus Redis (wie PedestrianRedisClient)"""
+        parse_heatmap_metric(metric)
+        if not heatmap_cacheable(end_date):
+            heatmap = compute_heatmap(await self.get_historical_range(street, start_date, end_date), metric)
+            return heatmap_response(street, start_date, end_date, heatmap, False)
+
+        pipe = self.reader.pipeline(transaction=False)
+        queue_heatmap_lookup(pipe, street, start_date, end_date, metric)
+        version, heatmap = parse_heatmap_lookup(await pipe.execute())
+        if heatmap is not None:
+            return heatmap_response(street, start_date, end_date, heatmap, True)
+
+        heatmap = compute_heatmap(await self.get_historical_range(street, start_date, end_date), metric)
+        pipe = self.client.pipeline(transaction=False)
+        queue_heatmap_store(pipe, street, start_date, end_date, metric, version, heatmap)
+        await pipe.execute()
+        return heatmap_response(street, start_date, end_date, heatmap, False)
+
+    # ============================================
+    # ROLLUPS (TAG / WOCHE / MONAT)
+    # ============================================
+
+    async def get_rollup(self, street: str, granularity: str, start_date: str, end_date: str) -> List[Dict]:
+        """Aggregierte Werte pro Tag, ISO-Woche oder Monat aus den Rollup-Hashes (wie PedestrianRedisClient)"""
+        with self._read_scope():
+            reader = self.reader
+            start_ts, end_ts = rollup_index_scores(granularity, start_date, end_date)
+            periods = await reader.zrangebyscore(rollup_index_key(street, granularity), start_ts, end_ts, withscores=True)
+            if periods:
+                pipe = reader.pipeline(transaction=False)
+                queue_rollup_hashes(pipe, street, granularity, periods)
+                rollups = []
+                for rollup in parse_rollup_hashes(granularity, periods, await pipe.execute()):
+                    if isinstance(rollup, tuple):
+                        rollup = aggregate_records(await self.get_historical_range(street, *rollup), granularity)
+                    else:
+                        rollup = [rollup]
+                    rollups.extend(rollup)
+                return rollups
+
+            if self.storage_backend == 'timeseries':
+                start_ms, end_ms = ts_range_ms(start_date, end_date)
+                try:
+                    replies = await self._ts_mrange_many(street, start_ms, end_ms, ts_rollup_queries(start_ms))
+                except ResponseError:
+                    return []
+                return ts_rollups(granularity, *replies)
+
+            records = await self.get_historical_range(street, start_date, end_date)
+        return aggregate_records(records, granularity)
+
+    # ============================================
+    # PREDICTIONS
+    # ============================================
+
+    async def get_prediction_range(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        """Vorhersagen einer Straße im Zeitraum, sortiert nach Zeit"""
+        return (await self.get_prediction_range_many([street], start_date, end_date))[street]
+
+    async def get_prediction_range_many(self, streets: List[str], start_date: str, end_date: str) -> Dict[str, List[Dict]]:
+        """Vorhersagen mehrerer Straßen in zwei Round-Trips: erst Index-Lookups, dann Hashes/Records"""
+        reader, binary_reader = self._readers()
+        streets = list(dict.fromkeys(streets))
+        try:
+            start_ts = datetime.fromisoformat(f"{start_date}T00:00:00").timestamp()
+            end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+
+            pipe = reader.pipeline(transaction=False)
+            for street in streets:
+                pipe.exists(prediction_index_key(street))
+                pipe.zrangebyscore(prediction_index_key(street), start_ts, end_ts)
+            replies = await pipe.execute()
+
+            keys = {
+                street: indexed if exists else prediction_candidate_keys(street, start_date, end_date)
+                for street, exists, indexed in zip(streets, replies[0::2], replies[1::2])
+            }
+
+            pipe = binary_reader.pipeline(transaction=False)
+            for street in streets:
+                for key in keys[street]:
+                    queue_stored_record(pipe, key)
+            replies = iter(await pipe.execute() if len(pipe) else [])
+
+            return {
+                street: sorted([
+                    r for r in (decode_stored_record(key, next(replies)) for key in keys[street]) if r
+                ], key=record_sort_key)
+                for street in streets
+            }
+
+        except Exception as e:
+            print(f"Error fetching predictions for {', '.join(streets)}: {e}")
+            return {street: [] for street in streets}
+
+    async def get_prediction_count(self, street: Optional[str] = None) -> int:
+        """Anzahl verfügbarer Vorhersagen"""
+        reader = self.reader
+        try:
+            streets = [street] if street else await reader.smembers(prediction_streets_key())
+            if not streets:
+                return 0
+            pipe = reader.pipeline(transaction=False)
+            for name in streets:
+                pipe.zcard(prediction_index_key(name))
+            return sum(await pipe.execute())
+        except Exception as e:
+            print(f"Error counting predictions: {e}")
+            return 0
+
+    async def get_latest_prediction_timestamp(self, street: str) -> Optional[str]:
+        """Zeitstempel der neuesten Vorhersage einer Straße"""
+        try:
+            latest = await self.reader.zrange(prediction_index_key(street), -1, -1, withscores=True)
+            return datetime.fromtimestamp(latest[0][1]).isoformat() if latest else None
+        except Exception as e:
+            print(f"Error getting latest prediction timestamp: {e}")
+            return None
+
+    async def get_prediction_status(self, street: str) -> Dict:
+        """Anzahl, neueste Zielstunde und Generations-Metadaten in einem Round-Trip"""
+        pipe = self.reader.pipeline(transaction=False)
+        pipe.zcard(prediction_index_key(street))
+        pipe.zrange(prediction_index_key(street), -1, -1, withscores=True)
+        pipe.hgetall(prediction_status_key(street))
+        count, latest, status = await pipe.execute()
+        return build_prediction_status(count, latest, status)
+
+    # ============================================
+    # KALENDER
+    # ============================================
+
+    async def get_holiday_info(self, date: str) -> Optional[Dict]:
+        return parse_holiday(await self.reader.hgetall(f"holiday:{date}"))
+
+    async def get_detailed_holiday_info(self, date: str) -> Optional[Dict]:
+        return parse_detailed_holiday(await self.reader.hgetall(f"holiday:detail:{date}"))
+
+    async def get_school_holiday_period(self, date: str) -> Optional[Dict]:
+        return parse_school_holiday_period(await self.reader.hgetall(f"school_holiday:day:{date}"))
+
+    async def get_all_school_holiday_periods(self) -> List[Dict]:
+        return list((await self.get_reference_data()).school_holiday_periods)
+
+    async def get_all_public_holidays(self) -> List[Dict]:
+        return list((await self.get_reference_data()).public_holidays)
+
+    async def get_calendar_flags(self, start_date: str, end_date: str,
+                                 flags: Optional[List[str]] = None) -> Dict:
+        ranges = flag_ranges(flags or DAY_FLAGS + HOUR_FLAGS, start_date, end_date)
+        pipe = self.binary_reader.pipeline(transaction=False)
+        for flag, first_bit, last_bit in ranges:
+            pipe.exists(bitmap_key(flag))
+            pipe.getrange(bitmap_key(flag), *byte_range(first_bit, last_bit))
+        replies = await pipe.execute()
+        missing = missing_bitmaps(ranges, replies[0::2])
+        if missing:
+            raise ValueError(f"Calendar bitmaps missing: {', '.join(missing)} (scripts/build_calendar_bitmaps.py)")
+        return decode_flags(ranges, replies[1::2])
+
+    async def get_event_info(self, date: str, hour: int = None) -> Optional[Dict]:
+        if hour is not None:
+            return parse_event_hour(await self.reader.hgetall(f"event:{date}:{hour}"))
+        return (await self.get_event_info_many([date]))[date]
+
+    async def get_event_info_many(self, dates: List[str]) -> Dict[str, Dict]:
+        return await self._get_event_days('events', dates)
+
+    async def _get_event_days(self, source: str, dates: List[str]) -> Dict[str, Dict]:
+        """Tages-Aggregate einer Event-Quelle (wie PedestrianRedisClient)"""
+        reader = self.reader
+        dates = list(dict.fromkeys(dates))
+        pipe = reader.pipeline(transaction=False)
+        queue_event_days(pipe, source, dates)
+        result, missing = parse_event_days(source, dates, await pipe.execute())
+
+        if missing:
+            pipe = reader.pipeline(transaction=False)
+            queue_event_hours(pipe, source, missing)
+            result.update(merge_event_day_hours(source, missing, await pipe.execute()))
+
+        return result
+
+    async def get_detailed_event_info(self, date: str, hour: int = None) -> Optional[Dict]:
+        if hour is not None:
+            return parse_detailed_event_hour(await self.reader.hgetall(f"event:detail:hour:{date}:{hour}"))
+        return (await self.get_detailed_event_info_many([date]))[date]
+
+    async def get_detailed_event_info_many(self, dates: List[str]) -> Dict[str, Dict]:
+        return await self._get_event_days('detailed', dates)
+
+    async def get_calendar_range(self, start_date: str, end_date: str) -> Dict[str, Dict]:
+        """Kalender aller Tage im Zeitraum (wie PedestrianRedisClient), Abfragen parallel"""
+        dates = _date_range(start_date, end_date)
+        with self._read_scope():
+            pipe = self.reader.pipeline(transaction=False)
+            queue_calendar_days(pipe, dates)
+            replies, events, detailed_events = await asyncio.gather(
+                pipe.execute(),
+                self.get_event_info_many(dates),
+                self.get_detailed_event_info_many(dates)
+            )
+        return build_calendar_range(dates, replies, events, detailed_events)
+
+    async def get_lecture_info(self, date: str) -> Optional[Dict]:
+        return parse_lecture(date, await self.reader.hgetall(f"lecture:daily:{date}"))
+
+    # ============================================
+    # LOCATIONS
+    # ============================================
+
+    async def get_location_by_street(self, street_name: str) -> Optional[Dict]:
+        return (await self.get_reference_data()).location_by_street(street_name)
+
+    async def get_all_locations(self) -> List[Dict]:
+        return list((await self.get_reference_data()).locations)
+
+    async def get_lecture_periods(self) -> List[Dict]:
+        return list((await self.get_reference_data()).lecture_periods)
+
+    async def get_event_periods(self) -> List[Dict]:
+        return list((await self.get_reference_data()).event_periods)
+
+    # ============================================
+    # STAMMDATEN-SNAPSHOT
+    # ============================================
+
+    async def get_reference_data(self) -> ReferenceSnapshot:
+        """Stammdaten aus dem Speicher; siehe PedestrianRedisClient.get_reference_data"""
+        cache = self.reference_cache
+        if cache.needs_check():
+            with self._read_scope():
+                versions = parse_reference_versions(
+                    await self.reader.hmget(REFERENCE_VERSION_KEY, *REFERENCE_DATASETS))
+                if not cache.is_current(versions):
+                    cache.install(await self._load_reference_snapshot(versions))
+        return cache.snapshot
+
+    async def _load_reference_snapshot(self, versions) -> ReferenceSnapshot:
+        reader = self.reader
+        streets = sorted(await reader.smembers('locations:all_streets'))
+        source_keys = {}
+        for name, pattern in REFERENCE_SOURCES:
+            keys = [key async for key in reader.scan_iter(match=pattern, count=1000)]
+            source_keys[name] = reference_source_keys(name, keys)
+        pipe = reader.pipeline(transaction=False)
+        queue_reference_load(pipe, streets, source_keys)
+        return build_reference_snapshot(versions, streets, source_keys, await pipe.execute() if len(pipe) else [])
@@ -0,0 +1,118 @@
+# backend/database/calendar_bitmaps.py
+"""
+Kalender-Flags als Redis-Bitmaps.
+
+Tages-Flags liegen unter ``calendar:bitmap:{flag}`` mit Bit ``n`` = n-ter Tag
+seit ``CALENDAR_EPOCH``, Stunden-Flags (Events/Konzerte) mit Bit ``n`` = n-te
+Stunde seit Mitternacht der Epoche. Die Offsets werden kalendarisch gerechnet
+(Tage * 24 + Stunde), Sommer-/Winterzeit verschiebt also nichts.
+
+Ein Zeitraum ist damit ein einziger GETRANGE; die Flag-Namen entsprechen den
+Spalten der ML-Feature-Joins (``data/*_daily.csv``, siehe ML/predict.py).
+Fehlt eine Bitmap, schlägt die Abfrage fehl, statt nur ``False`` zu liefern.
+"""
+from datetime import date as date_cls, datetime, timedelta
+from typing import Iterable, Tuple
+
+import numpy as np
+
+from database.keys import city_key
+
+CALENDAR_EPOCH = date_cls(2015, 1, 1)
+
+DAY_FLAGS = ('public_holiday', 'nationwide', 'school_holiday', 'lecture_period_jmu')
+HOUR_FLAGS = ('event', 'concert')
+
+
+def bitmap_key(flag: str) -> str:
+    return city_key(f"calendar:bitmap:{flag}")
+
+
+def day_offset(date: str) -> int:
+    return (datetime.strptime(date, '%Y-%m-%d').date() - CALENDAR_EPOCH).days
+
+
+def hour_offset(date: str, hour: int) -> int:
+    return day_offset(date) * 24 + int(hour)
+
+
+def offset_to_date(offset: int) -> str:
+    return (CALENDAR_EPOCH + timedelta(days=offset)).isoformat()
+
+
+def bit_range(flag: str, start_date: str, end_date: str) -> Tuple[int, int]:
+    """Erstes und letztes Bit (inklusive) eines Zeitraums"""
+    if flag in HOUR_FLAGS:
+        return hour_offset(start_date, 0), hour_offset(end_date, 23)
+    if flag in DAY_FLAGS:
+        return day_offset(start_date), day_offset(end_date)
+    raise ValueError(f"Unknown calendar flag: {flag}")
+
+
+def byte_range(first_bit: int, last_bit: int) -> Tuple[int, int]:
+    """Byte-Bereich für GETRANGE (negative Offsets vor der Epoche auf 0 begrenzt)"""
+    return max(first_bit, 0) // 8, max(last_bit, 0) // 8
+
+
+def bits_to_array(raw: bytes, first_bit: int, last_bit: int) -> np.ndarray:
+    """
+    Wandelt eine GETRANGE-Antwort in ein Bool-Array mit einem Eintrag pro Bit.
+    Redis zählt Bits ab dem höchstwertigen Bit (wie ``np.unpackbits``); fehlende
+    Bytes am Ende und Tage vor der Epoche gelten als nicht gesetzt.
+    """
+    length = last_bit - first_bit + 1
+    flags = np.zeros(max(length, 0), dtype=bool)
+    if length <= 0 or last_bit < 0:
+        return flags
+
+    start_byte, _ = byte_range(first_bit, last_bit)
+    bits = np.unpackbits(np.frombuffer(raw or b'', dtype=np.uint8)).astype(bool)
+
+    skip = max(first_bit, 0) - start_byte * 8
+    lead = max(-first_bit, 0)
+    available = bits[skip:skip + length - lead]
+    flags[lead:lead + available.size] = available
+    return flags
+
+
+def write_bitmap(r, flag: str, offsets: Iterable[int]):
+    """
+    Baut eine Bitmap neu auf: SETBIT in einen temporären Key, dann RENAME, damit
+    Leser nie eine halb gebaute oder leere Bitmap sehen. Ohne TTL (Stammdaten);
+    Bit 0 wird immer geschrieben, damit auch eine Bitmap ohne Treffer existiert.
+    """
+    key = bitmap_key(flag)
+    building = f"{key}:building"
+    pipe = r.pipeline(transaction=False)
+    pipe.delete(building)
+    pipe.setbit(building, 0, 0)
+    count = 0
+    for offset in offsets:
+        if offset >= 0:
+            pipe.setbit(building, offset, 1)
+            count += 1
+    pipe.rename(building, key)
+    pipe.execute()
+    return count
+
+
+def missing_bitmaps(ranges, exists) -> list:
+    """Flags, deren Bitmap fehlt (EXISTS-Antworten in der Reihenfolge von ``ranges``)"""
+    return [flag for (flag, _, _), found in zip(ranges, exists) if not found]
+
+
+def flag_ranges(flags: Iterable[str], start_date: str, end_date: str):
+    """(flag, erstes Bit, letztes Bit) für jeden angefragten Flag"""
+    return [(flag, *bit_range(flag, start_date, end_date)) for flag in flags]
+
+
+def decode_flags(ranges, replies) -> dict:
+    """
+    GETRANGE-Antworten zu ``flag -> np.ndarray``: Tages-Flags eindimensional
+    (ein Eintrag pro Tag), Stunden-Flags als (Tage, 24).
+    """
+    result = {}
+    for (flag, first_bit, last_bit), raw in zip(ranges, replies):
+        flags = bits_to_array(raw, first_bit, last_bit)
+        result[flag] = flags.reshape(-1, 24) if flag in HOUR_FLAGS else flags
+    return result
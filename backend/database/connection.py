@@ -0,0 +1,152 @@
+# backend/database/connection.py
+"""
+Verbindungsaufbau zu Redis: Einzelknoten oder Redis Cluster (config.REDIS_CLUSTER).
+
+Einzelknoten teilen sich pro Prozess einen Connection-Pool je Ziel; Clients und
+Skripte öffnen damit keine eigenen Verbindungen mehr. Lesezugriffe können über
+``ReplicaRouter`` auf Read-Replicas verteilt werden (config.REDIS_REPLICAS).
+"""
+import asyncio
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+from redis.cluster import RedisCluster
+
+import config
+
+_POOLS: Dict[Tuple, redis.ConnectionPool] = {}
+
+
+def check_key_scheme(cluster: bool):
+    """Im Cluster müssen alle Keys einer Straße im selben Slot liegen"""
+    if cluster and config.KEY_SCHEME != 'tagged':
+        raise ValueError("Redis Cluster requires KEY_SCHEME=tagged (see scripts/migrate_key_scheme.py)")
+
+
+def connect_redis(host: Optional[str] = None, port: Optional[int] = None, db: int = 0,
+                  decode_responses: bool = True, cluster: Optional[bool] = None):
+    """redis.Redis bzw. RedisCluster mit gleicher Schnittstelle"""
+    host = host or config.REDIS_HOST
+    port = port or config.REDIS_PORT
+    cluster = config.REDIS_CLUSTER if cluster is None else cluster
+
+    if cluster:
+        # Cluster kennt nur Datenbank 0
+        return RedisCluster(host=host, port=port, decode_responses=decode_responses)
+    return redis.Redis(connection_pool=shared_pool(host, port, db, decode_responses))
+
+
+def shared_pool(host: str, port: int, db: int = 0, decode_responses: bool = True) -> redis.ConnectionPool:
+    """Ein Pool pro Ziel und Prozess; bei Erschöpfung warten statt neue Verbindungen öffnen"""
+    key = (host, port, db, decode_responses)
+    if key not in _POOLS:
+        _POOLS[key] = redis.BlockingConnectionPool(
+            host=host, port=port, db=db,
+            max_connections=config.REDIS_MAX_CONNECTIONS,
+            timeout=config.REDIS_POOL_TIMEOUT,
+            health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL,
+            socket_keepalive=True,
+            decode_responses=decode_responses
+        )
+    return _POOLS[key]
+
+
+def connect_async_cluster(host: str, port: int, max_connections: int, decode_responses: bool = True):
+    """Async-Cluster-Client; Verbindungen werden pro Knoten begrenzt"""
+    return aioredis.RedisCluster(
+        host=host, port=port,
+        max_connections=max_connections,
+        decode_responses=decode_responses
+    )
+
+
+def connect_async(host: str, port: int, db: int, max_connections: int, decode_responses: bool = True):
+    """Async-Client auf eigenem BlockingConnectionPool (Pools gehören zur Event-Loop)"""
+    return aioredis.Redis(connection_pool=aioredis.BlockingConnectionPool(
+        host=host, port=port, db=db,
+        max_connections=max_connections,
+        timeout=config.REDIS_POOL_TIMEOUT,
+        health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL,
+        decode_responses=decode_responses
+    ))
+
+
+# ============================================
+# READ-REPLICAS
+# ============================================
+
+def replica_link_up(info: Dict) -> bool:
+    """INFO replication einer Replica: verbunden und synchron mit dem Primary"""
+    return info.get('role') == 'slave' and info.get('master_link_status') == 'up'
+
+
+class ReplicaRouter:
+    """
+    Round-Robin über Read-Replicas mit Health-Check (INFO replication), höchstens
+    alle REDIS_REPLICA_CHECK_INTERVAL Sekunden pro Replica. Ohne gesunde Replica
+    wird vom Primary gelesen.
+
+    ``primary`` und jede Replica sind Paare (Text-Client, Binär-Client), damit
+    zusammengehörige Lesezugriffe denselben Knoten treffen.
+    """
+
+    def __init__(self, primary: Tuple, replicas: List[Tuple]):
+        self.primary = primary
+        self.replicas = replicas
+        self._healthy = [True] * len(replicas)
+        self._checked = [0.0] * len(replicas)
+        self._next = itertools.count()
+
+    def _order(self) -> List[int]:
+        start = next(self._next)
+        return [(start + offset) % len(self.replicas) for offset in range(len(self.replicas))]
+
+    def _due(self, index: int) -> bool:
+        now = time.monotonic()
+        if now - self._checked[index] < config.REDIS_REPLICA_CHECK_INTERVAL:
+            return False
+        self._checked[index] = now
+        return True
+
+    def _check(self, index: int):
+        try:
+            self._healthy[index] = replica_link_up(self.replicas[index][0].info('replication'))
+        except redis.RedisError:
+            self._healthy[index] = False
+
+    def route(self) -> Tuple:
+        for index in self._order():
+            if self._due(index):
+                self._check(index)
+            if self._healthy[index]:
+                return self.replicas[index]
+        return self.primary
+
+
+class AsyncReplicaRouter(ReplicaRouter):
+    """Wie ReplicaRouter; Health-Checks laufen als Task, route() blockiert nie"""
+
+    def __init__(self, primary: Tuple, replicas: List[Tuple]):
+        super().__init__(primary, replicas)
+        # Bis zum ersten Check vom Primary lesen
+        self._healthy = [False] * len(replicas)
+        self._tasks = set()
+
+    async def _check_async(self, index: int):
+        try:
+            self._healthy[index] = replica_link_up(await self.replicas[index][0].info('replication'))
+        except (redis.RedisError, OSError):
+            self._healthy[index] = False
+
+    def route(self) -> Tuple:
+        for index in self._order():
+            if self._due(index):
+                task = asyncio.get_running_loop().create_task(self._check_async(index))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            if self._healthy[index]:
+                return self.replicas[index]
+        return self.primary
@@ -0,0 +1,166 @@
+# backend/database/day_cache.py
+"""
+In-Process-LRU-Cache für dekodierte Straßen-Tage vor ``get_historical_range``.
+
+Tage, die älter als das Nachlade-Fenster des Schedulers sind, ändern sich nicht
+mehr und bleiben gültig, solange kein Schreibzugriff auf alte Tage erfolgt.
+Der aktuelle Tag und die Tage davor (``mutable_days``) sind nur bis zum nächsten
+Schreibzugriff auf die Straße gültig; das gilt auch, nachdem der Tag aus dem
+Fenster gefallen ist (ein Eintrag merkt sich, ob er noch offen war). Beides wird über den Versions-Hash
+``pedestrian:version:{street}`` geprüft, den jeder Schreibpfad hochzählt:
+
+    history     - zählt nur Schreibzugriffe auf ältere (eigentlich feste) Tage
+    all         - zählt jeden Schreibzugriff
+    predictions - zählt jedes store_predictions (nur für ETags, siehe api/conditional.py)
+"""
+import sys
+from collections import OrderedDict
+from datetime import date as date_cls, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Versions = Tuple[int, ...]
+DATA_VERSION_FIELDS = ('history', 'all', 'predictions')
+
+
+def mutable_cutoff(mutable_days: int) -> str:
+    """Erster Tag, der sich noch ändern kann"""
+    return (date_cls.today() - timedelta(days=mutable_days - 1)).isoformat()
+
+
+def parse_versions(reply: List) -> Versions:
+    """
+    HMGET-Antwort auf den Versions-Hash in ein Versions-Tupel umwandeln: Felder
+    in der angefragten Reihenfolge, fehlende als 0. Der Day-Cache fragt (history, all)
+    ab, ETags alle drei DATA_VERSION_FIELDS (history, all, predictions).
+    """
+    return tuple(int(v) if v else 0 for v in reply)
+
+
+def bounds_from_index(first: List, last: List) -> Optional[Tuple[str, str]]:
+    """Erster und letzter Tag aus ZRANGE 0 0 / -1 -1 WITHSCORES eines Index"""
+    if not first or not last:
+        return None
+    return (
+        datetime.fromtimestamp(first[0][1]).strftime('%Y-%m-%d'),
+        datetime.fromtimestamp(last[0][1]).strftime('%Y-%m-%d'),
+    )
+
+
+def bounds_from_samples(first: List, last: List) -> Optional[Tuple[str, str]]:
+    """Erster und letzter Tag aus TS.RANGE / TS.REVRANGE ... COUNT 1"""
+    if not first or not last:
+        return None
+    return (
+        datetime.fromtimestamp(first[0][0] / 1000).strftime('%Y-%m-%d'),
+        datetime.fromtimestamp(last[0][0] / 1000).strftime('%Y-%m-%d'),
+    )
+
+
+def merge_bounds(*bounds: Optional[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+    found = [b for b in bounds if b]
+    if not found:
+        return None
+    return min(b[0] for b in found), max(b[1] for b in found)
+
+
+def _records_size(records: List[Dict]) -> int:
+    """Ungefährer Speicherbedarf einer Tagesliste in Bytes"""
+    size = sys.getsizeof(records)
+    for record in records:
+        size += sys.getsizeof(record)
+        for key, value in record.items():
+            size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+class DayCache:
+    """LRU-Cache ``(street, date) -> Datensätze`` mit Byte-Limit"""
+
+    def __init__(self, max_bytes: int, mutable_days: int = 2):
+        self.max_bytes = max_bytes
+        self.mutable_days = mutable_days
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, street: str, dates: List[str],
+               versions: Versions) -> Tuple[Dict[str, List[Dict]], List[str]]:
+        """Liefert (gefundene Tage, fehlende Tage)"""
+        cutoff = mutable_cutoff(self.mutable_days)
+        hits = {}
+        missing = []
+
+        for date in dates:
+            key = (street, date)
+            entry = self._entries.get(key)
+            if entry is not None:
+                records, size, entry_versions, mutable = entry
+                # Feste Tage: nur history muss passen; offene (oder offen gecachte) Tage: jede Schreibversion
+                index = 1 if mutable or date >= cutoff else 0
+                if entry_versions[index] == versions[index]:
+                    self._entries.move_to_end(key)
+                    hits[date] = records
+                    continue
+                self._remove(key)
+            missing.append(date)
+
+        self.hits += len(hits)
+        self.misses += len(missing)
+        return hits, missing
+
+    def fill(self, street: str, dates: Iterable[str], records: List[Dict],
+             versions: Versions) -> Dict[str, List[Dict]]:
+        """Gruppiert frisch gelesene Datensätze nach Tag und legt ``dates`` ab"""
+        by_date = {date: [] for date in dates}
+        for record in records:
+            day = by_date.get(record.get('date'))
+            if day is not None:
+                day.append(record)
+
+        for date, day_records in by_date.items():
+            self.put(street, date, day_records, versions)
+        return by_date
+
+    def put(self, street: str, date: str, records: List[Dict], versions: Versions):
+        key = (street, date)
+        if key in self._entries:
+            self._remove(key)
+
+        size = _records_size(records)
+        if size > self.max_bytes:
+            return
+
+        mutable = date >= mutable_cutoff(self.mutable_days)
+        self._entries[key] = (records, size, versions, mutable)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, street: str, dates: Optional[Iterable[str]] = None):
+        """Verwirft Tage einer Straße (alle, wenn ``dates`` fehlt)"""
+        if dates is None:
+            keys = [key for key in self._entries if key[0] == street]
+        else:
+            keys = [(street, date) for date in dates if (street, date) in self._entries]
+        for key in keys:
+            self._remove(key)
+
+    def _remove(self, key):
+        size = self._entries.pop(key)[1]
+        self.bytes -= size
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+        }
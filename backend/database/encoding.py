@@ -0,0 +1,439 @@
+# backend/database/encoding.py
+"""
+Binäre Kodierung für Passantendaten.
+
+Tages-Block (STORAGE_BACKEND=packed): ein Straßen-Tag wird als ein Redis-String fester Breite gespeichert:
+24 Slots à ``DAY_SLOT_DTYPE.itemsize`` Bytes, Slot ``h`` beginnt bei Offset
+``h * DAY_SLOT_SIZE``. Dadurch kann eine einzelne Stunde per SETRANGE
+überschrieben werden, ohne den Rest des Tages zu lesen.
+
+Textfelder, die ein Slot nicht speichert (``id``, ``city``, ``weekday``,
+``timestamp``), werden beim Lesen aus Straße/Datum/Stunde abgeleitet. Weichen die
+Originalwerte davon ab (Import-IDs, Zeitstempel mit UTC-Offset), stehen sie im
+Text-Anhang des Tages (``encode_hour_text``, Hash ``pedestrian:daytext:...``).
+
+Record-Codec (RECORD_CODEC=struct): eine Stunde als ein Redis-String mit festem,
+typisiertem Kopf (``RECORD_STRUCT``) und den übrigen Textfeldern dahinter.
+Dekodiert ergibt er dieselben Strings wie HGETALL auf dem Hash.
+"""
+import json
+import math
+import re
+import struct
+from datetime import date as date_type, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# ============================================
+# ENUM-TABELLEN (Index = Code, 0 = unbekannt/leer)
+# ============================================
+
+WEATHER_CONDITIONS = (
+    '', 'clear-day', 'clear-night', 'partly-cloudy-day', 'partly-cloudy-night',
+    'cloudy', 'rain', 'snow', 'sleet', 'wind', 'fog', 'hail', 'thunderstorm'
+)
+INCIDENTS = ('', 'no_incident', 'incidents', 'verified', 'unverified')
+COLLECTION_TYPES = ('', 'measured', 'estimated', 'predicted')
+WEEKDAYS = ('', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+_WEATHER_CODES = {name: code for code, name in enumerate(WEATHER_CONDITIONS)}
+_INCIDENT_CODES = {name: code for code, name in enumerate(INCIDENTS)}
+_COLLECTION_CODES = {name: code for code, name in enumerate(COLLECTION_TYPES)}
+_WEEKDAY_CODES = {name: code for code, name in enumerate(WEEKDAYS)}
+
+# Temperatur in Hundertstel Grad, fehlender Wert als Sentinel
+TEMPERATURE_SCALE = 100
+TEMPERATURE_MISSING = np.iinfo(np.int16).min
+
+# ============================================
+# TAGES-BLOCK
+# ============================================
+
+DAY_SLOT_DTYPE = np.dtype([
+    ('n_pedestrians', '<i4'),
+    ('n_pedestrians_towards', '<i4'),
+    ('n_pedestrians_away', '<i4'),
+    ('temperature', '<i2'),
+    ('weather_condition', 'u1'),
+    ('incidents', 'u1'),
+    ('collection_type', 'u1'),
+    ('present', 'u1'),
+])
+DAY_SLOT_SIZE = DAY_SLOT_DTYPE.itemsize
+DAY_BLOCK_SIZE = DAY_SLOT_SIZE * 24
+
+
+def _to_int(value) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def encode_temperature(value) -> int:
+    """Wandelt eine Temperatur (String/Float) in Hundertstel Grad um"""
+    if value is None or value == '':
+        return int(TEMPERATURE_MISSING)
+    try:
+        return int(round(float(value) * TEMPERATURE_SCALE))
+    except (TypeError, ValueError):
+        return int(TEMPERATURE_MISSING)
+
+
+def decode_temperature(value: int) -> Optional[float]:
+    if value == TEMPERATURE_MISSING:
+        return None
+    return value / TEMPERATURE_SCALE
+
+
+def encode_weather_condition(value: Optional[str]) -> int:
+    return _WEATHER_CODES.get(value or '', 0)
+
+
+def encode_hour_slot(data: Dict) -> bytes:
+    """Kodiert einen stündlichen Datensatz (Hash-Format) in einen Slot"""
+    slot = np.zeros(1, dtype=DAY_SLOT_DTYPE)
+    slot['n_pedestrians'] = _to_int(data.get('n_pedestrians'))
+    slot['n_pedestrians_towards'] = _to_int(data.get('n_pedestrians_towards'))
+    slot['n_pedestrians_away'] = _to_int(data.get('n_pedestrians_away'))
+    slot['temperature'] = encode_temperature(data.get('temperature'))
+    slot['weather_condition'] = encode_weather_condition(data.get('weather_condition'))
+    slot['incidents'] = _INCIDENT_CODES.get(data.get('incidents') or '', 0)
+    slot['collection_type'] = _COLLECTION_CODES.get(data.get('collection_type') or '', 0)
+    slot['present'] = 1
+    return slot.tobytes()
+
+
+def decode_day_block(raw: Optional[bytes]) -> np.ndarray:
+    """
+    Dekodiert einen Tages-Block in ein strukturiertes Array mit 24 Slots.
+    Kürzere Werte (nur frühe Stunden geschrieben) werden mit leeren Slots aufgefüllt.
+    """
+    block = np.zeros(24, dtype=DAY_SLOT_DTYPE)
+    if raw:
+        usable = min(len(raw), DAY_BLOCK_SIZE) // DAY_SLOT_SIZE
+        block[:usable] = np.frombuffer(raw, dtype=DAY_SLOT_DTYPE, count=usable)
+    return block
+
+
+# Abgeleitete Textfelder einer Stunde; abweichende Originalwerte im Text-Anhang
+DAY_TEXT_FIELDS = ('id', 'city', 'weekday', 'timestamp')
+
+
+def derived_text(street: str, date: str, hour: int, city: str = 'Wuerzburg') -> Dict[str, str]:
+    return {
+        'id': f"{street}_{date}_{hour:02d}",
+        'city': city,
+        'weekday': datetime.strptime(date, '%Y-%m-%d').strftime('%A'),
+        'timestamp': f"{date}T{hour:02d}:00:00",
+    }
+
+
+def encode_hour_text(street: str, data: Dict) -> Optional[str]:
+    """Nicht ableitbare Textfelder einer Stunde als JSON (None, wenn alles ableitbar ist)"""
+    derived = derived_text(street, data['date'], int(data['hour']))
+    text = {
+        field: str(data[field]) for field in DAY_TEXT_FIELDS
+        if data.get(field) not in (None, '') and str(data[field]) != derived[field]
+    }
+    return json.dumps(text, ensure_ascii=False) if text else None
+
+
+def decode_day_text(raw: Optional[Dict]) -> Dict[str, Dict]:
+    """HGETALL des Text-Anhangs (Text- oder Binär-Client) -> Stunde (str) -> Textfelder"""
+    return {
+        (hour.decode() if isinstance(hour, bytes) else hour): json.loads(value)
+        for hour, value in (raw or {}).items()
+    }
+
+
+def day_block_to_records(street: str, date: str, block: np.ndarray,
+                         city: str = 'Wuerzburg', first_hour: int = 0,
+                         text: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """
+    Wandelt einen dekodierten Tages-Block in Datensätze im Hash-Format um.
+    ``first_hour`` erlaubt das Dekodieren eines Ausschnitts (z.B. eines GETRANGE),
+    ``text`` ist der dekodierte Text-Anhang des Tages (decode_day_text).
+    """
+    slots = np.flatnonzero(block['present'])
+    if slots.size == 0:
+        return []
+
+    weekday = datetime.strptime(date, '%Y-%m-%d').strftime('%A')
+    counts = block['n_pedestrians'][slots].tolist()
+    towards = block['n_pedestrians_towards'][slots].tolist()
+    away = block['n_pedestrians_away'][slots].tolist()
+    temps = block['temperature'][slots].tolist()
+    conditions = block['weather_condition'][slots].tolist()
+    incidents = block['incidents'][slots].tolist()
+    collection = block['collection_type'][slots].tolist()
+
+    records = []
+    for i, hour in enumerate((slots + first_hour).tolist()):
+        temperature = decode_temperature(temps[i])
+        record = {
+            'id': f"{street}_{date}_{hour:02d}",
+            'street': street,
+            'city': city,
+            'date': date,
+            'hour': str(hour),
+            'weekday': weekday,
+            'n_pedestrians': str(counts[i]),
+            'n_pedestrians_towards': str(towards[i]),
+            'n_pedestrians_away': str(away[i]),
+            'temperature': f"{temperature:g}" if temperature is not None else '',
+            'weather_condition': WEATHER_CONDITIONS[conditions[i]],
+            'incidents': INCIDENTS[incidents[i]],
+            'collection_type': COLLECTION_TYPES[collection[i]],
+            'timestamp': f"{date}T{hour:02d}:00:00",
+        }
+        if text and str(hour) in text:
+            record.update(text[str(hour)])
+        # Leere Werte wie beim CSV-Import weglassen
+        records.append({k: v for k, v in record.items() if v != ''})
+    return records
+
+
+# ============================================
+# EINZELNER DATENSATZ (RECORD-CODEC)
+# ============================================
+
+# Version, Flags, Tage seit 1970-01-01, Stunde, Zählwerte, Temperatur, Enum-Codes
+RECORD_STRUCT = struct.Struct('<BBHBiiihBBBB')
+# Version 2: Anhang mit Escaping (Version 1 wird weiterhin gelesen)
+RECORD_VERSION = 2
+RECORD_COUNTS = ('n_pedestrians', 'n_pedestrians_towards', 'n_pedestrians_away')
+RECORD_ENUMS = (
+    ('weekday', _WEEKDAY_CODES, WEEKDAYS),
+    ('weather_condition', _WEATHER_CODES, WEATHER_CONDITIONS),
+    ('incidents', _INCIDENT_CODES, INCIDENTS),
+    ('collection_type', _COLLECTION_CODES, COLLECTION_TYPES),
+)
+# Textfelder im Anhang: erst diese Felder an fester Position (leer = fehlt),
+# danach alle übrigen Felder als Name/Wert-Paare
+RECORD_TEXT_FIELDS = ('id', 'street', 'city', 'timestamp')
+_TEXT_SEP = '\x1f'
+# Trenner und Escape-Zeichen in Werten: ESC ESC bzw. ESC _
+_TEXT_ESC = '\x1b'
+_TEXT_UNESCAPE = re.compile('\x1b(.)', re.S)
+# Flag-Bits: Zählwert exakt im Kopf (Bit 0-2), timestamp entspricht date/hour (Bit 3),
+# Temperatur als Float-Text ("12.0" statt "12", Bit 4)
+_CANONICAL_TIMESTAMP = 1 << 3
+_FLOAT_TEMPERATURE = 1 << 4
+_EPOCH = date_type(1970, 1, 1).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _record_date(days: int) -> str:
+    return date_type.fromordinal(_EPOCH + days).isoformat()
+
+
+def _exact_int(value) -> Optional[int]:
+    """Ganzzahl, deren Text genau dem Hash-Wert entspricht, sonst None (Wert bleibt Text im Anhang)"""
+    try:
+        number = int(str(value))
+    except (TypeError, ValueError):
+        return None
+    if str(number) != str(value) or not -2**31 <= number < 2**31:
+        return None
+    return number
+
+
+def _floor_count(value) -> int:
+    """Zählwert wie math.floor(tonumber(...)) im Summary-Lua für Hashes"""
+    try:
+        number = math.floor(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+    return number if -2**31 <= number < 2**31 else 0
+
+
+def _format_temperature(value: int, flags: int) -> str:
+    temperature = value / TEMPERATURE_SCALE
+    return repr(temperature) if flags & _FLOAT_TEMPERATURE else f"{temperature:g}"
+
+
+def _escape_text(value: str) -> str:
+    return value.replace(_TEXT_ESC, _TEXT_ESC * 2).replace(_TEXT_SEP, _TEXT_ESC + '_')
+
+
+def _unescape_text(value: str) -> str:
+    return _TEXT_UNESCAPE.sub(lambda m: _TEXT_SEP if m.group(1) == '_' else m.group(1), value)
+
+
+def encode_record(data: Dict) -> bytes:
+    """
+    Kodiert einen stündlichen Datensatz (Hash-Format) als Record-Wert.
+    decode_record liefert dieselben Strings wie HGETALL auf dem Hash: was der
+    Kopf nicht exakt wiedergibt (unbekannte Enums, Kommazahlen, abweichende
+    Schreibweisen, leere Werte), landet unverändert im Anhang.
+    """
+    hour = int(data['hour'])
+    days = datetime.strptime(data['date'], '%Y-%m-%d').toordinal() - _EPOCH
+    date = _record_date(days)
+    exact = set()
+    if str(data['date']) == date:
+        exact.add('date')
+    if str(data['hour']) == str(hour):
+        exact.add('hour')
+
+    flags, counts = 0, []
+    for bit, field in enumerate(RECORD_COUNTS):
+        value = data.get(field)
+        if value is None:
+            exact.add(field)
+        elif _exact_int(value) is not None:
+            flags |= 1 << bit
+            exact.add(field)
+        # Auch ungenaue Werte abgerundet im Kopf: das Summary-Lua liest nur den Kopf
+        counts.append(_floor_count(value))
+
+    codes = []
+    for field, table, _ in RECORD_ENUMS:
+        value = data.get(field)
+        code = table.get(value, 0) if isinstance(value, str) else 0
+        if code or value is None:
+            exact.add(field)
+        codes.append(code)
+
+    value = data.get('temperature')
+    temperature = encode_temperature(value)
+    if value is None:
+        exact.add('temperature')
+    elif -2**15 < temperature < 2**15:
+        if str(value) == _format_temperature(temperature, 0):
+            exact.add('temperature')
+        elif str(value) == _format_temperature(temperature, _FLOAT_TEMPERATURE):
+            flags |= _FLOAT_TEMPERATURE
+            exact.add('temperature')
+    if 'temperature' not in exact:
+        temperature = int(TEMPERATURE_MISSING)
+
+    text = []
+    for field in RECORD_TEXT_FIELDS:
+        value = data.get(field)
+        if value != '':
+            exact.add(field)
+        text.append('' if value is None else str(value))
+    if text[-1] == f"{date}T{hour:02d}:00:00":
+        flags |= _CANONICAL_TIMESTAMP
+        text[-1] = ''
+
+    head = RECORD_STRUCT.pack(RECORD_VERSION, flags, days, hour, *counts, temperature, *codes)
+    tail = text
+    for field, value in data.items():
+        if field not in exact and value is not None:
+            tail += [field, str(value)]
+    return head + _TEXT_SEP.join(map(_escape_text, tail)).encode()
+
+
+def decode_record(raw: bytes) -> Dict:
+    """Record-Wert -> Datensatz mit denselben Strings wie HGETALL auf dem Hash"""
+    version, flags, days, hour, n, towards, away, temperature, *codes = RECORD_STRUCT.unpack_from(raw)
+    if version not in (1, RECORD_VERSION):
+        raise ValueError(f"Unknown record version: {version}")
+    date = _record_date(days)
+    record = {'date': date, 'hour': str(hour)}
+    for bit, (field, value) in enumerate(zip(RECORD_COUNTS, (n, towards, away))):
+        if flags & 1 << bit:
+            record[field] = str(value)
+    if temperature != TEMPERATURE_MISSING:
+        record['temperature'] = _format_temperature(temperature, flags)
+    for (field, _, names), code in zip(RECORD_ENUMS, codes):
+        if code:
+            record[field] = names[code]
+
+    tail = raw[RECORD_STRUCT.size:].decode()
+    parts = tail.split(_TEXT_SEP)
+    if version > 1 and _TEXT_ESC in tail:
+        parts = [_unescape_text(part) for part in parts]
+    for field, value in zip(RECORD_TEXT_FIELDS, parts):
+        if value:
+            record[field] = value
+    if flags & _CANONICAL_TIMESTAMP:
+        record['timestamp'] = f"{date}T{hour:02d}:00:00"
+    extra = len(RECORD_TEXT_FIELDS)
+    if len(parts) > extra:
+        record.update(zip(parts[extra::2], parts[extra + 1::2]))
+    return record
+
+
+# ============================================
+# REDISTIMESERIES
+# ============================================
+
+# Kategorische Felder als Code-Serien (0 = leer), Text-Felder im Tages-Anhang
+TS_CODED_METRICS = (
+    ('weather_condition', _WEATHER_CODES, WEATHER_CONDITIONS),
+    ('incidents', _INCIDENT_CODES, INCIDENTS),
+    ('collection_type', _COLLECTION_CODES, COLLECTION_TYPES),
+)
+TS_METRICS = ('n_pedestrians', 'n_pedestrians_towards', 'n_pedestrians_away',
+              'temperature', *(metric for metric, _, _ in TS_CODED_METRICS))
+
+
+def range_replies_to_series(keys: List[str], replies: List) -> List[Dict]:
+    """TS.RANGE-Antworten (eine pro Serie) im Format einer TS.MRANGE-Antwort"""
+    series = []
+    for key, samples in zip(keys, replies):
+        if isinstance(samples, Exception):
+            # Serie existiert (noch) nicht
+            continue
+        series.append({key: [{}, [(int(ts_ms), float(value)) for ts_ms, value in samples]]})
+    return series
+
+
+def timeseries_dates(series: List[Dict]) -> List[str]:
+    """Tage, für die eine TS.MRANGE-Antwort Messwerte enthält (für den Text-Anhang)"""
+    return sorted({
+        datetime.fromtimestamp(ts_ms / 1000).strftime('%Y-%m-%d')
+        for entry in series for _, samples in entry.values() for ts_ms, _ in samples
+    })
+
+
+def timeseries_to_records(street: str, series: List[Dict], city: str = 'Wuerzburg',
+                          text: Optional[Dict[str, Dict[str, Dict]]] = None) -> List[Dict]:
+    """
+    Führt eine TS.MRANGE-Antwort (eine Serie pro Messwert) zu Datensätzen zusammen.
+    ``text`` ordnet Datum -> Text-Anhang des Tages (decode_day_text) zu.
+    """
+    by_ts = {}
+    for entry in series:
+        for key, (_, samples) in entry.items():
+            metric = key.rsplit(':', 1)[-1]
+            for ts_ms, value in samples:
+                by_ts.setdefault(ts_ms, {})[metric] = value
+
+    records = []
+    for ts_ms in sorted(by_ts):
+        values = by_ts[ts_ms]
+        if 'n_pedestrians' not in values:
+            continue
+        dt = datetime.fromtimestamp(ts_ms / 1000)
+        date = dt.strftime('%Y-%m-%d')
+        record = {
+            'id': f"{street}_{date}_{dt.hour:02d}",
+            'street': street,
+            'city': city,
+            'date': date,
+            'hour': str(dt.hour),
+            'weekday': dt.strftime('%A'),
+            'n_pedestrians': str(int(values['n_pedestrians'])),
+            'n_pedestrians_towards': str(int(values.get('n_pedestrians_towards', 0))),
+            'n_pedestrians_away': str(int(values.get('n_pedestrians_away', 0))),
+            'timestamp': dt.strftime('%Y-%m-%dT%H:00:00'),
+        }
+        if 'temperature' in values:
+            record['temperature'] = f"{values['temperature']:g}"
+        for metric, _, names in TS_CODED_METRICS:
+            code = int(values.get(metric, 0))
+            if 0 < code < len(names):
+                record[metric] = names[code]
+        hour_text = (text or {}).get(date, {}).get(str(dt.hour))
+        if hour_text:
+            record.update(hour_text)
+        records.append(record)
+
+    return records
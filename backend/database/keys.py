@@ -0,0 +1,193 @@
+# backend/database/keys.py
+"""
+Key-Schema der Passantendaten.
+
+``legacy``: Straße als Klartext, z.B. ``pedestrian:hourly:Kaiserstraße:2024-05-01:13``
+``tagged``: Straße als Hash-Tag, z.B. ``pedestrian:hourly:{Kaiserstraße}:2024-05-01:13``
+
+Redis Cluster bestimmt den Slot nur aus dem Teil in geschweiften Klammern. Im
+``tagged``-Schema liegen damit alle Keys einer Straße (Stunden, Index, Tages-Blöcke,
+Zeitreihen, Rollups, Archiv, Versionen, Vorhersagen) im selben Slot; Pipelines und
+Multi-Key-Befehle über Daten und Index einer Straße bleiben gültig. Stadtweite Keys
+(Kalender-Bitmaps, Straßenlisten) tragen den Stadt-Tag als letztes Segment.
+
+Umstellung bestehender Daten: scripts/migrate_key_scheme.py
+"""
+from typing import Optional, Tuple
+
+import config
+
+SCHEMES = ('legacy', 'tagged')
+
+
+def _tagged() -> bool:
+    return config.KEY_SCHEME == 'tagged'
+
+
+def street_tag(street: str) -> str:
+    return f"{{{street}}}" if _tagged() else street
+
+
+def city_key(key: str, city: Optional[str] = None) -> str:
+    """Stadtweiter Key; im tagged-Schema mit Stadt-Tag als letztem Segment"""
+    return f"{key}:{{{city or config.CITY}}}" if _tagged() else key
+
+
+# ============================================
+# PRO STRASSE
+# ============================================
+
+def hourly_key(street: str, date: str, hour) -> str:
+    return f"pedestrian:hourly:{street_tag(street)}:{date}:{hour}"
+
+
+def hourly_pattern(street: str) -> str:
+    return f"pedestrian:hourly:{street_tag(street)}:*"
+
+
+def record_key(street: str, date: str, hour) -> str:
+    """Stunde im Record-Codec (RECORD_CODEC=struct, siehe database/encoding.py)"""
+    return f"pedestrian:record:{street_tag(street)}:{date}:{hour}"
+
+
+def record_pattern(street: str) -> str:
+    return f"pedestrian:record:{street_tag(street)}:*"
+
+
+def is_record_key(key: str) -> bool:
+    """Index-Member im Record-Codec (GET statt HGETALL)"""
+    return key.startswith('pedestrian:record:')
+
+
+def hourly_index_key(street: str) -> str:
+    return f"pedestrian:index:{street_tag(street)}"
+
+
+def day_key(street: str, date: str) -> str:
+    return f"pedestrian:day:{street_tag(street)}:{date}"
+
+
+def day_text_key(street: str, date: str) -> str:
+    """Text-Anhang eines Tages: Stunde -> nicht ableitbare Textfelder (JSON)"""
+    return f"pedestrian:daytext:{street_tag(street)}:{date}"
+
+
+def day_index_key(street: str) -> str:
+    return f"pedestrian:dayindex:{street_tag(street)}"
+
+
+def ts_key(street: str, metric: str) -> str:
+    return f"ts:pedestrian:{street_tag(street)}:{metric}"
+
+
+def latest_key(street: str) -> str:
+    """Zeiger auf die neueste gespeicherte Stunde (Sorted Set mit einem Member)"""
+    return f"pedestrian:latest:{street_tag(street)}"
+
+
+def heatmap_key(street: str, start_date: str, end_date: str, metric: str) -> str:
+    """Gespeicherte Heatmap-Matrix eines abgeschlossenen Zeitraums"""
+    return f"pedestrian:heatmap:{street_tag(street)}:{start_date}:{end_date}:{metric}"
+
+
+def version_key(street: str) -> str:
+    """Versionszähler der Straße (history/all/predictions, siehe database/day_cache.py)"""
+    return f"pedestrian:version:{street_tag(street)}"
+
+
+def prediction_key(street: str, date: str, hour) -> str:
+    return f"pedestrian:hourly:prediction:{street_tag(street)}:{date}:{hour}"
+
+
+def prediction_record_key(street: str, date: str, hour) -> str:
+    return f"pedestrian:record:prediction:{street_tag(street)}:{date}:{hour}"
+
+
+def prediction_index_key(street: str) -> str:
+    return f"pedestrian:prediction:index:{street_tag(street)}"
+
+
+def prediction_status_key(street: str) -> str:
+    return f"pedestrian:prediction:status:{street_tag(street)}"
+
+
+# ============================================
+# STADTWEIT
+# ============================================
+
+def prediction_streets_key() -> str:
+    return city_key('pedestrian:prediction:streets')
+
+
+# ============================================
+# UMSCHREIBEN (MIGRATION)
+# ============================================
+
+# Präfix -> Position des Straßen-Segments; spezifischere Präfixe zuerst
+STREET_KEY_FAMILIES = (
+    ('pedestrian:hourly:prediction:', 3),
+    ('pedestrian:record:prediction:', 3),
+    ('pedestrian:prediction:index:', 3),
+    ('pedestrian:prediction:status:', 3),
+    ('pedestrian:archive:index:', 3),
+    ('pedestrian:rollup:index:', 4),
+    ('pedestrian:rollup:', 3),
+    ('pedestrian:hourly:', 2),
+    ('pedestrian:record:', 2),
+    ('pedestrian:index:', 2),
+    ('pedestrian:dayindex:', 2),
+    ('pedestrian:daytext:', 2),
+    ('pedestrian:day:', 2),
+    ('pedestrian:version:', 2),
+    ('pedestrian:heatmap:', 2),
+    ('pedestrian:latest:', 2),
+    ('pedestrian:archive:', 2),
+    ('ts:pedestrian:', 2),
+)
+
+CITY_KEY_PREFIXES = ('pedestrian:prediction:streets', 'calendar:bitmap:')
+
+# Sorted Sets, deren Member selbst Keys sind (beim Umschreiben mitändern)
+KEY_MEMBER_FAMILIES = ('pedestrian:index:', 'pedestrian:prediction:index:')
+
+
+def split_street_key(key: str) -> Optional[Tuple[list, int]]:
+    """Key-Segmente und Position der Straße (None für Keys ohne Straße)"""
+    for prefix, position in STREET_KEY_FAMILIES:
+        if key.startswith(prefix):
+            parts = key.split(':')
+            return (parts, position) if len(parts) > position else None
+    return None
+
+
+def key_street(key: str) -> Optional[str]:
+    """Straße eines Keys in beiden Schemata"""
+    split = split_street_key(key)
+    return split[0][split[1]].strip('{}') if split else None
+
+
+def hourly_key_date(key: str) -> Optional[str]:
+    """Datum eines Stunden-Keys (...:{street}:{date}:{hour}) in beiden Schemata, sonst None"""
+    split = split_street_key(key)
+    if not split:
+        return None
+    parts, position = split
+    return parts[position + 1] if len(parts) == position + 3 else None
+
+
+def tag_key(key: str, city: Optional[str] = None) -> Optional[str]:
+    """
+    Legacy-Key -> tagged-Key (None, wenn der Key nicht zum Schema gehört
+    oder bereits getaggt ist).
+    """
+    split = split_street_key(key)
+    if split:
+        parts, position = split
+        if parts[position].startswith('{'):
+            return None
+        parts[position] = f"{{{parts[position]}}}"
+        return ':'.join(parts)
+
+    if key.startswith(CITY_KEY_PREFIXES) and not key.endswith('}'):
+        return f"{key}:{{{city or config.CITY}}}"
+    return None
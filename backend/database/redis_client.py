@@ -1,19 +1,830 @@
 # backend/database/redis_client.py
 import redis
 import json
-from typing import List, Dict, Optional
+import numpy as np
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import config 
+from database.encoding import (
+    DAY_SLOT_DTYPE, DAY_SLOT_SIZE, decode_day_block, day_block_to_records, encode_hour_text, decode_day_text,
+    encode_hour_slot, range_replies_to_series, timeseries_to_records, timeseries_dates, TS_METRICS, TS_CODED_METRICS,
+    encode_record, decode_record
+)
+from database.rollups import (
+    GRANULARITIES, aggregate_records, merge_rollups, period_start, period_dates,
+    rollup_key, rollup_index_key, hour_field, encode_hour_value, parse_rollup,
+    ROLLUP_UPDATE_LUA, rollup_update_call
+)
+from database.calendar_bitmaps import (
+    DAY_FLAGS, HOUR_FLAGS, bitmap_key, byte_range, flag_ranges, decode_flags, missing_bitmaps
+)
+from database.archive import (
+    archive_key, archive_index_key, month_dates, month_score, bounds_from_archive_index,
+    records_to_month, month_text, encode_month, decode_month, month_to_records
+)
+from database.aggregation import (
+    RANGE_SUMMARY_LUA, SUMMARY_PAGE_SIZE, empty_summary, summarize_records, merge_summary_page, finalize_summary,
+    compute_statistics, compute_heatmap, parse_heatmap_metric
+)
+from database.keys import (
+    hourly_key, hourly_pattern, hourly_index_key, hourly_key_date, day_key, day_index_key, day_text_key, ts_key,
+    prediction_key, prediction_index_key, prediction_status_key, prediction_streets_key,
+    record_key, prediction_record_key, is_record_key, heatmap_key, latest_key, version_key
+)
+from database.connection import connect_redis, check_key_scheme, ReplicaRouter
+from database.write_buffer import BufferedWriter
+from database.reference_data import (
+    REFERENCE_VERSION_KEY, REFERENCE_DATASETS, SCHOOL_HOLIDAY_PERIOD_PATTERN, PUBLIC_HOLIDAY_PATTERN,
+    LECTURE_PERIOD_PATTERN, EVENT_PERIOD_PATTERN, ReferenceCache, ReferenceSnapshot,
+    parse_reference_versions, is_event_period_key
+)
+from database.day_cache import (
+    DayCache, DATA_VERSION_FIELDS, mutable_cutoff, parse_versions, bounds_from_index, bounds_from_samples,
+    merge_bounds
+)
+
+# ============================================
+# PARSER (geteilt mit AsyncPedestrianRedisClient)
+# ============================================
+
+def record_sort_key(record: Dict):
+    return (record.get('date', ''), int(record.get('hour', 0)))
+
+def _date_range(start_date: str, end_date: str) -> List[str]:
+    """Alle Daten zwischen Start und Ende (inklusive)"""
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
+
+def _previous_day(date: str) -> str:
+    return (datetime.strptime(date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+
+def _next_day(date: str) -> str:
+    return (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+def build_prediction_status(count: int, latest: List, status: Dict) -> Dict:
+    return {
+        'count': count,
+        'latest_timestamp': datetime.fromtimestamp(latest[0][1]).isoformat() if latest else None,
+        'horizon_start': status.get('horizon_start'),
+        'horizon_end': status.get('horizon_end'),
+        'generated_at': status.get('generated_at'),
+        'generation_count': int(status['count']) if status.get('count') else None
+    }
+
+def parse_holiday(data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+    return {
+        'date': data['date'],
+        'is_holiday': bool(int(data.get('is_holiday', 0))),
+        'is_nationwide': bool(int(data.get('is_nationwide', 0)))
+    }
+
+def parse_detailed_holiday(data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+    return {
+        'date': data['date'],
+        'name': data['name'],
+        'regional_scope': data['regional_scope'],
+        'temporal_scope': data['temporal_scope'],
+        'is_nationwide': bool(int(data.get('is_nationwide', 0))),
+        'subdivisions': data.get('subdivisions', '')
+    }
+
+def parse_school_holiday(data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+    return {
+        'date': data['date'],
+        'is_school_holiday': bool(int(data.get('is_school_holiday', 0)))
+    }
+
+def parse_school_holiday_period(data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+    return {
+        'date': data['date'],
+        'holiday_name': data['holiday_name'],
+        'start_date': data['start_date'],
+        'end_date': data['end_date'],
+        'type': data['type']
+    }
+
+def parse_event_hour(data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+    return {
+        'date': data['date'],
+        'hour': int(data['hour']),
+        'has_event': bool(int(data['has_event'])),
+        'has_concert': bool(int(data['has_concert']))
+    }
+
+def merge_event_hours(date: str, hours: List[Dict]) -> Dict:
+    """Fasst die 24 Stunden-Hashes eines Tages zusammen"""
+    return {
+        'date': date,
+        'has_event': any(data.get('has_event') == '1' for data in hours if data),
+        'has_concert': any(data.get('has_concert') == '1' for data in hours if data)
+    }
+
+def parse_detailed_event_hour(data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+    return {
+        'date': data['date'],
+        'hour': int(data['hour']),
+        'event_name': data['event_name'],
+        'is_concert': bool(int(data['is_concert'])),
+        'event_start': data['event_start'],
+        'event_end': data['event_end']
+    }
+
+def merge_detailed_event_hours(date: str, hours: List[Dict]) -> Dict:
+    """Sammelt die eindeutigen Events aus den 24 Stunden-Hashes eines Tages"""
+    events = []
+    seen_events = set()
+
+    for data in hours:
+        if data and data['event_name'] not in seen_events:
+            events.append({
+                'event_name': data['event_name'],
+                'is_concert': bool(int(data['is_concert'])),
+                'start': data['event_start'],
+                'end': data['event_end']
+            })
+            seen_events.add(data['event_name'])
+
+    return {
+        'date': date,
+        'events': events,
+        'has_event': len(events) > 0
+    }
+
+# Tages-Aggregate der Events (beim Import geschrieben). Existiert der Marker,
+# hat ein Tag ohne Aggregat auch keine Events; sonst Fallback auf die Stunden.
+EVENT_DAY_MARKER = 'events:day_aggregates'
+DETAILED_EVENT_DAY_MARKER = 'events:detailed:day_aggregates'
+
+def parse_event_day(date: str, data: Dict) -> Dict:
+    return {
+        'date': date,
+        'has_event': data.get('has_event') == '1',
+        'has_concert': data.get('has_concert') == '1'
+    }
+
+def parse_detailed_event_day(date: str, data: Dict) -> Dict:
+    events = json.loads(data['events']) if data.get('events') else []
+    return {
+        'date': date,
+        'events': events,
+        'has_event': len(events) > 0
+    }
+
+def resolve_event_days(dates: List[str], marker: bool, days: List[Dict], parse_day):
+    """
+    Ergebnis der Tages-Aggregate auswerten.
+    Liefert (date -> Info, Tage ohne Aggregat, für die die Stunden gelesen werden müssen).
+    """
+    result = {}
+    missing = []
+    for date, data in zip(dates, days):
+        if data or marker:
+            result[date] = parse_day(date, data or {})
+        else:
+            missing.append(date)
+    return result, missing
+
+# Quelle -> (Marker, Tages-Key, Stunden-Key, Tag auswerten, Stunden zusammenführen)
+EVENT_SOURCES = {
+    'events': (EVENT_DAY_MARKER, 'event:day:{date}', 'event:{date}:{hour}',
+               parse_event_day, merge_event_hours),
+    'detailed': (DETAILED_EVENT_DAY_MARKER, 'event:detail:day:{date}', 'event:detail:hour:{date}:{hour}',
+                 parse_detailed_event_day, merge_detailed_event_hours),
+}
+
+def queue_event_days(pipe, source: str, dates: List[str]):
+    """Phase 1 von get_(detailed_)event_info_many: Marker und Tages-Aggregate"""
+    marker, day_key_format, _, _, _ = EVENT_SOURCES[source]
+    pipe.exists(marker)
+    for date in dates:
+        pipe.hgetall(day_key_format.format(date=date))
+
+def parse_event_days(source: str, dates: List[str], replies: List):
+    """Antworten von queue_event_days -> (date -> Info, Tage ohne Aggregat)"""
+    marker, *days = replies
+    return resolve_event_days(dates, marker, days, EVENT_SOURCES[source][3])
+
+def queue_event_hours(pipe, source: str, dates: List[str]):
+    """Phase 2 (Import ohne Tages-Aggregate): alle Stunden der fehlenden Tage"""
+    hour_key_format = EVENT_SOURCES[source][2]
+    for date in dates:
+        for h in range(24):
+            pipe.hgetall(hour_key_format.format(date=date, hour=h))
+
+def merge_event_day_hours(source: str, dates: List[str], replies: List) -> Dict[str, Dict]:
+    merge = EVENT_SOURCES[source][4]
+    return {date: merge(date, replies[i * 24:(i + 1) * 24]) for i, date in enumerate(dates)}
+
+def parse_lecture(date: str, data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+
+    # Return university-specific flags
+    university = data.get("university", "")
+    is_lecture = int(data.get("is_lecture_period", 0))
+
+    return {
+        "date": data.get("date", date),
+        "is_lecture_period": is_lecture,
+        "jmu_lecture": 1 if (is_lecture and university == "JMU") else 0,
+        "thws_lecture": 1 if (is_lecture and university == "THWS") else 0
+    }
+
+def queue_calendar_days(pipe, dates: List[str]):
+    """Feiertag, Schulferien-Periode und Vorlesungszeit je Tag (drei HGETALL pro Tag)"""
+    for date in dates:
+        pipe.hgetall(f"holiday:detail:{date}")
+        pipe.hgetall(f"school_holiday:day:{date}")
+        pipe.hgetall(f"lecture:daily:{date}")
+
+def build_calendar_range(dates: List[str], replies: List, events: Dict[str, Dict],
+                         detailed_events: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Antwort von queue_calendar_days plus Event-Infos -> date -> Kalender-Teile"""
+    return {
+        date: {
+            'public_holiday': parse_detailed_holiday(replies[3 * i]),
+            'school_holiday_period': parse_school_holiday_period(replies[3 * i + 1]),
+            'lecture': parse_lecture(date, replies[3 * i + 2]),
+            'event': events[date],
+            'events': detailed_events[date]['events'],
+        }
+        for i, date in enumerate(dates)
+    }
+
+def parse_location(data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+    return {
+        'location_id': data['location_id'],
+        'street_name': data['street_name'],
+        'city': data['city'],
+        'latitude': float(data['latitude']),
+        'longitude': float(data['longitude']),
+        'geo_shape': json.loads(data['geo_shape']) if data.get('geo_shape') else {}
+    }
+
+# ============================================
+# STAMMDATEN-SNAPSHOT (geteilt mit AsyncPedestrianRedisClient)
+# ============================================
+
+# Listen im Snapshot -> SCAN-Pattern der Quell-Hashes
+REFERENCE_SOURCES = (
+    ('public_holidays', PUBLIC_HOLIDAY_PATTERN),
+    ('school_holiday_periods', SCHOOL_HOLIDAY_PERIOD_PATTERN),
+    ('lecture_periods', LECTURE_PERIOD_PATTERN),
+    ('event_periods', EVENT_PERIOD_PATTERN),
+)
+
+def parse_public_holiday(data: Dict) -> Optional[Dict]:
+    if not data:
+        return None
+    return {
+        "date": data.get("date"),
+        "is_holiday": int(data.get("is_holiday", 0)),
+        "is_nationwide": int(data.get("is_nationwide", 0))
+    }
+
+def reference_source_keys(name: str, keys: List[str]) -> List[str]:
+    if name == 'event_periods':
+        return [key for key in keys if is_event_period_key(key)]
+    return keys
+
+def queue_reference_load(pipe, streets: List[str], source_keys: Dict[str, List[str]]):
+    """Alle Stammdaten-Hashes in eine Pipeline legen (auswerten mit build_reference_snapshot)"""
+    for street in streets:
+        pipe.hgetall(f"location:name:{street}")
+    for name, _ in REFERENCE_SOURCES:
+        for key in source_keys[name]:
+            pipe.hgetall(key)
+
+def build_reference_snapshot(versions, streets: List[str], source_keys: Dict[str, List[str]],
+                             replies: List) -> ReferenceSnapshot:
+    replies = iter(replies)
+    locations = [loc for loc in (parse_location(next(replies)) for _ in streets) if loc]
+    lists = {name: [next(replies) for _ in source_keys[name]] for name, _ in REFERENCE_SOURCES}
+    return ReferenceSnapshot(
+        versions,
+        locations=locations,
+        public_holidays=[h for h in map(parse_public_holiday, lists['public_holidays']) if h],
+        school_holiday_periods=[p for p in lists['school_holiday_periods'] if p],
+        lecture_periods=[p for p in lists['lecture_periods'] if p],
+        event_periods=[p for p in lists['event_periods'] if p],
+    )
+
+# ============================================
+# RANGE-QUERIES (geteilt mit AsyncPedestrianRedisClient)
+# ============================================
+
+def range_scores(start_date: str, end_date: str) -> Tuple[float, float]:
+    """Index-Scores (Unix-Zeit) von Beginn start_date bis Ende end_date"""
+    return (
+        datetime.fromisoformat(f"{start_date}T00:00:00").timestamp(),
+        datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+    )
+
+def queue_range_context(pipe, street: str, timeseries: bool):
+    """Versionen und vorhandener Tagesbereich einer Straße (auswerten mit parse_range_context)"""
+    pipe.hmget(version_key(street), 'history', 'all')
+    for index_key in (hourly_index_key(street), day_index_key(street), archive_index_key(street)):
+        pipe.zrange(index_key, 0, 0, withscores=True)
+        pipe.zrange(index_key, -1, -1, withscores=True)
+    if timeseries:
+        # Rohbefehle: funktionieren in jeder Pipeline (auch Cluster, async)
+        key = ts_key(street, 'n_pedestrians')
+        pipe.execute_command('TS.RANGE', key, '-', '+', 'COUNT', 1)
+        pipe.execute_command('TS.REVRANGE', key, '-', '+', 'COUNT', 1)
+    return 9 if timeseries else 7
+
+def parse_range_context(replies: List):
+    """Antworten von queue_range_context (Pipeline mit raise_on_error=False)"""
+    versions, *ranges = replies
+    bounds = merge_bounds(
+        bounds_from_index(*ranges[0:2]),
+        bounds_from_index(*ranges[2:4]),
+        bounds_from_archive_index(*ranges[4:6])
+    )
+    samples = ranges[6:8]
+    if samples and not any(isinstance(r, Exception) for r in samples):
+        bounds = merge_bounds(bounds, bounds_from_samples(*samples))
+    return bounds, parse_versions(versions)
+
+def merge_archived(archived: List[Dict], live: List[Dict]) -> List[Dict]:
+    """Archiv + Live-Daten; Live-Daten gewinnen (z.B. nachträglich korrigierte Stunden vor dem nächsten Archivlauf)"""
+    if not archived:
+        return live
+    live_hours = {(r.get('date'), str(r.get('hour'))) for r in live}
+    records = [r for r in archived if (r['date'], r['hour']) not in live_hours] + live
+    return sorted(records, key=record_sort_key)
+
+def _decode_hash(raw: Dict) -> Dict:
+    return {k.decode(): v.decode() for k, v in raw.items()} if raw else {}
+
+def queue_stored_record(pipe, key: str):
+    """Stunde/Vorhersage lesen: Hash oder Record-Codec, erkennbar am Key (Binär-Pipeline)"""
+    if is_record_key(key):
+        pipe.get(key)
+    else:
+        pipe.hgetall(key)
+
+def decode_stored_record(key: str, raw) -> Dict:
+    """Antwort von queue_stored_record; leeres Dict für abgelaufene/gelöschte Keys"""
+    if is_record_key(key):
+        return decode_record(raw) if raw else {}
+    return _decode_hash(raw)
+
+def queue_record_write(pipe, key: str, counterpart: str, index_key: str, data: Dict):
+    """
+    Schreibt eine Stunde/Vorhersage im Format von ``key`` und entfernt dieselbe
+    Stunde im anderen Format (``counterpart``), damit der Index nach einem
+    Wechsel von RECORD_CODEC keine Stunde doppelt enthält.
+    """
+    if is_record_key(key):
+        pipe.set(key, encode_record(data))
+    else:
+        pipe.hset(key, mapping=data)
+    pipe.delete(counterpart)
+    pipe.zrem(index_key, counterpart)
+
+def hourly_keys(street: str, date: str, hour):
+    """(Ziel-Key, Key im anderen Format) einer Stunde gemäß RECORD_CODEC"""
+    keys = (hourly_key(street, date, hour), record_key(street, date, hour))
+    return keys[::-1] if config.RECORD_CODEC == 'struct' else keys
+
+def prediction_keys(street: str, date: str, hour):
+    keys = (prediction_key(street, date, hour), prediction_record_key(street, date, hour))
+    return keys[::-1] if config.RECORD_CODEC == 'struct' else keys
+
+def scan_key_in_range(key: str, start_date: str, end_date: str) -> bool:
+    """SCAN-Fallback: liegt der Stunden-Key im Zeitraum?"""
+    date = hourly_key_date(key)
+    return date is not None and start_date <= date <= end_date
+
+def queue_scan_fetch(pipe, keys: List[str]):
+    for key in keys:
+        pipe.hgetall(key)
+
+def scan_results_to_records(replies: List) -> List[Dict]:
+    return sorted([data for data in replies if data], key=record_sort_key)
+
+def queue_index_page(pipe, page: List):
+    """Eine Seite aus ZRANGEBYSCORE ... WITHSCORES lesen (Binär-Pipeline)"""
+    for key, _ in page:
+        queue_stored_record(pipe, key)
+
+def index_page_records(page: List, replies: List) -> List[Dict]:
+    return [data for (key, _), raw in zip(page, replies) if (data := decode_stored_record(key, raw))]
+
+def next_page_score(page: List, chunk_size: int) -> Optional[str]:
+    """min_score der nächsten Index-Seite, None nach der letzten"""
+    if len(page) < chunk_size:
+        return None
+    # Eine Stunde pro Score: ab dem nächsten Score weiterblättern
+    return f"({page[-1][1]}"
+
+def merge_legacy_hours(records: List[Dict], legacy: List[Dict]) -> List[Dict]:
+    """Tages-Blöcke um Stunden ergänzen, die (während der Migration) nur im Hash-Layout liegen"""
+    packed_hours = {(r['date'], r['hour']) for r in records}
+    records = records + [
+        r for r in legacy
+        if (r.get('date'), str(r.get('hour'))) not in packed_hours
+    ]
+    return sorted(records, key=record_sort_key)
+
+def queue_range_lookups(pipe, street: str, start_date: str, end_date: str, timeseries: bool) -> int:
+    """Phase 1 von get_historical_range_many: Kontext und alle Index-Lookups einer Straße"""
+    start_ts = datetime.fromisoformat(f"{start_date}T00:00:00").timestamp()
+    end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+    size = queue_range_context(pipe, street, timeseries)
+    pipe.zrangebyscore(hourly_index_key(street), start_ts, end_ts, withscores=True)
+    pipe.zrangebyscore(day_index_key(street), start_ts, end_ts)
+    pipe.zrangebyscore(archive_index_key(street), month_score(start_date[:7]), end_ts)
+    return size + 3
+
+def plan_range_fetch(replies: List, start_date: str, end_date: str, storage_backend: str,
+                     day_cache: Optional[DayCache], street: str) -> Optional[Dict]:
+    """
+    Wertet Phase 1 aus: Begrenzung auf vorhandene Tage, Day-Cache, und welche
+    Hashes/Blöcke/Monate/Zeitreihen in Phase 2 noch zu lesen sind.
+    None: kein Index (SCAN-Fallback über get_historical_range).
+    """
+    bounds, versions = parse_range_context(replies[:-3])
+    hours, days, months = replies[-3:]
+    if bounds is None:
+        return None
+
+    start_date = max(start_date, bounds[0])
+    end_date = min(end_date, bounds[1])
+    dates = _date_range(start_date, end_date) if start_date <= end_date else []
+    if day_cache is not None:
+        cached, missing = day_cache.lookup(street, dates, versions)
+    else:
+        cached, missing = {}, dates
+
+    plan = {
+        'dates': dates, 'cached': cached, 'missing': missing, 'versions': versions,
+        'hours': [], 'days': [], 'months': [], 'ts_range': None
+    }
+    if not missing:
+        return plan
+
+    wanted = set(missing)
+    if storage_backend == 'timeseries':
+        plan['ts_range'] = ts_range_ms(missing[0], missing[-1])
+    else:
+        # packed: noch nicht migrierte Hashes ergänzen die Tages-Blöcke
+        plan['hours'] = [
+            key for key, score in hours
+            if datetime.fromtimestamp(score).strftime('%Y-%m-%d') in wanted
+        ]
+        if storage_backend == 'packed':
+            plan['days'] = [date for date in days if date in wanted]
+    plan['months'] = [month for month in months if wanted.intersection(month_dates(month))]
+    return plan
+
+def queue_summary_context(pipe, street: str, start_date: str, end_date: str):
+    """Lua-Summary möglich? (auswerten mit lua_summary_possible)"""
+    pipe.exists(hourly_index_key(street))
+    pipe.zcount(archive_index_key(street), month_score(start_date[:7]), range_scores(start_date, end_date)[1])
+
+def lua_summary_possible(replies: List) -> bool:
+    """Stunden-Index vorhanden und kein archivierter Monat im Zeitraum"""
+    indexed, archived = replies
+    return bool(indexed) and not archived
+
+def summary_script_call(street: str, min_score, end_ts: float) -> Dict:
+    """Argumente für einen Aufruf von RANGE_SUMMARY_LUA (eine Index-Seite)"""
+    return {'keys': [hourly_index_key(street)], 'args': [min_score, end_ts, SUMMARY_PAGE_SIZE]}
+
+def next_summary_score(summary: Dict, reply: List) -> Optional[str]:
+    """Seite in ``summary`` übernehmen; min_score der nächsten Seite oder None"""
+    last = merge_summary_page(summary, reply)
+    return f"({last}" if last is not None else None
+
+def ts_range_ms(start_date: str, end_date: str) -> Tuple[int, int]:
+    start_ts, end_ts = range_scores(start_date, end_date)
+    return int(start_ts * 1000), int(end_ts * 1000)
+
+def ts_mrange_filters(street: str, metrics) -> List[str]:
+    """TS.MRANGE-Filter für ausgewählte Serien einer Straße"""
+    metric_filter = metrics[0] if len(metrics) == 1 else f"({','.join(metrics)})"
+    return ['type=pedestrian', f'street={street}', f'metric={metric_filter}']
+
+def queue_ts_ranges(pipe, street: str, start_ms: int, end_ms: int, metrics, aggregation: Dict):
+    """
+    Ersatz für TS.MRANGE im Cluster (dort nicht nach Labels geroutet): ein
+    TS.RANGE pro Serie, alle Serien einer Straße liegen im selben Slot.
+    """
+    args = []
+    if aggregation:
+        args = ['AGGREGATION', aggregation['aggregation_type'], aggregation['bucket_size_msec']]
+        if 'align' in aggregation:
+            args = ['ALIGN', aggregation['align']] + args
+    for metric in metrics:
+        pipe.execute_command('TS.RANGE', ts_key(street, metric), start_ms, end_ms, *args)
+
+def ts_range_series(street: str, metrics, replies: Iterator) -> List[Dict]:
+    """Antworten von queue_ts_ranges (Iterator) im Format einer TS.MRANGE-Antwort"""
+    keys = [ts_key(street, metric) for metric in metrics]
+    return range_replies_to_series(keys, [next(replies) for _ in keys])
+
+def queue_hour_text(pipe, street: str, data: Dict):
+    """Text-Anhang einer Stunde setzen oder (alles ableitbar) entfernen"""
+    text = encode_hour_text(street, data)
+    if text is None:
+        pipe.hdel(day_text_key(street, data['date']), str(int(data['hour'])))
+    else:
+        pipe.hset(day_text_key(street, data['date']), str(int(data['hour'])), text)
+
+def queue_day_blocks(pipe, street: str, dates: List[str]):
+    """Tages-Blöcke samt Text-Anhang lesen (Binär-Pipeline, zwei Befehle pro Tag)"""
+    for date in dates:
+        pipe.get(day_key(street, date))
+        pipe.hgetall(day_text_key(street, date))
+
+def day_blocks_to_records(street: str, dates: List[str], replies: Iterator) -> List[Dict]:
+    """Antworten von queue_day_blocks (Iterator) -> Datensätze"""
+    records = []
+    for date in dates:
+        raw, text = next(replies), next(replies)
+        if raw:
+            records.extend(day_block_to_records(street, date, decode_day_block(raw), text=decode_day_text(text)))
+    return records
+
+def queue_day_text(pipe, street: str, dates: List[str]):
+    """Text-Anhänge mehrerer Tage lesen (ein HGETALL pro Tag)"""
+    for date in dates:
+        pipe.hgetall(day_text_key(street, date))
+
+def day_text_replies(dates: List[str], replies: Iterator) -> Dict[str, Dict[str, Dict]]:
+    """Antworten von queue_day_text (Iterator) -> Datum -> Stunde -> Textfelder"""
+    return {date: decode_day_text(next(replies)) for date in dates}
+
+def queue_range_fetch(pipe, street: str, plan: Dict):
+    """Phase 2 von get_historical_range_many (Pipeline ohne Dekodierung)"""
+    for key in plan['hours']:
+        queue_stored_record(pipe, key)
+    queue_day_blocks(pipe, street, plan['days'])
+    for month in plan['months']:
+        pipe.get(archive_key(street, month))
+    if plan['ts_range']:
+        queue_ts_ranges(pipe, street, *plan['ts_range'], TS_METRICS, {})
+        queue_day_text(pipe, street, plan['missing'])
+
+def assemble_range(street: str, plan: Dict, replies: Iterator, day_cache: Optional[DayCache]) -> List[Dict]:
+    """Phase 2 auswerten und mit den Tagen aus dem Day-Cache zusammenführen"""
+    missing = plan['missing']
+    fetched = []
+    if missing:
+        live = [record for record in (decode_stored_record(key, next(replies)) for key in plan['hours']) if record]
+
+        packed = day_blocks_to_records(street, plan['days'], replies)
+        if packed:
+            packed_hours = {(r['date'], r['hour']) for r in packed}
+            live = sorted(packed + [
+                r for r in live if (r.get('date'), str(r.get('hour'))) not in packed_hours
+            ], key=record_sort_key)
+
+        archived = []
+        for month in plan['months']:
+            raw = next(replies)
+            if raw:
+                archived.extend(month_to_records(street, month, raw, missing[0], missing[-1]))
+
+        if plan['ts_range']:
+            series = ts_range_series(street, TS_METRICS, replies)
+            live = timeseries_to_records(street, series, text=day_text_replies(missing, replies))
+
+        wanted = set(missing)
+        fetched = [r for r in merge_archived(archived, live) if r.get('date') in wanted]
+
+    if day_cache is None:
+        return fetched
+
+    days = plan['cached']
+    days.update(day_cache.fill(street, missing, fetched, plan['versions']))
+    return [record for date in plan['dates'] for record in days.get(date, ())]
+
+def prediction_candidate_keys(street: str, start_date: str, end_date: str) -> List[str]:
+    """Vorhersagen aus der Zeit vor dem Index: alle Kandidaten-Keys"""
+    return [
+        prediction_key(street, date, hour)
+        for date in _date_range(start_date, end_date)
+        for hour in range(24)
+    ]
+
+def queue_latest_pointer(pipe, street: str, data_list: List[Dict]):
+    """
+    Neueste Stunde aus ``data_list`` in den Zeiger ``pedestrian:latest:{street}``:
+    gleiche Stunde ersetzen, dann nur den Member mit dem höchsten Score behalten.
+    Ältere Stunden (Nachladen, Backfill) fallen beim Trimmen wieder heraus.
+    """
+    latest = None
+    for data in data_list:
+        try:
+            score = datetime.fromisoformat(f"{data['date']}T{str(data['hour']).zfill(2)}:00:00").timestamp()
+        except (KeyError, TypeError, ValueError):
+            continue
+        if latest is None or score >= latest[0]:
+            latest = (score, data)
+    if latest is None:
+        return
+
+    score, data = latest
+    key = latest_key(street)
+    pipe.zremrangebyscore(key, score, score)
+    pipe.zadd(key, {json.dumps(data, ensure_ascii=False, default=str, sort_keys=True): score})
+    pipe.zremrangebyrank(key, 0, -2)
+
+def parse_latest_pointer(reply: List) -> Optional[Dict]:
+    """Antwort von ZRANGE latest -1 -1"""
+    return json.loads(reply[0]) if reply else None
+
+def heatmap_cacheable(end_date: str) -> bool:
+    """Nur abgeschlossene Zeiträume speichern (keine Tage, die der Scheduler noch nachlädt)"""
+    return bool(config.HEATMAP_CACHE_TTL) and end_date < mutable_cutoff(config.DAY_CACHE_MUTABLE_DAYS)
+
+def queue_heatmap_lookup(pipe, street: str, start_date: str, end_date: str, metric: str):
+    # Version und Matrix liegen im tagged-Schema im selben Slot
+    pipe.hget(version_key(street), 'history')
+    pipe.get(heatmap_key(street, start_date, end_date, metric))
+
+def parse_heatmap_lookup(replies: List) -> Tuple[int, Optional[Dict]]:
+    """(history-Version, gespeicherte Matrix oder None, wenn veraltet/fehlend)"""
+    history, raw = replies
+    version = int(history) if history else 0
+    if raw:
+        entry = json.loads(raw)
+        if entry.get('history') == version:
+            return version, entry['heatmap']
+    return version, None
+
+def queue_heatmap_store(pipe, street: str, start_date: str, end_date: str, metric: str,
+                        version: int, heatmap: Dict):
+    pipe.set(
+        heatmap_key(street, start_date, end_date, metric),
+        json.dumps({'history': version, 'heatmap': heatmap}),
+        ex=config.HEATMAP_CACHE_TTL
+    )
+
+def heatmap_response(street: str, start_date: str, end_date: str, heatmap: Dict, cached: bool) -> Dict:
+    return {'street': street, 'start_date': start_date, 'end_date': end_date, **heatmap, 'cached': cached}
+
+def rollup_index_scores(granularity: str, start_date: str, end_date: str) -> Tuple[float, float]:
+    """Score-Fenster im Rollup-Index; Wochen/Monate ab ihrem ersten Tag"""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    start_ts = datetime.fromisoformat(f"{period_start(start_date, granularity)}T00:00:00").timestamp()
+    end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+    return start_ts, end_ts
+
+def queue_rollup_hashes(pipe, street: str, granularity: str, periods: List[Tuple[str, float]]):
+    for period, _ in periods:
+        pipe.hgetall(rollup_key(street, granularity, period))
+
+def parse_rollup_hashes(granularity: str, periods: List[Tuple[str, float]], replies: List) -> List:
+    """
+    Rollups in Index-Reihenfolge; fehlt ein Hash (abgelaufen/gelöscht), steht an
+    seiner Stelle ``(erster, letzter Tag)`` zum Nachrechnen aus den Stundenwerten
+    """
+    rollups = []
+    for (period, score), data in zip(periods, replies):
+        if data:
+            rollups.append(parse_rollup(period, data))
+        else:
+            first = datetime.fromtimestamp(score).strftime('%Y-%m-%d')
+            rollups.append((first, period_dates(first, granularity)[-1]))
+    return rollups
+
+def ts_rollup_queries(start_ms: int) -> List:
+    """TS.MRANGE-Abfragen für Tages-Buckets: Summen, Anzahl, Maximum"""
+    aggregation = {'bucket_size_msec': 1000*60*60*24, 'align': start_ms}
+    return [
+        (('n_pedestrians', 'n_pedestrians_towards', 'n_pedestrians_away', 'temperature'),
+         {**aggregation, 'aggregation_type': 'sum'}),
+        (('n_pedestrians', 'temperature'), {**aggregation, 'aggregation_type': 'count'}),
+        (('n_pedestrians',), {**aggregation, 'aggregation_type': 'max'}),
+    ]
+
+def ts_rollups(granularity: str, sums: List, counts: List, maxima: List) -> List[Dict]:
+    """Tages-Buckets aus ts_rollup_queries zu Tagen/Wochen/Monaten zusammenfassen"""
+    def by_metric(result):
+        values = {}
+        for entry in result:
+            for key, (_, samples) in entry.items():
+                metric = key.rsplit(':', 1)[-1]
+                values[metric] = {
+                    datetime.fromtimestamp(ts_ms / 1000).strftime('%Y-%m-%d'): value
+                    for ts_ms, value in samples
+                }
+        return values
+
+    sums, counts, maxima = by_metric(sums), by_metric(counts), by_metric(maxima)
+    hours = counts.get('n_pedestrians', {})
+
+    daily = []
+    temperature_sums = {}
+    for day in sorted(hours):
+        temp_count = int(counts.get('temperature', {}).get(day, 0))
+        temp_sum = sums.get('temperature', {}).get(day, 0.0)
+        temperature_sums[day] = (temp_sum, temp_count)
+        daily.append({
+            'period': day,
+            'start': day,
+            'total': int(sums.get('n_pedestrians', {}).get(day, 0)),
+            'towards': int(sums.get('n_pedestrians_towards', {}).get(day, 0)),
+            'away': int(sums.get('n_pedestrians_away', {}).get(day, 0)),
+            'hours': int(hours[day]),
+            'peak_value': int(maxima.get('n_pedestrians', {}).get(day, 0)),
+            'peak_hour': None,
+            'avg_temperature': round(temp_sum / temp_count, 2) if temp_count else None,
+        })
+
+    return merge_rollups(daily, granularity, temperature_sums)
 
 class PedestrianRedisClient:
-    def __init__(self, host='localhost', port=6379, db=0):
-        self.client = redis.Redis(
-            host=host or config.REDIS_HOST, 
-            port=port or config.REDIS_PORT, 
-            db=db, 
-            decode_responses=True
-        )
-        print(f"Connected to Redis at {host or config.REDIS_HOST}:{port or config.REDIS_PORT}")
+    def __init__(self, host='localhost', port=6379, db=0, storage_backend: Optional[str] = None,
+                 cluster: Optional[bool] = None, replicas: Optional[List[Tuple[str, int]]] = None):
+        # Cluster-Modus: RedisCluster statt redis.Redis, Keys im tagged-Schema (database/keys.py)
+        self.cluster = config.REDIS_CLUSTER if cluster is None else cluster
+        check_key_scheme(self.cluster)
+        self.client = connect_redis(host, port, db, decode_responses=True, cluster=self.cluster)
+        # Zweite Verbindung ohne Dekodierung für binäre Tages-Blöcke
+        self.binary_client = connect_redis(host, port, db, decode_responses=False, cluster=self.cluster)
+        # Lese-Methoden über self.reader / self.binary_reader (Replica oder Primary)
+        replicas = config.REDIS_REPLICAS if replicas is None else replicas
+        self.router = ReplicaRouter((self.client, self.binary_client), [
+            (connect_redis(r_host, r_port, db, decode_responses=True, cluster=False),
+             connect_redis(r_host, r_port, db, decode_responses=False, cluster=False))
+            for r_host, r_port in replicas
+        ]) if replicas and not self.cluster else None
+        self._read_pair = ContextVar(f'read_pair_{id(self)}', default=None)
+        # EVALSHA, lädt das Skript bei NOSCRIPT nach (auch auf Replicas)
+        self._summary_script = self.client.register_script(RANGE_SUMMARY_LUA)
+        self._lua_summary = True
+        self._rollup_script = self.client.register_script(ROLLUP_UPDATE_LUA)
+        self.reference_cache = ReferenceCache(config.REFERENCE_CHECK_INTERVAL)
+        self.storage_backend = storage_backend or config.STORAGE_BACKEND
+        self._ts_streets = set()
+        self.day_cache = DayCache(
+            config.DAY_CACHE_MAX_BYTES, config.DAY_CACHE_MUTABLE_DAYS
+        ) if config.DAY_CACHE_MAX_BYTES > 0 else None
+        if self.storage_backend not in ('hash', 'packed', 'timeseries'):
+            raise ValueError(f"Unknown storage backend: {self.storage_backend}")
+        mode = 'cluster' if self.cluster else 'single node'
+        if self.router is not None:
+            mode += f", {len(replicas)} read replicas"
+        print(f"Connected to Redis at {host or config.REDIS_HOST}:{port or config.REDIS_PORT} ({mode}, storage: {self.storage_backend})")
+
+    # ============================================
+    # LESE-ROUTING (PRIMARY / REPLICAS)
+    # ============================================
+
+    def _readers(self) -> Tuple:
+        """(Text-Client, Binär-Client) für Lesezugriffe; innerhalb von _read_scope fest"""
+        pair = self._read_pair.get()
+        if pair is None:
+            pair = self.router.route() if self.router is not None else (self.client, self.binary_client)
+        return pair
+
+    @property
+    def reader(self):
+        return self._readers()[0]
+
+    @property
+    def binary_reader(self):
+        return self._readers()[1]
+
+    @contextmanager
+    def _read_scope(self, pair: Optional[Tuple] = None):
+        """Alle Lesezugriffe im Block gegen denselben Knoten (Versionen passen zu den Daten)"""
+        token = self._read_pair.set(pair or self._readers())
+        try:
+            yield
+        finally:
+            self._read_pair.reset(token)
+
+    def pinned_reads(self):
+        """Lesezugriffe im Block gegen einen Knoten (z.B. ETag-Versionen und zugehörige Antwort)"""
+        return self._read_scope()
+
+    def primary_reads(self):
+        """Lesezugriffe im Block gegen den Primary (Read-after-Write: Archivierung, Rollups, Migration)"""
+        return self._read_scope((self.client, self.binary_client))
     
     # ============================================
     # ALL EVENTS (FOR MODEL TRAINING)
@@ -29,9 +840,10 @@ class PedestrianRedisClient:
             "concert": int
         }
         """
+        reader = self.reader
 
         events = []
-        keys = self.client.keys("event:*")
+        keys = reader.keys("event:*")
 
         for key in keys:
             parts = key.split(":")
@@ -54,7 +866,7 @@ class PedestrianRedisClient:
             except:
                 continue
 
-            raw = self.client.hgetall(key) or {}
+            raw = reader.hgetall(key) or {}
 
             event_flag = int(raw.get("has_event", "0"))
             concert_flag = int(raw.get("has_concert", "0"))
@@ -78,7 +890,7 @@ class PedestrianRedisClient:
 
     def get_all_lecture_dates(self) -> List[str]:
         """Return all lecture dates from Redis (matches your real schema)."""
-        keys = self.client.keys("lecture:daily:*")  # Changed from "lecture:*"
+        keys = self.reader.keys("lecture:daily:*")  # Changed from "lecture:*"
         dates = []
 
         for key in keys:
@@ -104,20 +916,8 @@ class PedestrianRedisClient:
     # ============================================
 
     def get_all_public_holidays(self) -> List[Dict]:
-        """Return all public holidays"""
-        keys = self.client.keys("holiday:*") or []
-        holidays = []
-
-        for key in keys:
-            data = self.client.hgetall(key)
-            if data:
-                holidays.append({
-                    "date": data.get("date"),
-                    "is_holiday": int(data.get("is_holiday", 0)),
-                    "is_nationwide": int(data.get("is_nationwide", 0))
-                })
-        
-        return holidays
+        """Return all public holidays (aus dem Stammdaten-Snapshot)"""
+        return list(self.get_reference_data().public_holidays)
 
     # ============================================
     # ALL SCHOOL HOLIDAYS (FOR MODEL TRAINING)
@@ -125,7 +925,7 @@ class PedestrianRedisClient:
 
     def get_all_school_holiday_dates(self) -> List[str]:
         """Return all dates that are school holidays"""
-        return list(self.client.smembers('school_holidays:all') or [])
+        return list(self.reader.smembers('school_holidays:all') or [])
 
     # ============================================
     # PASSANTENDATEN
@@ -133,14 +933,24 @@ class PedestrianRedisClient:
     
     def store_hourly_data(self, street: str, data: Dict):
         """Speichert stündliche Passantendaten MIT Index"""
-        key = f"pedestrian:hourly:{street}:{data['date']}:{data['hour']}"
-        
-        # 1. Daten speichern
-        self.client.hset(key, mapping=data)
-        self.client.expire(key, 60*60*24*730)
-        
-        # 2. Index-Eintrag erstellen
-        self._add_to_index(street, key, data['date'], data['hour'])
+        if self.storage_backend == 'packed':
+            self._store_packed_hours(street, [data])
+        elif self.storage_backend == 'timeseries':
+            self._store_timeseries(street, [data])
+        else:
+            key, counterpart = hourly_keys(street, data['date'], data['hour'])
+
+            # 1. Daten speichern (Hash oder Record-Codec)
+            pipe = self.client.pipeline(transaction=False)
+            queue_record_write(pipe, key, counterpart, hourly_index_key(street), data)
+            self._expire_live(pipe, key)
+            pipe.execute()
+
+            # 2. Index-Eintrag erstellen
+            self._add_to_index(street, key, data['date'], data['hour'])
+
+        self._update_rollups(street, [data])
+        self._bump_version(street, [data['date']], [data])
 
     def _add_to_index(self, street: str, key: str, date: str, hour: str):
         """Fügt Key zum Sorted Set Index hinzu"""
@@ -148,106 +958,248 @@ class PedestrianRedisClient:
             timestamp = f"{date}T{str(hour).zfill(2)}:00:00"
             score = datetime.fromisoformat(timestamp).timestamp()
             
-            index_key = f"pedestrian:index:{street}"
+            index_key = hourly_index_key(street)
             self.client.zadd(index_key, {key: score})
-            self.client.expire(index_key, 60*60*24*730)
+            self._expire_live(self.client, index_key)
         except Exception as e:
             # Falls Indexierung fehlschlägt, loggen aber nicht abbrechen
             print(f"Warning: Could not add to index: {e}")
     
     def get_hourly_data(self, street: str, date: str, hour: int) -> Optional[Dict]:
         """Holt stündliche Daten"""
-        key = f"pedestrian:hourly:{street}:{date}:{hour}"
-        data = self.client.hgetall(key)
-        return data if data else None
+        reader, binary_reader = self._readers()
+        if self.storage_backend == 'packed':
+            pipe = binary_reader.pipeline(transaction=False)
+            pipe.getrange(day_key(street, date), int(hour) * DAY_SLOT_SIZE, (int(hour) + 1) * DAY_SLOT_SIZE - 1)
+            pipe.hget(day_text_key(street, date), str(int(hour)))
+            raw, text = pipe.execute()
+            if len(raw) == DAY_SLOT_SIZE:
+                slot = np.frombuffer(raw, dtype=DAY_SLOT_DTYPE)
+                text = {str(int(hour)): json.loads(text)} if text else None
+                records = day_block_to_records(street, date, slot, first_hour=int(hour), text=text)
+                if records:
+                    return records[0]
+            # Während der Migration: Altbestand im Hash-Layout
+        elif self.storage_backend == 'timeseries':
+            ts_ms = int(datetime.fromisoformat(f"{date}T{int(hour):02d}:00:00").timestamp() * 1000)
+            records = self._get_range_timeseries_ms(street, ts_ms, ts_ms)
+            return records[0] if records else self._get_archived_hour(street, date, hour)
+
+        pipe = binary_reader.pipeline(transaction=False)
+        keys = (hourly_key(street, date, hour), record_key(street, date, hour))
+        for key in keys:
+            queue_stored_record(pipe, key)
+        data = next((r for r in map(decode_stored_record, keys, pipe.execute()) if r), None)
+        return data if data else self._get_archived_hour(street, date, hour)
     
     def get_historical_range(self, street: str, start_date: str, end_date: str) -> List[Dict]:
         """
         Intelligente Range-Query mit automatischem Fallback
-        Nutzt Index wenn verfügbar, sonst SCAN
+        Nutzt Index wenn verfügbar, sonst SCAN. Abgeschlossene Tage kommen aus
+        dem Day-Cache; die Datensätze sind geteilt und dürfen nicht verändert werden.
         """
-        index_key = f"pedestrian:index:{street}"
+        with self._read_scope():
+            if self.day_cache is None:
+                return self._fetch_range(street, start_date, end_date)
+
+            bounds, versions = self._range_context(street)
+            if bounds is None:
+                # Kein Index (SCAN-Fallback) - nicht cachen
+                return self._fetch_range(street, start_date, end_date)
+
+            # Auf vorhandene Tage begrenzen (z.B. 1900-01-01 bis 2100-12-31)
+            start_date = max(start_date, bounds[0])
+            end_date = min(end_date, bounds[1])
+            if start_date > end_date:
+                return []
+
+            dates = _date_range(start_date, end_date)
+            days, missing = self.day_cache.lookup(street, dates, versions)
+            if missing:
+                fetched = self._fetch_range(street, missing[0], missing[-1])
+                days.update(self.day_cache.fill(street, missing, fetched, versions))
+
+            return [record for date in dates for record in days.get(date, ())]
+
+    def get_historical_range_many(self, streets: List[str], start_date: str, end_date: str) -> Dict[str, List[Dict]]:
+        """
+        Range-Query für mehrere Straßen in zwei Round-Trips: erst alle Index-Lookups
+        (inkl. Versionen und Tagesbereich), dann alle Hashes/Blöcke/Monate/Zeitreihen.
+        Tage aus dem Day-Cache werden nicht erneut gelesen. Liefert Straße -> Datensätze.
+        """
+        reader, binary_reader = self._readers()
+        streets = list(dict.fromkeys(streets))
+        timeseries = self.storage_backend == 'timeseries'
+
+        pipe = reader.pipeline(transaction=False)
+        sizes = [queue_range_lookups(pipe, street, start_date, end_date, timeseries) for street in streets]
+        replies = pipe.execute(raise_on_error=False)
+
+        plans, offset = {}, 0
+        for street, size in zip(streets, sizes):
+            plans[street] = plan_range_fetch(
+                replies[offset:offset + size], start_date, end_date,
+                self.storage_backend, self.day_cache, street
+            )
+            offset += size
+
+        pipe = binary_reader.pipeline(transaction=False)
+        for street, plan in plans.items():
+            if plan is not None:
+                queue_range_fetch(pipe, street, plan)
+        replies = iter(pipe.execute(raise_on_error=False) if len(pipe) else [])
+
+        return {
+            street: assemble_range(street, plan, replies, self.day_cache) if plan is not None
+            # Kein Index (SCAN-Fallback)
+            else self.get_historical_range(street, start_date, end_date)
+            for street, plan in plans.items()
+        }
+
+    def _fetch_range(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        """Range-Query direkt gegen Redis (ohne Day-Cache): Archiv + Live-Daten"""
+        archived = self._get_range_archived(street, start_date, end_date)
+        return merge_archived(archived, self._fetch_live_range(street, start_date, end_date))
+
+    def _fetch_live_range(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        if self.storage_backend == 'packed':
+            return self._get_range_packed(street, start_date, end_date)
+        if self.storage_backend == 'timeseries':
+            return self._get_range_timeseries(street, start_date, end_date)
+
+        index_key = hourly_index_key(street)
         
         # Prüfe ob Index existiert
-        if self.client.exists(index_key):
+        if self.reader.exists(index_key):
             return self._get_range_via_index(street, start_date, end_date)
         else:
             return self._get_range_via_scan(street, start_date, end_date)
         
     def _get_range_via_index(self, street: str, start_date: str, end_date: str) -> List[Dict]:
         """Schnelle Methode mit Sorted Set Index - O(log N)"""
-        index_key = f"pedestrian:index:{street}"
-        
-        # Konvertiere zu Timestamps
-        start_ts = datetime.fromisoformat(f"{start_date}T00:00:00").timestamp()
-        end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
-        
-        # Hole Keys aus Index (O(log N))
-        keys = self.client.zrangebyscore(index_key, start_ts, end_ts)
-        
-        if not keys:
-            return []
-        
-        # Hole alle Daten mit Pipeline (1 Round-Trip)
-        pipe = self.client.pipeline()
-        for key in keys:
-            pipe.hgetall(key)
-        
-        results = pipe.execute()
-        
-        # Filtere leere und sortiere
-        valid_results = [r for r in results if r]
-        return sorted(valid_results, key=lambda x: (x.get('date', ''), int(x.get('hour', 0))))
+        return list(self._iter_range_via_index(street, start_date, end_date))
+
+    def _iter_range_via_index(self, street: str, start_date: str, end_date: str,
+                              chunk_size: int = 5000) -> Iterator[Dict]:
+        """
+        Blättert den Index seitenweise (ZRANGEBYSCORE ... LIMIT) und holt pro Seite
+        die Hashes/Records in einer Pipeline. Der Index liefert bereits zeitlich sortiert.
+        """
+        reader, binary_reader = self._readers()
+        index_key = hourly_index_key(street)
+        min_score, end_ts = range_scores(start_date, end_date)
+
+        while min_score is not None:
+            page = reader.zrangebyscore(index_key, min_score, end_ts,
+                                        start=0, num=chunk_size, withscores=True)
+            if not page:
+                return
+
+            pipe = binary_reader.pipeline(transaction=False)
+            queue_index_page(pipe, page)
+            yield from index_page_records(page, pipe.execute())
+            min_score = next_page_score(page, chunk_size)
 
     def _get_range_via_scan(self, street: str, start_date: str, end_date: str) -> List[Dict]:
         """Fallback mit SCAN für Daten ohne Index"""
-        pattern = f"pedestrian:hourly:{street}:*"
-        
-        # Phase 1: Sammle Keys mit SCAN
-        matching_keys = []
-        cursor = 0
-        
-        while True:
-            cursor, keys = self.client.scan(
-                cursor=cursor,
-                match=pattern,
-                count=1000
-            )
-            
-            # Filtere Keys nach Datum
-            for key in keys:
-                parts = key.split(':')
-                if len(parts) >= 4:
-                    key_date = parts[3]
-                    if start_date <= key_date <= end_date:
-                        matching_keys.append(key)
-            
-            if cursor == 0:
-                break
+        reader = self.reader
         
+        # Phase 1: Sammle Keys mit SCAN (scan_iter durchläuft im Cluster alle Knoten)
+        matching_keys = [
+            key for key in reader.scan_iter(match=hourly_pattern(street), count=1000)
+            if scan_key_in_range(key, start_date, end_date)
+        ]
         if not matching_keys:
             return []
         
         # Phase 2: Hole Daten mit Pipeline
-        pipe = self.client.pipeline()
-        for key in matching_keys:
-            pipe.hgetall(key)
-        
-        results = pipe.execute()
-        valid_results = [r for r in results if r]
-        return sorted(valid_results, key=lambda x: (x.get('date', ''), int(x.get('hour', 0))))
+        pipe = reader.pipeline(transaction=False)
+        queue_scan_fetch(pipe, matching_keys)
+        return scan_results_to_records(pipe.execute())
+
+    def iter_historical_range(self, street: str, start_date: str, end_date: str,
+                              chunk_size: int = 1000) -> Iterator[Dict]:
+        """
+        Generator über einen Zeitraum, zeitlich sortiert, mit begrenztem Speicherbedarf.
+        Hash-Layout: Index-Seiten à ``chunk_size`` Stunden; Tages-Blöcke und
+        Zeitreihen: Fenster von ``chunk_size / 24`` Tagen; Archiv: monatsweise.
+        Umgeht den Day-Cache (für Exporte und Training). Alle Seiten kommen vom
+        Knoten, der beim Aufruf gilt (innerhalb von ``_read_scope`` derselbe).
+        """
+        return self._iter_historical_range(self._readers(), street, start_date, end_date, chunk_size)
+
+    def _iter_historical_range(self, pair: Tuple, street: str, start_date: str, end_date: str,
+                               chunk_size: int) -> Iterator[Dict]:
+        with self._read_scope(pair):
+            bounds, _ = self._range_context(street)
+            if bounds is None:
+                # Kein Index: SCAN-Fallback liefert ohnehin eine komplette Liste
+                yield from self._fetch_range(street, start_date, end_date)
+                return
+
+            start_date = max(start_date, bounds[0])
+            end_date = min(end_date, bounds[1])
+            if start_date > end_date:
+                return
+
+            end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+            months = self.reader.zrangebyscore(archive_index_key(street), month_score(start_date[:7]), end_ts)
+
+            window_start = start_date
+            for month in months:
+                dates = month_dates(month)
+                first, last = max(dates[0], start_date), min(dates[-1], end_date)
+                if window_start < first:
+                    yield from self._iter_live_range(street, window_start, _previous_day(first), chunk_size)
+                # Archivierter Monat inkl. nachträglicher Live-Korrekturen
+                yield from self._fetch_range(street, first, last)
+                window_start = _next_day(last)
+
+            if window_start <= end_date:
+                yield from self._iter_live_range(street, window_start, end_date, chunk_size)
+
+    def _iter_live_range(self, street: str, start_date: str, end_date: str,
+                         chunk_size: int) -> Iterator[Dict]:
+        if self.storage_backend == 'hash' and self.reader.exists(hourly_index_key(street)):
+            yield from self._iter_range_via_index(street, start_date, end_date, chunk_size)
+            return
+
+        window = timedelta(days=max(1, chunk_size // 24))
+        current = datetime.strptime(start_date, '%Y-%m-%d')
+        last = datetime.strptime(end_date, '%Y-%m-%d')
+        while current <= last:
+            window_end = min(current + window - timedelta(days=1), last)
+            yield from self._fetch_live_range(street, current.strftime('%Y-%m-%d'), window_end.strftime('%Y-%m-%d'))
+            current = window_end + timedelta(days=1)
     
     def bulk_store_hourly_data(self, street: str, data_list: List[Dict]):
         """Bulk Insert mit Pipeline UND Indexierung"""
-        pipe = self.client.pipeline()
-        index_key = f"pedestrian:index:{street}"
+        if self.storage_backend == 'packed':
+            self._store_packed_hours(street, data_list)
+        elif self.storage_backend == 'timeseries':
+            self._store_timeseries(street, data_list)
+        else:
+            self._bulk_store_hashes(street, data_list)
+
+        self._update_rollups(street, data_list)
+        self._bump_version(street, {data['date'] for data in data_list if data.get('date')}, data_list)
+
+    def _bulk_store_hashes(self, street: str, data_list: List[Dict]):
+        # RedisCluster unterstützt keine MULTI-Pipelines
+        pipe = self.client.pipeline(transaction=not self.cluster)
+        self._queue_hashes(pipe, street, data_list)
+        pipe.execute()
+
+    def _queue_hashes(self, pipe, street: str, data_list: List[Dict]):
+        """Stunden (Hash oder Record-Codec) samt Index-Einträgen in eine Pipeline legen"""
+        index_key = hourly_index_key(street)
         
         for data in data_list:
-            key = f"pedestrian:hourly:{street}:{data['date']}:{data['hour']}"
+            key, counterpart = hourly_keys(street, data['date'], data['hour'])
             
-            # Daten speichern
-            pipe.hset(key, mapping=data)
-            pipe.expire(key, 60*60*24*730)
+            # Daten speichern (Hash oder Record-Codec)
+            queue_record_write(pipe, key, counterpart, index_key, data)
+            self._expire_live(pipe, key)
             
             # Index-Eintrag
             try:
@@ -258,13 +1210,574 @@ class PedestrianRedisClient:
                 pass
         
         # Index TTL
-        pipe.expire(index_key, 60*60*24*730)
-        pipe.execute()
+        self._expire_live(pipe, index_key)
     
+    def buffered_writer(self, max_records: int = 500, max_delay: float = 1.0,
+                        prediction_ttl: int = 60*60*24*9, on_flush=None) -> BufferedWriter:
+        """
+        Sammelt einzelne Stunden/Vorhersagen und schreibt sie gebündelt
+        (siehe database/write_buffer.py)::
+
+            with client.buffered_writer() as writer:
+                for data in records:
+                    writer.store_hourly_data(street, data)
+        """
+        return BufferedWriter(self, max_records, max_delay, prediction_ttl, on_flush)
+
+    # ============================================
+    # DAY-CACHE / VERSIONEN
+    # ============================================
+
+    def _bump_version(self, street: str, dates, data_list: List[Dict] = ()):
+        """Zählt die Schreibversion der Straße hoch (siehe database/day_cache.py) und setzt den Latest-Zeiger"""
+        if not dates:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        self._queue_version_bump(pipe, street, dates, data_list)
+        pipe.execute()
+
+        if self.day_cache is not None:
+            self.day_cache.invalidate(street, dates)
+
+    def _queue_version_bump(self, pipe, street: str, dates, data_list: List[Dict] = ()):
+        pipe.hincrby(version_key(street), 'all', 1)
+        if min(dates) < mutable_cutoff(config.DAY_CACHE_MUTABLE_DAYS):
+            pipe.hincrby(version_key(street), 'history', 1)
+        queue_latest_pointer(pipe, street, data_list)
+
+    def _range_context(self, street: str):
+        """Versionen und vorhandener Tagesbereich einer Straße in einem Round-Trip"""
+        pipe = self.reader.pipeline(transaction=False)
+        queue_range_context(pipe, street, self.storage_backend == 'timeseries')
+        return parse_range_context(pipe.execute(raise_on_error=False))
+
+    def get_date_bounds(self, street: str) -> Optional[Tuple[str, str]]:
+        """Erster und letzter Tag mit Daten einer Straße (Live, Tagesindex und Archiv), None ohne Daten"""
+        bounds, _ = self._range_context(street)
+        return bounds
+
+    def _expire_live(self, target, key: str):
+        """TTL für Live-Daten setzen (LIVE_DATA_TTL=0: kein Ablauf, siehe Archiv)"""
+        if config.LIVE_DATA_TTL:
+            target.expire(key, config.LIVE_DATA_TTL)
+
+    def get_cache_stats(self) -> Optional[Dict]:
+        """Hit/Miss/Eviction-Zähler des Day-Cache (None, wenn deaktiviert)"""
+        return self.day_cache.stats() if self.day_cache is not None else None
+
+    def get_data_versions(self, streets: List[str]) -> Dict[str, Dict[str, int]]:
+        """Versionszähler (history/all/predictions) mehrerer Straßen in einem Round-Trip"""
+        pipe = self.reader.pipeline(transaction=False)
+        for street in streets:
+            pipe.hmget(version_key(street), *DATA_VERSION_FIELDS)
+        return {
+            street: dict(zip(DATA_VERSION_FIELDS, parse_versions(reply)))
+            for street, reply in zip(streets, pipe.execute())
+        }
+
+    def get_reference_versions(self) -> Dict[str, int]:
+        """Import-Zähler der Stammdaten (ohne den Snapshot zu laden)"""
+        reply = self.reader.hmget(REFERENCE_VERSION_KEY, *REFERENCE_DATASETS)
+        return dict(zip(REFERENCE_DATASETS, parse_reference_versions(reply)))
+
+    # ============================================
+    # ARCHIV (KOMPRIMIERTE MONATE)
+    # ============================================
+
+    def _get_range_archived(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        """Datensätze aus archivierten Monaten: ein GET pro Monat"""
+        reader, binary_reader = self._readers()
+        end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+        months = reader.zrangebyscore(archive_index_key(street), month_score(start_date[:7]), end_ts)
+        if not months:
+            return []
+
+        pipe = binary_reader.pipeline(transaction=False)
+        for month in months:
+            pipe.get(archive_key(street, month))
+
+        records = []
+        for month, raw in zip(months, pipe.execute()):
+            if raw:
+                records.extend(month_to_records(street, month, raw, start_date, end_date))
+        return records
+
+    def _get_archived_hour(self, street: str, date: str, hour: int) -> Optional[Dict]:
+        for record in self._get_range_archived(street, date, date):
+            if int(record['hour']) == int(hour):
+                return record
+        return None
+
+    def archive_month(self, street: str, month: str, codec: Optional[str] = None) -> int:
+        """
+        Komprimiert einen Monat (YYYY-MM) in einen Archiv-Wert und entfernt die
+        Live-Daten (Hashes, Tages-Blöcke, Zeitreihen-Samples) dieses Monats.
+        Ein bereits archivierter Monat wird mit neueren Live-Daten zusammengeführt.
+        Gibt die Anzahl archivierter Stunden zurück.
+        """
+        dates = month_dates(month)
+        with self.primary_reads():
+            records = self._fetch_range(street, dates[0], dates[-1])
+        if not records:
+            return 0
+
+        blocks = records_to_month(month, records)
+        raw = encode_month(blocks, codec or config.ARCHIVE_COMPRESSION, month_text(street, records))
+
+        # Erst prüfen, dann Live-Daten löschen
+        if int(decode_month(month, raw)['present'].sum()) != len(records):
+            raise ValueError(f"Archive verification failed for {street} {month}")
+
+        pipe = self.binary_client.pipeline(transaction=False)
+        pipe.set(archive_key(street, month), raw)
+        pipe.zadd(archive_index_key(street), {month: month_score(month)})
+        pipe.execute()
+
+        self._drop_live_range(street, dates[0], dates[-1])
+        return len(records)
+
+    def _drop_live_range(self, street: str, start_date: str, end_date: str):
+        """Entfernt Live-Daten eines Zeitraums aus allen Speicherformaten"""
+        start_ts = datetime.fromisoformat(f"{start_date}T00:00:00").timestamp()
+        end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+
+        index_key = hourly_index_key(street)
+        keys = self.client.zrangebyscore(index_key, start_ts, end_ts)
+        pipe = self.client.pipeline(transaction=False)
+        for offset in range(0, len(keys), 5000):
+            pipe.delete(*keys[offset:offset + 5000])
+        pipe.zremrangebyscore(index_key, start_ts, end_ts)
+
+        for date in self.client.zrangebyscore(day_index_key(street), start_ts, end_ts):
+            pipe.delete(day_key(street, date), day_text_key(street, date))
+        pipe.zremrangebyscore(day_index_key(street), start_ts, end_ts)
+        pipe.execute()
+
+        if self.storage_backend == 'timeseries':
+            for metric in TS_METRICS:
+                try:
+                    self.client.ts().delete(ts_key(street, metric), int(start_ts * 1000), int(end_ts * 1000))
+                except redis.ResponseError:
+                    pass
+            self.client.delete(*(day_text_key(street, date) for date in _date_range(start_date, end_date)))
+
+    def get_archived_months(self, street: str) -> List[str]:
+        return self.reader.zrange(archive_index_key(street), 0, -1)
+
+    # ============================================
+    # PACKED TAGES-BLÖCKE
+    # ============================================
+
+    def _store_packed_hours(self, street: str, data_list: List[Dict]):
+        """
+        Schreibt Stunden in die Tages-Blöcke (SETRANGE auf den Stunden-Slot).
+        Bereits vorhandene Stunden werden in-place überschrieben.
+        """
+        pipe = self.binary_client.pipeline(transaction=False)
+        index_key = day_index_key(street)
+        days = {}
+
+        for data in data_list:
+            try:
+                hour = int(data['hour'])
+                day_score = datetime.fromisoformat(f"{data['date']}T00:00:00").timestamp()
+            except (KeyError, ValueError) as e:
+                print(f"Warning: Could not pack record: {e}")
+                continue
+
+            block_key = day_key(street, data['date'])
+            pipe.setrange(block_key, hour * DAY_SLOT_SIZE, encode_hour_slot(data))
+            queue_hour_text(pipe, street, data)
+            days[block_key] = (data['date'], day_score)
+
+        for block_key, (date, day_score) in days.items():
+            self._expire_live(pipe, block_key)
+            self._expire_live(pipe, day_text_key(street, date))
+            pipe.zadd(index_key, {date: day_score})
+
+        if days:
+            self._expire_live(pipe, index_key)
+            pipe.execute()
+
+    def get_latest_record(self, street: str) -> Optional[Dict]:
+        """
+        Neueste gespeicherte Stunde: ein ZRANGE auf den Latest-Zeiger. Fehlt der
+        Zeiger (Daten von vor seiner Einführung), den letzten Tag laut Index
+        lesen und den Zeiger nachtragen.
+        """
+        with self._read_scope():
+            latest = parse_latest_pointer(self.reader.zrange(latest_key(street), -1, -1))
+            if latest is not None:
+                return latest
+
+            bounds, _ = self._range_context(street)
+            if bounds is None:
+                return None
+            records = self.get_historical_range(street, bounds[1], bounds[1])
+        if not records:
+            return None
+
+        pipe = self.client.pipeline(transaction=False)
+        queue_latest_pointer(pipe, street, records)
+        pipe.execute()
+        return records[-1]
+
+    def get_latest_hour_timestamp(self, street: str) -> Optional[float]:
+        """Unix-Timestamp der neuesten gespeicherten Stunde (beide Layouts)"""
+        latest = None
+
+        entries = self.client.zrange(hourly_index_key(street), -1, -1, withscores=True)
+        if entries:
+            latest = entries[0][1]
+
+        if self.storage_backend == 'timeseries':
+            try:
+                last = self.client.ts().get(ts_key(street, 'n_pedestrians'))
+            except redis.ResponseError:
+                last = None
+            if last:
+                latest = max(latest or 0, last[0] / 1000)
+
+        if self.storage_backend == 'packed':
+            days = self.client.zrange(day_index_key(street), -1, -1, withscores=True)
+            if days:
+                date = days[0][0]
+                block = decode_day_block(self.binary_client.get(day_key(street, date)))
+                hours = np.flatnonzero(block['present'])
+                if hours.size:
+                    packed_latest = datetime.fromisoformat(f"{date}T{int(hours[-1]):02d}:00:00").timestamp()
+                    latest = max(latest or packed_latest, packed_latest)
+
+        return latest
+
+    def store_packed_day(self, street: str, date: str, records: List[Dict]):
+        """Schreibt einen kompletten Tag als einen Wert (z.B. für die Migration)"""
+        block = bytearray(DAY_SLOT_SIZE * 24)
+        for data in records:
+            hour = int(data['hour'])
+            block[hour * DAY_SLOT_SIZE:(hour + 1) * DAY_SLOT_SIZE] = encode_hour_slot(data)
+
+        day_score = datetime.fromisoformat(f"{date}T00:00:00").timestamp()
+        pipe = self.binary_client.pipeline(transaction=False)
+        pipe.set(day_key(street, date), bytes(block), ex=config.LIVE_DATA_TTL or None)
+        pipe.delete(day_text_key(street, date))
+        for data in records:
+            queue_hour_text(pipe, street, {**data, 'date': date})
+        self._expire_live(pipe, day_text_key(street, date))
+        pipe.zadd(day_index_key(street), {date: day_score})
+        self._expire_live(pipe, day_index_key(street))
+        pipe.execute()
+        self._bump_version(street, [date], [{**data, 'date': date} for data in records])
+
+    def _get_range_packed(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        """Range-Query über Tages-Blöcke, ergänzt um noch nicht migrierte Hashes"""
+        records = self._get_range_packed_only(street, start_date, end_date)
+
+        # Während der Migration: Stunden, die nur im Hash-Layout liegen, ergänzen
+        if self.reader.exists(hourly_index_key(street)):
+            records = merge_legacy_hours(records, self._get_range_via_index(street, start_date, end_date))
+
+        return records
+
+    def _get_range_packed_only(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        """Range-Query über Tages-Blöcke: ein GET pro Tag"""
+        reader, binary_reader = self._readers()
+        dates = reader.zrangebyscore(day_index_key(street), *range_scores(start_date, end_date))
+
+        records = []
+        if dates:
+            pipe = binary_reader.pipeline(transaction=False)
+            queue_day_blocks(pipe, street, dates)
+            records = day_blocks_to_records(street, dates, iter(pipe.execute()))
+
+        return records
+
+    # ============================================
+    # REDISTIMESERIES
+    # ============================================
+
+    def _ensure_timeseries(self, street: str):
+        """Legt die Serien einer Straße mit Labels an (einmal pro Prozess)"""
+        if street in self._ts_streets:
+            return
+
+        for metric in TS_METRICS:
+            try:
+                self.client.ts().create(
+                    ts_key(street, metric),
+                    retention_msecs=1000*config.LIVE_DATA_TTL,
+                    duplicate_policy='last',
+                    labels={'type': 'pedestrian', 'street': street, 'metric': metric}
+                )
+            except redis.ResponseError as e:
+                # Serie existiert bereits
+                if 'already exists' not in str(e).lower():
+                    raise
+        self._ts_streets.add(street)
+
+    def _store_timeseries(self, street: str, data_list: List[Dict]):
+        """Schreibt alle Messwerte eines Batches mit einem TS.MADD"""
+        self._ensure_timeseries(street)
+
+        pipe = self.client.pipeline(transaction=False)
+        samples, dates = [], set()
+        for data in data_list:
+            try:
+                timestamp = f"{data['date']}T{str(data['hour']).zfill(2)}:00:00"
+                ts_ms = int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+            except (KeyError, ValueError) as e:
+                print(f"Warning: Could not convert record for timeseries: {e}")
+                continue
+
+            for metric in ('n_pedestrians', 'n_pedestrians_towards', 'n_pedestrians_away'):
+                samples.append((ts_key(street, metric), ts_ms, float(data.get(metric) or 0)))
+
+            if data.get('temperature') not in (None, ''):
+                samples.append((ts_key(street, 'temperature'), ts_ms, float(data['temperature'])))
+
+            for metric, codes, _ in TS_CODED_METRICS:
+                samples.append((ts_key(street, metric), ts_ms, codes.get(data.get(metric) or '', 0)))
+
+            # id/timestamp/... weichen selten ab: Text-Anhang wie beim packed-Backend
+            queue_hour_text(pipe, street, data)
+            dates.add(data['date'])
+
+        if samples:
+            self.client.ts().madd(samples)
+            for date in dates:
+                self._expire_live(pipe, day_text_key(street, date))
+            pipe.execute()
+
+    def _get_range_timeseries(self, street: str, start_date: str, end_date: str) -> List[Dict]:
+        return self._get_range_timeseries_ms(street, *ts_range_ms(start_date, end_date))
+
+    def _get_range_timeseries_ms(self, street: str, start_ms: int, end_ms: int) -> List[Dict]:
+        """TS.MRANGE über alle Serien der Straße, zusammengeführt pro Zeitstempel"""
+        try:
+            series, = self._ts_mrange_many(street, start_ms, end_ms, [(TS_METRICS, {})])
+        except redis.ResponseError:
+            return []
+
+        dates = timeseries_dates(series)
+        if not dates:
+            return []
+        pipe = self.reader.pipeline(transaction=False)
+        queue_day_text(pipe, street, dates)
+        return timeseries_to_records(street, series, text=day_text_replies(dates, iter(pipe.execute())))
+
+    def _ts_mrange_many(self, street: str, start_ms: int, end_ms: int, queries: List) -> List:
+        """
+        Mehrere TS.MRANGE-Abfragen (Messwerte, Aggregation) in einem Round-Trip.
+        Im Cluster wird MRANGE nicht nach Labels geroutet; dort stattdessen ein
+        TS.RANGE pro Serie (alle Serien einer Straße liegen im selben Slot).
+        """
+        reader = self.reader
+        if not self.cluster:
+            pipe = reader.ts().pipeline(transaction=False)
+            for metrics, aggregation in queries:
+                pipe.mrange(start_ms, end_ms, filters=ts_mrange_filters(street, metrics), **aggregation)
+            return pipe.execute()
+
+        pipe = reader.pipeline(transaction=False)
+        for metrics, aggregation in queries:
+            queue_ts_ranges(pipe, street, start_ms, end_ms, metrics, aggregation)
+        replies = iter(pipe.execute(raise_on_error=False))
+        return [ts_range_series(street, metrics, replies) for metrics, _ in queries]
+
+    # ============================================
+    # ROLLUPS (TAG / WOCHE / MONAT)
+    # ============================================
+
+    def _update_rollups(self, street: str, data_list: List[Dict]):
+        """
+        Pflegt die Rollup-Hashes für Tag, Woche und Monat.
+        Summen werden per Delta (neue minus alte Stundenwerte) erhöht, sodass
+        erneut geschriebene Stunden nicht doppelt zählen; ROLLUP_UPDATE_LUA
+        wendet das je Tag atomar an.
+        """
+        hours_by_date = {}
+        for data in data_list:
+            try:
+                hours_by_date.setdefault(data['date'], {})[hour_field(data['hour'])] = encode_hour_value(data)
+            except (KeyError, ValueError) as e:
+                print(f"Warning: Could not add to rollup: {e}")
+        if not hours_by_date:
+            return
+
+        pipe = self.client.pipeline(transaction=False)
+        for date in sorted(hours_by_date):
+            keys, args = rollup_update_call(street, date, hours_by_date[date], config.LIVE_DATA_TTL)
+            self._rollup_script(keys=keys, args=args, client=pipe)
+        pipe.execute()
+
+    def get_rollup(self, street: str, granularity: str, start_date: str, end_date: str) -> List[Dict]:
+        """
+        Aggregierte Werte pro Tag, ISO-Woche oder Monat:
+        total, towards, away, hours, peak_value, peak_hour, avg_temperature
+
+        Liest die gepflegten Rollup-Hashes; Wochen und Monate werden dabei
+        vollständig geliefert, auch wenn ``start_date``/``end_date`` mitten
+        im Zeitraum liegen. Ohne Rollups wird aus den Stundenwerten gerechnet,
+        ebenso für einzelne Zeiträume, deren Hash fehlt.
+        """
+        with self._read_scope():
+            reader = self.reader
+            start_ts, end_ts = rollup_index_scores(granularity, start_date, end_date)
+            periods = reader.zrangebyscore(rollup_index_key(street, granularity), start_ts, end_ts, withscores=True)
+            if periods:
+                pipe = reader.pipeline(transaction=False)
+                queue_rollup_hashes(pipe, street, granularity, periods)
+                rollups = []
+                for rollup in parse_rollup_hashes(granularity, periods, pipe.execute()):
+                    if isinstance(rollup, tuple):
+                        rollup = aggregate_records(self.get_historical_range(street, *rollup), granularity)
+                    else:
+                        rollup = [rollup]
+                    rollups.extend(rollup)
+                return rollups
+
+            if self.storage_backend == 'timeseries':
+                return self._get_rollup_timeseries(street, granularity, start_date, end_date)
+
+            records = self.get_historical_range(street, start_date, end_date)
+        return aggregate_records(records, granularity)
+
+    def _get_rollup_timeseries(self, street: str, granularity: str,
+                               start_date: str, end_date: str) -> List[Dict]:
+        """
+        Serverseitige Aggregation in Tages-Buckets (TS.MRANGE AGGREGATION).
+        Wochen und Monate werden aus den Tageswerten zusammengesetzt, da
+        Monate keine feste Bucket-Größe haben.
+        """
+        start_ms, end_ms = ts_range_ms(start_date, end_date)
+        try:
+            replies = self._ts_mrange_many(street, start_ms, end_ms, ts_rollup_queries(start_ms))
+        except redis.ResponseError:
+            return []
+        return ts_rollups(granularity, *replies)
+
+    # ============================================
+    # KENNZAHLEN (LUA)
+    # ============================================
+
+    def get_range_summary(self, street: str, start_date: str, end_date: str) -> Dict:
+        """
+        Summe, Mittelwert, Peak, Stundenprofil und Richtungsanteil eines Zeitraums
+        (siehe database/aggregation.py). Im Hash-Layout rechnet Redis per EVALSHA
+        über den Stunden-Index; sonst, bei archivierten Monaten im Zeitraum oder
+        deaktiviertem Scripting clientseitig aus get_historical_range.
+        """
+        with self._read_scope():
+            if self.storage_backend == 'hash' and self._lua_summary:
+                reader = self.reader
+                pipe = reader.pipeline(transaction=False)
+                queue_summary_context(pipe, street, start_date, end_date)
+
+                if lua_summary_possible(pipe.execute()):
+                    try:
+                        summary = empty_summary()
+                        min_score, end_ts = range_scores(start_date, end_date)
+                        while min_score is not None:
+                            reply = self._summary_script(client=reader, **summary_script_call(street, min_score, end_ts))
+                            min_score = next_summary_score(summary, reply)
+                        return finalize_summary(street, start_date, end_date, summary, 'lua')
+                    except redis.ResponseError as e:
+                        # z.B. EVAL per ACL oder rename-command gesperrt
+                        print(f"⚠️  Lua aggregation unavailable, using client-side summary: {e}")
+                        self._lua_summary = False
+
+            records = self.get_historical_range(street, start_date, end_date)
+        return finalize_summary(street, start_date, end_date, summarize_records(records), 'client')
+
+    def get_range_statistics(self, street: str, start_date: str, end_date: str) -> Dict:
+        """
+        Summary-Cards des Frontends (StatisticsData, siehe database/aggregation.py)
+        aus den Stundenwerten des Zeitraums; abgeschlossene Tage kommen aus dem Day-Cache.
+        """
+        return compute_statistics(self.get_historical_range(street, start_date, end_date))
+
+    def get_range_heatmap(self, street: str, start_date: str, end_date: str, metric: str = 'mean') -> Dict:
+        """
+        Wochentag×Stunde-Matrix (siehe compute_heatmap). Abgeschlossene Zeiträume werden
+        unter ``pedestrian:heatmap:...`` gespeichert und gelten, bis ein Schreibzugriff auf
+        alte Tage die history-Version der Straße hochzählt.
+        """
+        parse_heatmap_metric(metric)
+        if not heatmap_cacheable(end_date):
+            heatmap = compute_heatmap(self.get_historical_range(street, start_date, end_date), metric)
+            return heatmap_response(street, start_date, end_date, heatmap, False)
+
+        pipe = self.reader.pipeline(transaction=False)
+        queue_heatmap_lookup(pipe, street, start_date, end_date, metric)
+        version, heatmap = parse_heatmap_lookup(pipe.execute())
+        if heatmap is not None:
+            return heatmap_response(street, start_date, end_date, heatmap, True)
+
+        heatmap = compute_heatmap(self.get_historical_range(street, start_date, end_date), metric)
+        pipe = self.client.pipeline(transaction=False)
+        queue_heatmap_store(pipe, street, start_date, end_date, metric, version, heatmap)
+        pipe.execute()
+        return heatmap_response(street, start_date, end_date, heatmap, False)
+
     # ============================================
     # PREDICTIONS
     # ============================================
     
+    def store_predictions(self, predictions: List[Dict], ttl: int = 60*60*24*9) -> int:
+        """
+        Speichert Vorhersagen und pflegt pro Straße einen Sorted-Set-Index
+        (Score = Zielstunde) sowie einen Status-Hash der aktuellen Generation.
+
+        Args:
+            predictions: Vorhersage-Dicts mit mindestens street, date, hour
+            ttl: Lebensdauer der Vorhersage-Keys in Sekunden
+
+        Returns:
+            Anzahl gespeicherter Vorhersagen
+        """
+        pipe = self.client.pipeline(transaction=False)
+        stored = self._queue_predictions(pipe, predictions, ttl)
+        pipe.execute()
+        return stored
+
+    def _queue_predictions(self, pipe, predictions: List[Dict], ttl: int) -> int:
+        """Vorhersagen, Index- und Status-Einträge in eine Pipeline legen (siehe store_predictions)"""
+        horizons = {}
+        stored = 0
+
+        for data in predictions:
+            street = data['street']
+            key, counterpart = prediction_keys(street, data['date'], data['hour'])
+            score = datetime.fromisoformat(f"{data['date']}T{str(data['hour']).zfill(2)}:00:00").timestamp()
+
+            queue_record_write(pipe, key, counterpart, prediction_index_key(street), data)
+            pipe.expire(key, ttl)
+            pipe.zadd(prediction_index_key(street), {key: score})
+
+            start, end, count = horizons.get(street, (score, score, 0))
+            horizons[street] = (min(start, score), max(end, score), count + 1)
+            stored += 1
+
+        generated_at = datetime.now().isoformat()
+        # Einträge, deren Keys sicher abgelaufen sind (Zielstunde älter als die TTL)
+        expired_before = datetime.now().timestamp() - ttl
+
+        for street, (start, end, count) in horizons.items():
+            index_key = prediction_index_key(street)
+            pipe.zremrangebyscore(index_key, '-inf', expired_before)
+            pipe.expire(index_key, ttl)
+            pipe.hset(prediction_status_key(street), mapping={
+                'count': count,
+                'horizon_start': datetime.fromtimestamp(start).isoformat(),
+                'horizon_end': datetime.fromtimestamp(end).isoformat(),
+                'generated_at': generated_at
+            })
+            pipe.expire(prediction_status_key(street), ttl)
+            pipe.sadd(prediction_streets_key(), street)
+            pipe.hincrby(version_key(street), 'predictions', 1)
+
+        return stored
+
     def get_prediction_range(self, street: str, start_date: str, end_date: str) -> List[Dict]:
         """
         Retrieves predictions for a street within a date range.
@@ -278,56 +1791,51 @@ class PedestrianRedisClient:
         Returns:
             List of prediction dictionaries sorted by timestamp
         """
+        return self.get_prediction_range_many([street], start_date, end_date)[street]
+
+    def get_prediction_range_many(self, streets: List[str], start_date: str, end_date: str) -> Dict[str, List[Dict]]:
+        """
+        Vorhersagen mehrerer Straßen in zwei Round-Trips: erst alle Index-Lookups,
+        dann alle Hashes/Records. Liefert Straße -> nach Zeit sortierte Vorhersagen.
+        """
+        reader, binary_reader = self._readers()
+        streets = list(dict.fromkeys(streets))
         try:
-            start = datetime.strptime(start_date, '%Y-%m-%d')
-            end = datetime.strptime(end_date, '%Y-%m-%d')
-            
-            predictions = []
-            current_date = start
-            
-            # Build list of keys to check
-            keys_to_check = []
-            while current_date <= end:
-                date_str = current_date.strftime('%Y-%m-%d')
-                
-                # Check all 24 hours for each day
-                for hour in range(24):
-                    key = f"pedestrian:hourly:prediction:{street}:{date_str}:{hour}"
-                    keys_to_check.append(key)
-                
-                current_date += timedelta(days=1)
-            
-            # Use pipeline for efficiency (batch Redis calls)
-            if keys_to_check:
-                pipe = self.client.pipeline()
-                for key in keys_to_check:
-                    pipe.exists(key)
-                
-                # Check which keys exist
-                existence_checks = pipe.execute()
-                
-                # Only fetch data for existing keys
-                existing_keys = [key for key, exists in zip(keys_to_check, existence_checks) if exists]
-                
-                if existing_keys:
-                    pipe = self.client.pipeline()
-                    for key in existing_keys:
-                        pipe.hgetall(key)
-                    
-                    results = pipe.execute()
-                    predictions = [r for r in results if r]
-            
-            # Sort by timestamp
-            return sorted(predictions, key=lambda x: (x.get('date', ''), int(x.get('hour', 0))))
-        
-        except Exception as e:
-            print(f"Error fetching predictions for {street}: {e}")
-            return []
+            start_ts = datetime.fromisoformat(f"{start_date}T00:00:00").timestamp()
+            end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
+
+            pipe = reader.pipeline(transaction=False)
+            for street in streets:
+                pipe.exists(prediction_index_key(street))
+                pipe.zrangebyscore(prediction_index_key(street), start_ts, end_ts)
+            replies = pipe.execute()
+
+            keys = {
+                street: indexed if exists else prediction_candidate_keys(street, start_date, end_date)
+                for street, exists, indexed in zip(streets, replies[0::2], replies[1::2])
+            }
+
+            pipe = binary_reader.pipeline(transaction=False)
+            for street in streets:
+                for key in keys[street]:
+                    queue_stored_record(pipe, key)
+            replies = iter(pipe.execute() if len(pipe) else [])
+
+            # Abgelaufene Keys liefern leere Hashes
+            return {
+                street: sorted([
+                    r for r in (decode_stored_record(key, next(replies)) for key in keys[street]) if r
+                ], key=record_sort_key)
+                for street in streets
+            }
 
+        except Exception as e:
+            print(f"Error fetching predictions for {', '.join(streets)}: {e}")
+            return {street: [] for street in streets}
 
     def get_prediction_count(self, street: Optional[str] = None) -> int:
         """
-        Count available predictions.
+        Count available predictions (ZCARD of the per-street index).
         
         Args:
             street: Optional street name. If None, counts all predictions.
@@ -335,33 +1843,18 @@ class PedestrianRedisClient:
         Returns:
             Number of prediction records
         """
+        reader = self.reader
         try:
-            if street:
-                pattern = f"pedestrian:hourly:prediction:{street}:*"
-            else:
-                pattern = "pedestrian:hourly:prediction:*"
-            
-            count = 0
-            cursor = 0
-            
-            while True:
-                cursor, keys = self.client.scan(
-                    cursor=cursor,
-                    match=pattern,
-                    count=1000
-                )
-                count += len(keys)
-                
-                if cursor == 0:
-                    break
-            
-            return count
+            streets = [street] if street else reader.smembers(prediction_streets_key())
+            pipe = reader.pipeline(transaction=False)
+            for name in streets:
+                pipe.zcard(prediction_index_key(name))
+            return sum(pipe.execute()) if streets else 0
         
         except Exception as e:
             print(f"Error counting predictions: {e}")
             return 0
 
-
     def get_latest_prediction_timestamp(self, street: str) -> Optional[str]:
         """
         Get the timestamp of the latest available prediction for a street.
@@ -373,42 +1866,26 @@ class PedestrianRedisClient:
             ISO timestamp string or None
         """
         try:
-            pattern = f"pedestrian:hourly:prediction:{street}:*"
-            
-            # Scan for all prediction keys
-            all_keys = []
-            cursor = 0
-            
-            while True:
-                cursor, keys = self.client.scan(
-                    cursor=cursor,
-                    match=pattern,
-                    count=1000
-                )
-                all_keys.extend(keys)
-                
-                if cursor == 0:
-                    break
-            
-            if not all_keys:
+            latest = self.reader.zrange(prediction_index_key(street), -1, -1, withscores=True)
+            if not latest:
                 return None
-            
-            # Get timestamps using pipeline
-            pipe = self.client.pipeline()
-            for key in all_keys:
-                pipe.hget(key, 'timestamp')
-            
-            timestamps = pipe.execute()
-            valid_timestamps = [ts for ts in timestamps if ts]
-            
-            if valid_timestamps:
-                return max(valid_timestamps)
-            
-            return None
+            return datetime.fromtimestamp(latest[0][1]).isoformat()
         
         except Exception as e:
             print(f"Error getting latest prediction timestamp: {e}")
             return None
+
+    def get_prediction_status(self, street: str) -> Dict:
+        """
+        Status der Vorhersagen einer Straße in einem Round-Trip:
+        Anzahl, neueste Zielstunde und Metadaten der letzten Generation.
+        """
+        pipe = self.reader.pipeline(transaction=False)
+        pipe.zcard(prediction_index_key(street))
+        pipe.zrange(prediction_index_key(street), -1, -1, withscores=True)
+        pipe.hgetall(prediction_status_key(street))
+        count, latest, status = pipe.execute()
+        return build_prediction_status(count, latest, status)
     
     # ============================================
     # FEIERTAGE
@@ -416,88 +1893,69 @@ class PedestrianRedisClient:
     
     def get_holiday_info(self, date: str) -> Optional[Dict]:
         """Holt Feiertagsinformationen"""
-        key = f"holiday:{date}"
-        data = self.client.hgetall(key)
-        
-        if data:
-            return {
-                'date': data['date'],
-                'is_holiday': bool(int(data.get('is_holiday', 0))),
-                'is_nationwide': bool(int(data.get('is_nationwide', 0)))
-            }
-        return None
+        return parse_holiday(self.reader.hgetall(f"holiday:{date}"))
     
     def get_detailed_holiday_info(self, date: str) -> Optional[Dict]:
         """Holt detaillierte Feiertagsinformationen"""
-        key = f"holiday:detail:{date}"
-        data = self.client.hgetall(key)
-        
-        if data:
-            return {
-                'date': data['date'],
-                'name': data['name'],
-                'regional_scope': data['regional_scope'],
-                'temporal_scope': data['temporal_scope'],
-                'is_nationwide': bool(int(data.get('is_nationwide', 0))),
-                'subdivisions': data.get('subdivisions', '')
-            }
-        return None
+        return parse_detailed_holiday(self.reader.hgetall(f"holiday:detail:{date}"))
     
     def is_holiday(self, date: str) -> bool:
         """Prüft ob Feiertag"""
-        return self.client.sismember('holidays:all', date)
+        return self.reader.sismember('holidays:all', date)
     
     def is_nationwide_holiday(self, date: str) -> bool:
         """Prüft ob bundesweiter Feiertag"""
-        return self.client.sismember('holidays:nationwide', date)
+        return self.reader.sismember('holidays:nationwide', date)
     
+    # ============================================
+    # KALENDER-BITMAPS
+    # ============================================
+
+    def get_calendar_flags(self, start_date: str, end_date: str,
+                           flags: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Kalender-Flags für [start_date, end_date] in einem Round-Trip (ein GETRANGE pro Flag).
+        Tages-Flags: Bool-Array pro Tag, Stunden-Flags: Bool-Array (Tage, 24).
+        ValueError, wenn eine Bitmap fehlt (noch nicht gebaut).
+        """
+        ranges = flag_ranges(flags or DAY_FLAGS + HOUR_FLAGS, start_date, end_date)
+        pipe = self.binary_reader.pipeline(transaction=False)
+        for flag, first_bit, last_bit in ranges:
+            pipe.exists(bitmap_key(flag))
+            pipe.getrange(bitmap_key(flag), *byte_range(first_bit, last_bit))
+        replies = pipe.execute()
+        missing = missing_bitmaps(ranges, replies[0::2])
+        if missing:
+            raise ValueError(f"Calendar bitmaps missing: {', '.join(missing)} (scripts/build_calendar_bitmaps.py)")
+        return decode_flags(ranges, replies[1::2])
+
+    def get_day_flags(self, flag: str, start_date: str, end_date: str) -> np.ndarray:
+        """Tages-Flag (z.B. 'public_holiday') als Bool-Array, ein Eintrag pro Tag"""
+        return self.get_calendar_flags(start_date, end_date, [flag])[flag]
+
+    def get_hour_flags(self, flag: str, start_date: str, end_date: str) -> np.ndarray:
+        """Stunden-Flag ('event'/'concert') als Bool-Array der Form (Tage, 24)"""
+        return self.get_calendar_flags(start_date, end_date, [flag])[flag]
+
     # ============================================
     # SCHULFERIEN
     # ============================================
     
     def get_school_holiday_info(self, date: str) -> Optional[Dict]:
         """Holt Schulferien-Informationen"""
-        key = f"school_holiday:{date}"
-        data = self.client.hgetall(key)
-        
-        if data:
-            return {
-                'date': data['date'],
-                'is_school_holiday': bool(int(data.get('is_school_holiday', 0)))
-            }
-        return None
+        return parse_school_holiday(self.reader.hgetall(f"school_holiday:{date}"))
     
     def get_school_holiday_period(self, date: str) -> Optional[Dict]:
         """Holt Schulferien-Periode"""
-        key = f"school_holiday:day:{date}"
-        data = self.client.hgetall(key)
-        
-        if data:
-            return {
-                'date': data['date'],
-                'holiday_name': data['holiday_name'],
-                'start_date': data['start_date'],
-                'end_date': data['end_date'],
-                'type': data['type']
-            }
-        return None
+        return parse_school_holiday_period(self.reader.hgetall(f"school_holiday:day:{date}"))
     
     def is_school_holiday(self, date: str) -> bool:
         """Prüft ob Schulferien"""
-        return self.client.sismember('school_holidays:all', date)
+        return self.reader.sismember('school_holidays:all', date)
     
     def get_all_school_holiday_periods(self) -> List[Dict]:
-        """Holt alle Schulferien-Perioden"""
-        pattern = "school_holiday:period:*"
-        keys = self.client.keys(pattern)
-        
-        periods = []
-        for key in keys:
-            data = self.client.hgetall(key)
-            if data:
-                periods.append(data)
-        
-        return sorted(periods, key=lambda x: x.get('start_date', ''))
+        """Holt alle Schulferien-Perioden (aus dem Stammdaten-Snapshot)"""
+        return list(self.get_reference_data().school_holiday_periods)
     
     # ============================================
     # EVENTS
@@ -506,112 +1964,78 @@ class PedestrianRedisClient:
     def get_event_info(self, date: str, hour: int = None) -> Optional[Dict]:
         """Holt Event-Informationen"""
         if hour is not None:
-            key = f"event:{date}:{hour}"
-            data = self.client.hgetall(key)
-            
-            if data:
-                return {
-                    'date': data['date'],
-                    'hour': int(data['hour']),
-                    'has_event': bool(int(data['has_event'])),
-                    'has_concert': bool(int(data['has_concert']))
-                }
-        else:
-            # Ganzer Tag
-            has_any_event = False
-            has_any_concert = False
-            
-            for h in range(24):
-                key = f"event:{date}:{h}"
-                data = self.client.hgetall(key)
-                if data:
-                    if data.get('has_event') == '1':
-                        has_any_event = True
-                    if data.get('has_concert') == '1':
-                        has_any_concert = True
-            
-            return {
-                'date': date,
-                'has_event': has_any_event,
-                'has_concert': has_any_concert
-            }
-        
-        return None
+            return parse_event_hour(self.reader.hgetall(f"event:{date}:{hour}"))
+
+        # Ganzer Tag
+        return self.get_event_info_many([date])[date]
+
+    def get_event_info_many(self, dates: List[str]) -> Dict[str, Dict]:
+        """Event-Flags beliebig vieler Tage: ein Round-Trip über die Tages-Aggregate"""
+        return self._get_event_days('events', dates)
+
+    def _get_event_days(self, source: str, dates: List[str]) -> Dict[str, Dict]:
+        """Tages-Aggregate einer Event-Quelle (EVENT_SOURCES), Stunden nur als Fallback"""
+        reader = self.reader
+        dates = list(dict.fromkeys(dates))
+        pipe = reader.pipeline(transaction=False)
+        queue_event_days(pipe, source, dates)
+        result, missing = parse_event_days(source, dates, pipe.execute())
+
+        if missing:
+            # Import ohne Tages-Aggregate: alle Stunden in einer Pipeline
+            pipe = reader.pipeline(transaction=False)
+            queue_event_hours(pipe, source, missing)
+            result.update(merge_event_day_hours(source, missing, pipe.execute()))
+
+        return result
     
     def get_detailed_event_info(self, date: str, hour: int = None) -> Optional[Dict]:
         """Holt detaillierte Event-Informationen"""
         if hour is not None:
-            key = f"event:detail:hour:{date}:{hour}"
-            data = self.client.hgetall(key)
-            
-            if data:
-                return {
-                    'date': data['date'],
-                    'hour': int(data['hour']),
-                    'event_name': data['event_name'],
-                    'is_concert': bool(int(data['is_concert'])),
-                    'event_start': data['event_start'],
-                    'event_end': data['event_end']
-                }
-        else:
-            # Alle Events des Tages
-            events = []
-            seen_events = set()
-            
-            for h in range(24):
-                key = f"event:detail:hour:{date}:{h}"
-                data = self.client.hgetall(key)
-                if data and data['event_name'] not in seen_events:
-                    events.append({
-                        'event_name': data['event_name'],
-                        'is_concert': bool(int(data['is_concert'])),
-                        'start': data['event_start'],
-                        'end': data['event_end']
-                    })
-                    seen_events.add(data['event_name'])
-            
-            return {
-                'date': date,
-                'events': events,
-                'has_event': len(events) > 0
-            }
-        
-        return None
+            return parse_detailed_event_hour(self.reader.hgetall(f"event:detail:hour:{date}:{hour}"))
+
+        # Alle Events des Tages
+        return self.get_detailed_event_info_many([date])[date]
+
+    def get_detailed_event_info_many(self, dates: List[str]) -> Dict[str, Dict]:
+        """Event-Details beliebig vieler Tage: ein Round-Trip über die Tages-Aggregate"""
+        return self._get_event_days('detailed', dates)
     
     def has_event_on_date(self, date: str) -> bool:
         """Prüft ob Event an diesem Tag"""
-        return self.client.sismember('events:all_dates', date)
+        return self.reader.sismember('events:all_dates', date)
     
     # ============================================
     # VORLESUNGSZEITEN
     # ============================================
     
+    def get_calendar_range(self, start_date: str, end_date: str) -> Dict[str, Dict]:
+        """
+        Kalender aller Tage im Zeitraum: Feiertage, Schulferien und Vorlesungen in
+        einer Pipeline, Events über die Tages-Aggregate (je ein Round-Trip).
+        Liefert date -> {public_holiday, school_holiday_period, lecture, event, events}.
+        """
+        dates = _date_range(start_date, end_date)
+        with self._read_scope():
+            pipe = self.reader.pipeline(transaction=False)
+            queue_calendar_days(pipe, dates)
+            replies = pipe.execute()
+            events = self.get_event_info_many(dates)
+            detailed_events = self.get_detailed_event_info_many(dates)
+        return build_calendar_range(dates, replies, events, detailed_events)
+
     def get_lecture_info(self, date: str) -> Optional[Dict]:
         """Read lecture info from Redis matching actual schema."""
         key = f"lecture:daily:{date}"  # Changed from "lecture:{date}"
-        data = self.client.hgetall(key)
-
-        if not data:
-            return None
-
-        # Return university-specific flags
-        university = data.get("university", "")
-        is_lecture = int(data.get("is_lecture_period", 0))
-
-        return {
-            "date": data.get("date", date),
-            "is_lecture_period": is_lecture,
-            "jmu_lecture": 1 if (is_lecture and university == "JMU") else 0,
-            "thws_lecture": 1 if (is_lecture and university == "THWS") else 0
-        }
+        return parse_lecture(date, self.reader.hgetall(key))
     
     def is_jmu_lecture_period(self, date: str) -> bool:
         """Prüft ob JMU Vorlesungszeit"""
-        return self.client.sismember('lectures:jmu:detailed', date)
+        return self.reader.sismember('lectures:jmu:detailed', date)
     
     def is_thws_lecture_period(self, date: str) -> bool:
         """Prüft ob THWS Vorlesungszeit"""
-        return self.client.sismember('lectures:thws:detailed', date)
+        return self.reader.sismember('lectures:thws:detailed', date)
     
     # ============================================
     # LOCATIONS
@@ -619,67 +2043,49 @@ class PedestrianRedisClient:
     
     def get_location_by_street(self, street_name: str) -> Optional[Dict]:
         """Holt Standort-Informationen nach Straßenname"""
-        key = f"location:name:{street_name}"
-        data = self.client.hgetall(key)
-        
-        if data:
-            return {
-                'location_id': data['location_id'],
-                'street_name': data['street_name'],
-                'city': data['city'],
-                'latitude': float(data['latitude']),
-                'longitude': float(data['longitude']),
-                'geo_shape': json.loads(data['geo_shape']) if data.get('geo_shape') else {}
-            }
-        return None
+        return self.get_reference_data().location_by_street(street_name)
     
     def get_location_by_id(self, location_id: str) -> Optional[Dict]:
         """Holt Standort-Informationen nach ID"""
-        key = f"location:id:{location_id}"
-        data = self.client.hgetall(key)
-        
-        if data:
-            return {
-                'location_id': data['location_id'],
-                'street_name': data['street_name'],
-                'city': data['city'],
-                'latitude': float(data['latitude']),
-                'longitude': float(data['longitude']),
-                'geo_shape': json.loads(data['geo_shape']) if data.get('geo_shape') else {}
-            }
-        return None
+        return self.get_reference_data().location_by_id(location_id)
     
     def get_all_locations(self) -> List[Dict]:
-        """Holt alle Zählstationen"""
-        street_names = self.client.smembers('locations:all_streets')
-        locations = []
-        
-        for street in street_names:
-            location = self.get_location_by_street(street)
-            if location:
-                locations.append(location)
-        
-        return locations
+        """Holt alle Zählstationen (aus dem Stammdaten-Snapshot)"""
+        return list(self.get_reference_data().locations)
 
-    def _get_range_via_index(self, street: str, start_date: str, end_date: str) -> List[Dict]:
-        """Schnelle Methode mit Index"""
-        index_key = f"pedestrian:index:{street}"
-        start_ts = datetime.fromisoformat(f"{start_date}T00:00:00").timestamp()
-        end_ts = datetime.fromisoformat(f"{end_date}T23:59:59").timestamp()
-        
-        keys = self.client.zrangebyscore(index_key, start_ts, end_ts)
-        
-        if not keys:
-            return []
-        
-        pipe = self.client.pipeline()
-        for key in keys:
-            pipe.hgetall(key)
-        
-        results = pipe.execute()
-        return sorted([r for r in results if r], key=lambda x: (x.get('date', ''), int(x.get('hour', 0))))
+    def get_lecture_periods(self) -> List[Dict]:
+        """Vorlesungszeiten (lecture:period:*), nach Beginn sortiert"""
+        return list(self.get_reference_data().lecture_periods)
 
-    def _get_range_via_scan(self, street: str, start_date: str, end_date: str) -> List[Dict]:
-        """Fallback mit SCAN"""
-        # Wie oben in Optimierung 1
-        ...
+    def get_event_periods(self) -> List[Dict]:
+        """Event-Zeiträume (event:detail:{start}_{end}), nach Beginn sortiert"""
+        return list(self.get_reference_data().event_periods)
+
+    # ============================================
+    # STAMMDATEN-SNAPSHOT
+    # ============================================
+
+    def get_reference_data(self) -> ReferenceSnapshot:
+        """
+        Stammdaten aus dem Speicher (siehe database/reference_data.py). Prüft
+        höchstens alle REFERENCE_CHECK_INTERVAL Sekunden den Versions-Hash und
+        lädt nur nach einem Import neu.
+        """
+        cache = self.reference_cache
+        if cache.needs_check():
+            with self._read_scope():
+                versions = parse_reference_versions(self.reader.hmget(REFERENCE_VERSION_KEY, *REFERENCE_DATASETS))
+                if not cache.is_current(versions):
+                    cache.install(self._load_reference_snapshot(versions))
+        return cache.snapshot
+
+    def _load_reference_snapshot(self, versions) -> ReferenceSnapshot:
+        reader = self.reader
+        streets = sorted(reader.smembers('locations:all_streets'))
+        source_keys = {
+            name: reference_source_keys(name, list(reader.scan_iter(match=pattern, count=1000)))
+            for name, pattern in REFERENCE_SOURCES
+        }
+        pipe = reader.pipeline(transaction=False)
+        queue_reference_load(pipe, streets, source_keys)
+        return build_reference_snapshot(versions, streets, source_keys, pipe.execute() if len(pipe) else [])
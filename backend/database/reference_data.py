@@ -0,0 +1,103 @@
+# backend/database/reference_data.py
+"""
+In-Process-Snapshot der Stammdaten: Zählstationen, Feiertage, Schulferien-,
+Vorlesungs- und Event-Perioden.
+
+Die Daten ändern sich nur, wenn ein Import-Skript läuft (etwa einmal im Jahr).
+Der Client lädt sie einmal komplett und beantwortet danach alle Anfragen aus
+dem Speicher. Jedes Import-Skript zählt nach dem Schreiben sein Feld im
+Versions-Hash ``reference:version`` hoch (``bump_reference_version``); der
+Client prüft diesen Hash höchstens alle ``check_interval`` Sekunden per HMGET
+und lädt bei einer Änderung einen neuen Snapshot.
+
+Ein Snapshot wird nach dem Laden nicht mehr verändert und beim Neuladen als
+Ganzes ersetzt. Die enthaltenen Dicts sind geteilt und dürfen nicht verändert
+werden.
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+
+REFERENCE_VERSION_KEY = 'reference:version'
+REFERENCE_DATASETS = ('locations', 'holidays', 'school_holidays', 'lectures', 'events')
+
+# Quellen der Snapshot-Listen (SCAN-Patterns)
+SCHOOL_HOLIDAY_PERIOD_PATTERN = 'school_holiday:period:*'
+PUBLIC_HOLIDAY_PATTERN = 'holiday:*'
+LECTURE_PERIOD_PATTERN = 'lecture:period:*'
+# event:detail:{start}_{end}; Stunden/Tage (event:detail:hour:..., event:detail:day:...) ausgenommen
+EVENT_PERIOD_PATTERN = 'event:detail:*'
+
+
+def bump_reference_version(r, dataset: str):
+    """Nach einem Import aufrufen: laufende Clients laden ihren Snapshot neu"""
+    if dataset not in REFERENCE_DATASETS:
+        raise ValueError(f"Unknown reference dataset: {dataset}")
+    r.hincrby(REFERENCE_VERSION_KEY, dataset, 1)
+
+
+def parse_reference_versions(reply: List) -> Tuple[int, ...]:
+    """HMGET-Antwort über REFERENCE_DATASETS in ein Versions-Tupel umwandeln"""
+    return tuple(int(v) if v else 0 for v in reply)
+
+
+def is_event_period_key(key: str) -> bool:
+    return len(key.split(':')) == 3
+
+
+class ReferenceSnapshot:
+    """Unveränderlicher Stand der Stammdaten zu ``versions``"""
+
+    def __init__(self, versions: Tuple[int, ...], locations: List[Dict], public_holidays: List[Dict],
+                 school_holiday_periods: List[Dict], lecture_periods: List[Dict], event_periods: List[Dict]):
+        self.versions = versions
+        self.loaded_at = time.time()
+        self.locations = tuple(locations)
+        self.public_holidays = tuple(public_holidays)
+        self.school_holiday_periods = tuple(sorted(school_holiday_periods, key=lambda p: p.get('start_date', '')))
+        self.lecture_periods = tuple(sorted(lecture_periods, key=lambda p: p.get('start_date', '')))
+        self.event_periods = tuple(sorted(event_periods, key=lambda p: p.get('start', '')))
+        self._by_street = {loc['street_name']: loc for loc in self.locations}
+        self._by_id = {loc['location_id']: loc for loc in self.locations}
+
+    def location_by_street(self, street_name: str) -> Optional[Dict]:
+        return self._by_street.get(street_name)
+
+    def location_by_id(self, location_id: str) -> Optional[Dict]:
+        return self._by_id.get(location_id)
+
+    def stats(self) -> Dict:
+        return {
+            'versions': dict(zip(REFERENCE_DATASETS, self.versions)),
+            'loaded_at': self.loaded_at,
+            'locations': len(self.locations),
+            'public_holidays': len(self.public_holidays),
+            'school_holiday_periods': len(self.school_holiday_periods),
+            'lecture_periods': len(self.lecture_periods),
+            'event_periods': len(self.event_periods),
+        }
+
+
+class ReferenceCache:
+    """Aktueller Snapshot und Zeitpunkt der letzten Versionsprüfung"""
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self.snapshot: Optional[ReferenceSnapshot] = None
+        self._checked_at = 0.0
+        self.reloads = 0
+
+    def needs_check(self) -> bool:
+        return self.snapshot is None or time.monotonic() - self._checked_at >= self.check_interval
+
+    def is_current(self, versions: Tuple[int, ...]) -> bool:
+        """Versionen geprüft; True, wenn der Snapshot noch gilt"""
+        current = self.snapshot is not None and self.snapshot.versions == versions
+        if current:
+            self._checked_at = time.monotonic()
+        return current
+
+    def install(self, snapshot: ReferenceSnapshot) -> ReferenceSnapshot:
+        self.snapshot = snapshot
+        self._checked_at = time.monotonic()
+        self.reloads += 1
+        return snapshot
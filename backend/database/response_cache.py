@@ -0,0 +1,95 @@
+# backend/database/response_cache.py
+"""
+Redis-Cache für fertig serialisierte API-Antworten (Vorhersage-Endpoints).
+
+Der Key enthält die Versionszähler der Daten (siehe api/conditional.py): eine
+neue Vorhersage-Generation zählt ``predictions`` hoch, ab dann zeigen alle
+Anfragen auf neue Keys. Alte Einträge werden nie mehr gelesen und laufen über
+die TTL ab; es gibt kein Löschen und kein Fenster mit halb invalidiertem Cache.
+
+Gleiche Fehlzugriffe werden zusammengefasst:
+
+- im Prozess wartet jede weitere Anfrage auf dieselbe laufende Berechnung
+- prozessübergreifend (mehrere Worker) rechnet nur, wer den Lock
+  (``SET NX``) bekommt; die anderen warten bis ``lock_ttl`` auf den Eintrag
+  und rechnen erst danach selbst.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from database.keys import city_key
+
+
+class ResponseCache:
+    """Antwort-Bytes unter ``{prefix}:{digest}`` mit TTL und Request-Coalescing"""
+
+    def __init__(self, client, prefix: str, ttl: int, lock_ttl: float = 10.0, poll_interval: float = 0.05):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'waited': 0}
+
+    def key(self, digest: str) -> str:
+        return f"{city_key(self.prefix)}:{digest}"
+
+    async def get_or_compute(self, digest: str, compute: Callable[[], Awaitable[bytes]]) -> Tuple[bytes, str]:
+        """(Antwort, Quelle) mit Quelle hit | computed | coalesced | waited"""
+        key = self.key(digest)
+        body = await self.client.get(key)
+        if body is not None:
+            self.counters['hits'] += 1
+            return body, 'hit'
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.counters['coalesced'] += 1
+            return await asyncio.shield(inflight), 'coalesced'
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body, source = await self._fill(key, compute)
+            future.set_result(body)
+            return body, source
+        except BaseException as e:
+            future.set_exception(e)
+            # Ohne wartende Anfragen nicht als "never retrieved" melden
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _fill(self, key: str, compute: Callable[[], Awaitable[bytes]]) -> Tuple[bytes, str]:
+        lock_key = f"{key}:lock"
+        locked = await self.client.set(lock_key, 1, nx=True, px=int(self.lock_ttl * 1000))
+        if not locked:
+            body = await self._wait_for(key)
+            if body is not None:
+                self.counters['waited'] += 1
+                return body, 'waited'
+
+        self.counters['misses'] += 1
+        try:
+            body = await compute()
+            await self.client.set(key, body, ex=self.ttl)
+        finally:
+            if locked:
+                await self.client.delete(lock_key)
+        return body, 'computed'
+
+    async def _wait_for(self, key: str) -> Optional[bytes]:
+        """Anderer Worker rechnet: Eintrag abwarten (None nach lock_ttl)"""
+        deadline = time.monotonic() + self.lock_ttl
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            body = await self.client.get(key)
+            if body is not None:
+                return body
+        return None
+
+    def stats(self) -> Dict:
+        return {'ttl': self.ttl, 'inflight': len(self._inflight), **self.counters}
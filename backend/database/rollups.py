@@ -0,0 +1,312 @@
+# backend/database/rollups.py
+"""
+Hilfsfunktionen für aggregierte Zeiträume (Tag, ISO-Woche, Monat).
+
+Gepflegte Rollups (``pedestrian:rollup:{granularity}:{street}:{period}``):
+Der Tages-Hash enthält neben den Summen jede Stunde als Feld ``hHH`` mit
+``"gesamt,towards,away,temperatur"``. Beim erneuten Schreiben einer Stunde
+ergibt sich das Delta aus altem und neuem Feld; Wochen und Monate werden
+nur um dieses Delta erhöht. ``ROLLUP_UPDATE_LUA`` wendet das pro Tag atomar
+an, damit gleichzeitige Schreiber (Scheduler, Import) kein Delta verlieren.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from database.keys import street_tag
+
+GRANULARITIES = ('day', 'week', 'month')
+
+
+def period_key(date: str, granularity: str) -> str:
+    """Zeitraum-Schlüssel für ein Datum: 2024-03-05 / 2024-W10 / 2024-03"""
+    if granularity == 'day':
+        return date
+    if granularity == 'week':
+        year, week, _ = datetime.strptime(date, '%Y-%m-%d').isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == 'month':
+        return date[:7]
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def period_start(date: str, granularity: str) -> str:
+    """Erster Tag des Zeitraums, in dem ``date`` liegt"""
+    if granularity == 'day':
+        return date
+    if granularity == 'week':
+        dt = datetime.strptime(date, '%Y-%m-%d')
+        return (dt - timedelta(days=dt.weekday())).strftime('%Y-%m-%d')
+    if granularity == 'month':
+        return f"{date[:7]}-01"
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def empty_rollup(period: str, start: str) -> Dict:
+    return {
+        'period': period,
+        'start': start,
+        'total': 0,
+        'towards': 0,
+        'away': 0,
+        'hours': 0,
+        'peak_value': None,
+        'peak_hour': None,
+        'avg_temperature': None,
+    }
+
+
+def aggregate_records(records: List[Dict], granularity: str) -> List[Dict]:
+    """Aggregiert stündliche Datensätze (Hash-Format) clientseitig"""
+    rollups = {}
+    temperatures = {}
+
+    for record in records:
+        date = record.get('date')
+        if not date:
+            continue
+        period = period_key(date, granularity)
+        rollup = rollups.get(period)
+        if rollup is None:
+            rollup = rollups[period] = empty_rollup(period, period_start(date, granularity))
+            temperatures[period] = [0.0, 0]
+
+        count = int(float(record.get('n_pedestrians') or 0))
+        rollup['total'] += count
+        rollup['towards'] += int(float(record.get('n_pedestrians_towards') or 0))
+        rollup['away'] += int(float(record.get('n_pedestrians_away') or 0))
+        rollup['hours'] += 1
+        if rollup['peak_value'] is None or count > rollup['peak_value']:
+            rollup['peak_value'] = count
+            rollup['peak_hour'] = f"{date}T{int(record.get('hour', 0)):02d}:00:00"
+
+        if record.get('temperature') not in (None, ''):
+            temperatures[period][0] += float(record['temperature'])
+            temperatures[period][1] += 1
+
+    for period, (temp_sum, temp_count) in temperatures.items():
+        if temp_count:
+            rollups[period]['avg_temperature'] = round(temp_sum / temp_count, 2)
+
+    return [rollups[p] for p in sorted(rollups)]
+
+
+def merge_rollups(daily: List[Dict], granularity: str,
+                  temperature_sums: Optional[Dict[str, tuple]] = None) -> List[Dict]:
+    """
+    Fasst Tageswerte zu Wochen/Monaten zusammen.
+    ``temperature_sums`` bildet ``day -> (summe, anzahl)`` ab, damit der
+    Temperaturmittelwert korrekt gewichtet wird.
+    """
+    if granularity == 'day':
+        return daily
+
+    rollups = {}
+    temperatures = {}
+    for day in daily:
+        period = period_key(day['period'], granularity)
+        rollup = rollups.get(period)
+        if rollup is None:
+            rollup = rollups[period] = empty_rollup(period, period_start(day['period'], granularity))
+            temperatures[period] = [0.0, 0]
+
+        rollup['total'] += day['total']
+        rollup['towards'] += day['towards']
+        rollup['away'] += day['away']
+        rollup['hours'] += day['hours']
+        if day['peak_value'] is not None and (
+                rollup['peak_value'] is None or day['peak_value'] > rollup['peak_value']):
+            rollup['peak_value'] = day['peak_value']
+            rollup['peak_hour'] = day.get('peak_hour')
+
+        if temperature_sums and day['period'] in temperature_sums:
+            temp_sum, temp_count = temperature_sums[day['period']]
+            temperatures[period][0] += temp_sum
+            temperatures[period][1] += temp_count
+
+    for period, (temp_sum, temp_count) in temperatures.items():
+        if temp_count:
+            rollups[period]['avg_temperature'] = round(temp_sum / temp_count, 2)
+
+    return [rollups[p] for p in sorted(rollups)]
+
+
+# ============================================
+# GEPFLEGTE ROLLUPS
+# ============================================
+
+# KEYS: Tag, Tages-Index, Woche, Wochen-Index, Monat, Monats-Index,
+#       Tages-Hashes der Woche, Tages-Hashes des Monats
+# ARGV: date, ttl, Tages-Score, week, week_start, Wochen-Score, month,
+#       month_start, Monats-Score, Anzahl Wochentage, dann Feld/Wert je Stunde
+# Summen der Woche/des Monats werden um das Delta erhöht; ändert sich der
+# Tages-Peak, wird der Peak beider Zeiträume aus den Tages-Hashes bestimmt.
+ROLLUP_UPDATE_LUA = """
+local function summarize(fields)
+    local s = {total = 0, towards = 0, away = 0, hours = 0, temp_sum = 0, temp_count = 0,
+               peak_value = false, peak_field = false}
+    local names = {}
+    for field in pairs(fields) do
+        if string.match(field, '^h%d%d$') then
+            table.insert(names, field)
+        end
+    end
+    table.sort(names)
+    for _, field in ipairs(names) do
+        local total, towards, away, temperature = string.match(fields[field], '^(-?%d+),(-?%d+),(-?%d+),(.*)$')
+        total = tonumber(total)
+        s.total = s.total + total
+        s.towards = s.towards + tonumber(towards)
+        s.away = s.away + tonumber(away)
+        s.hours = s.hours + 1
+        if not s.peak_value or total > s.peak_value then
+            s.peak_value, s.peak_field = total, field
+        end
+        if temperature ~= '' then
+            s.temp_sum = s.temp_sum + tonumber(temperature)
+            s.temp_count = s.temp_count + 1
+        end
+    end
+    return s
+end
+
+local function period_peak(key, first, last)
+    local best_value, best_hour = false, false
+    for i = first, last do
+        local v = redis.call('HMGET', KEYS[i], 'peak_value', 'peak_hour')
+        local value = tonumber(v[1])
+        if value and (not best_value or value > best_value) then
+            best_value, best_hour = value, v[2]
+        end
+    end
+    if best_value then
+        redis.call('HSET', key, 'peak_value', best_value, 'peak_hour', best_hour)
+    end
+end
+
+local date, ttl = ARGV[1], tonumber(ARGV[2])
+local fields = {}
+local flat = redis.call('HGETALL', KEYS[1])
+for i = 1, #flat, 2 do
+    fields[flat[i]] = flat[i + 1]
+end
+local old = summarize(fields)
+local updates = {}
+for i = 11, #ARGV, 2 do
+    fields[ARGV[i]] = ARGV[i + 1]
+    table.insert(updates, ARGV[i])
+    table.insert(updates, ARGV[i + 1])
+end
+local new = summarize(fields)
+local peak_hour = new.peak_field and (date .. 'T' .. string.sub(new.peak_field, 2) .. ':00:00') or ''
+
+redis.call('HSET', KEYS[1], 'start', date, 'total', new.total, 'towards', new.towards, 'away', new.away,
+           'hours', new.hours, 'temp_sum', tostring(new.temp_sum), 'temp_count', new.temp_count,
+           'peak_value', new.peak_value or '', 'peak_hour', peak_hour, unpack(updates))
+redis.call('ZADD', KEYS[2], ARGV[3], date)
+
+local week_days = tonumber(ARGV[10])
+local periods = {
+    {KEYS[3], KEYS[4], ARGV[4], ARGV[5], ARGV[6], 7, 6 + week_days},
+    {KEYS[5], KEYS[6], ARGV[7], ARGV[8], ARGV[9], 7 + week_days, #KEYS},
+}
+local peak_changed = new.peak_value ~= old.peak_value or new.peak_field ~= old.peak_field
+for _, p in ipairs(periods) do
+    local key = p[1]
+    for _, field in ipairs({'total', 'towards', 'away', 'hours', 'temp_count'}) do
+        if new[field] ~= old[field] then
+            redis.call('HINCRBY', key, field, new[field] - old[field])
+        end
+    end
+    if new.temp_sum ~= old.temp_sum then
+        redis.call('HINCRBYFLOAT', key, 'temp_sum', tostring(new.temp_sum - old.temp_sum))
+    end
+    redis.call('HSET', key, 'start', p[4])
+    if peak_changed then
+        period_peak(key, p[6], p[7])
+    end
+    redis.call('ZADD', p[2], p[5], p[3])
+end
+
+if ttl > 0 then
+    for i = 1, 6 do
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return new.total
+"""
+
+
+def rollup_key(street: str, granularity: str, period: str) -> str:
+    return f"pedestrian:rollup:{granularity}:{street_tag(street)}:{period}"
+
+
+def rollup_index_key(street: str, granularity: str) -> str:
+    return f"pedestrian:rollup:index:{granularity}:{street_tag(street)}"
+
+
+def period_dates(period_start_date: str, granularity: str) -> List[str]:
+    """Alle Tage eines Zeitraums"""
+    start = datetime.strptime(period_start_date, '%Y-%m-%d')
+    if granularity == 'day':
+        return [period_start_date]
+    if granularity == 'week':
+        return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
+    dates = []
+    current = start
+    while current.month == start.month:
+        dates.append(current.strftime('%Y-%m-%d'))
+        current += timedelta(days=1)
+    return dates
+
+
+def rollup_update_call(street: str, date: str, hours: Dict[str, str], ttl: int):
+    """KEYS und ARGV für ROLLUP_UPDATE_LUA (ein Tag, beliebig viele Stunden)"""
+    week, month = period_key(date, 'week'), period_key(date, 'month')
+    week_start, month_start = period_start(date, 'week'), period_start(date, 'month')
+    week_days, month_days = period_dates(week_start, 'week'), period_dates(month_start, 'month')
+
+    def score(day):
+        return datetime.fromisoformat(f"{day}T00:00:00").timestamp()
+
+    keys = [
+        rollup_key(street, 'day', date), rollup_index_key(street, 'day'),
+        rollup_key(street, 'week', week), rollup_index_key(street, 'week'),
+        rollup_key(street, 'month', month), rollup_index_key(street, 'month'),
+        *(rollup_key(street, 'day', day) for day in week_days),
+        *(rollup_key(street, 'day', day) for day in month_days),
+    ]
+    args = [date, ttl, score(date), week, week_start, score(week_start),
+            month, month_start, score(month_start), len(week_days)]
+    for field, value in sorted(hours.items()):
+        args += [field, value]
+    return keys, args
+
+
+def hour_field(hour) -> str:
+    return f"h{int(hour):02d}"
+
+
+def encode_hour_value(data: Dict) -> str:
+    """Stundenwerte eines Datensatzes als kompaktes Feld im Tages-Hash"""
+    values = [
+        int(float(data.get(field) or 0))
+        for field in ('n_pedestrians', 'n_pedestrians_towards', 'n_pedestrians_away')
+    ]
+    temperature = data.get('temperature')
+    return ','.join(map(str, values)) + ',' + (str(temperature) if temperature not in (None, '') else '')
+
+
+def parse_rollup(period: str, data: Dict) -> Dict:
+    """Gespeicherten Rollup-Hash in das Format von ``empty_rollup`` umwandeln"""
+    temp_count = int(data.get('temp_count') or 0)
+    return {
+        'period': period,
+        'start': data.get('start', period),
+        'total': int(data.get('total') or 0),
+        'towards': int(data.get('towards') or 0),
+        'away': int(data.get('away') or 0),
+        'hours': int(data.get('hours') or 0),
+        'peak_value': int(data['peak_value']) if data.get('peak_value') else None,
+        'peak_hour': data.get('peak_hour') or None,
+        'avg_temperature': round(float(data['temp_sum']) / temp_count, 2) if temp_count else None,
+    }
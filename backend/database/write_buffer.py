@@ -0,0 +1,126 @@
+# backend/database/write_buffer.py
+"""
+Schreibpuffer für einzeln eintreffende Stunden und Vorhersagen.
+
+``store_hourly_data`` kostet pro Stunde mehrere Round-Trips (Daten, Index,
+TTLs, Rollups, Version). ``BufferedWriter`` sammelt die Schreibzugriffe und
+schreibt sie gesammelt: im hash-Backend Daten, Index-Einträge, Versionen und
+Vorhersagen aller Straßen in einer Pipeline ohne MULTI, danach die Rollups pro
+Straße (Delta atomar per Lua, siehe ``_update_rollups``). packed/timeseries gehen
+pro Straße über ``bulk_store_hourly_data``.
+
+Geflusht wird bei ``max_records`` gepufferten Einträgen, beim nächsten
+Schreibzugriff nach ``max_delay`` Sekunden und beim Verlassen des ``with``-
+Blocks. Es gibt keinen Hintergrund-Thread: ein ruhender Puffer wird erst beim
+nächsten Zugriff, per ``flush()`` oder am Blockende geschrieben.
+
+Mehrfache Schreibzugriffe auf dieselbe Stunde innerhalb eines Flushs werden
+zusammengeführt (spätere Felder gewinnen, wie bei HSET).
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class BufferedWriter:
+    """Puffer vor einem PedestrianRedisClient; Statistik pro Flush in ``last_flush``"""
+
+    def __init__(self, client, max_records: int = 500, max_delay: float = 1.0,
+                 prediction_ttl: int = 60*60*24*9, on_flush: Optional[Callable[[Dict], None]] = None):
+        self.client = client
+        self.max_records = max_records
+        self.max_delay = max_delay
+        self.prediction_ttl = prediction_ttl
+        self.on_flush = on_flush
+        self._hours = {}
+        self._predictions = {}
+        self._duplicates = 0
+        self._first_write = None
+        self.last_flush = None
+        self.totals = {'flushes': 0, 'records': 0, 'predictions': 0, 'duplicates': 0, 'seconds': 0.0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Bereits angenommene Einträge auch bei Fehlern im Block schreiben
+        self.flush('exit')
+        return False
+
+    @property
+    def pending(self) -> int:
+        return len(self._hours) + len(self._predictions)
+
+    def store_hourly_data(self, street: str, data: Dict):
+        self._add(self._hours, (street, data['date'], str(data['hour'])), data)
+
+    def store_predictions(self, predictions: List[Dict]):
+        for data in predictions:
+            self._add(self._predictions, (data['street'], data['date'], str(data['hour'])), data)
+
+    def _add(self, buffer: Dict, key, data: Dict):
+        if self._first_write is None:
+            self._first_write = time.monotonic()
+
+        previous = buffer.get(key)
+        if previous is not None:
+            self._duplicates += 1
+            data = {**previous, **data}
+        buffer[key] = data
+
+        if self.pending >= self.max_records:
+            self.flush('size')
+        elif time.monotonic() - self._first_write >= self.max_delay:
+            self.flush('time')
+
+    def flush(self, reason: str = 'manual') -> Optional[Dict]:
+        """Schreibt den Puffer; liefert die Statistik dieses Flushs (None, wenn leer)"""
+        if not self.pending:
+            return None
+
+        hours, predictions, duplicates = self._hours, self._predictions, self._duplicates
+        self._hours, self._predictions, self._duplicates = {}, {}, 0
+        self._first_write = None
+
+        by_street = {}
+        for (street, _, _), data in hours.items():
+            by_street.setdefault(street, []).append(data)
+
+        start = time.perf_counter()
+        client = self.client
+        pipe = client.client.pipeline(transaction=False)
+        if client.storage_backend == 'hash':
+            for street, data_list in by_street.items():
+                client._queue_hashes(pipe, street, data_list)
+                client._queue_version_bump(pipe, street, {data['date'] for data in data_list}, data_list)
+        if predictions:
+            client._queue_predictions(pipe, list(predictions.values()), self.prediction_ttl)
+        commands = len(pipe)
+        if commands:
+            pipe.execute()
+
+        for street, data_list in by_street.items():
+            if client.storage_backend == 'hash':
+                client._update_rollups(street, data_list)
+                if client.day_cache is not None:
+                    client.day_cache.invalidate(street, {data['date'] for data in data_list})
+            else:
+                client.bulk_store_hourly_data(street, data_list)
+        seconds = time.perf_counter() - start
+
+        stats = {
+            'reason': reason,
+            'records': len(hours),
+            'predictions': len(predictions),
+            'duplicates': duplicates,
+            'streets': len(by_street),
+            'commands': commands,
+            'seconds': seconds,
+            'records_per_second': (len(hours) + len(predictions)) / seconds if seconds else None,
+        }
+        self.last_flush = stats
+        self.totals['flushes'] += 1
+        for field in ('records', 'predictions', 'duplicates', 'seconds'):
+            self.totals[field] += stats[field]
+        if self.on_flush is not None:
+            self.on_flush(stats)
+        return stats
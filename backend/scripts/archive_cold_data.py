@@ -0,0 +1,68 @@
+# backend/scripts/archive_cold_data.py
+import sys
+sys.path.append('/app')
+
+from datetime import datetime, timedelta
+import config
+from database.redis_client import PedestrianRedisClient
+
+def archive_cold_data(streets: list[str] | None = None, older_than_days: int | None = None,
+                      codec: str | None = None):
+    """Archiviert alle Monate, die vollständig älter als ``older_than_days`` sind.
+
+    Pro Straße und Monat entsteht ein komprimierter Wert; die stündlichen
+    Hashes, Tages-Blöcke bzw. Zeitreihen-Samples des Monats werden entfernt.
+    Kann regelmäßig laufen: bereits archivierte Monate ohne neue Live-Daten
+    werden übersprungen.
+    """
+    # Liest die eigenen Schreibzugriffe: ohne Read-Replicas
+    client = PedestrianRedisClient(host=config.REDIS_HOST, port=config.REDIS_PORT, replicas=[])
+    older_than_days = older_than_days if older_than_days is not None else config.ARCHIVE_AFTER_DAYS
+    codec = codec or config.ARCHIVE_COMPRESSION
+
+    if streets is None:
+        streets = ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]
+
+    # Letzter Monat, der komplett vor dem Stichtag endet
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    last_month = (cutoff.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+    print("="*70)
+    print(f"Archiving months up to {last_month} ({codec})")
+    print("="*70)
+
+    for street in streets:
+        bounds, _ = client._range_context(street)
+        if bounds is None:
+            print(f"\n{street}: no records, skipping")
+            continue
+
+        print(f"\nProcessing {street}...")
+        archived = set(client.get_archived_months(street))
+        months = 0
+        hours = 0
+
+        month = datetime.strptime(bounds[0][:7] + "-01", "%Y-%m-%d")
+        while month.strftime("%Y-%m") <= last_month:
+            name = month.strftime("%Y-%m")
+            next_month = (month + timedelta(days=32)).replace(day=1)
+            month_end = (next_month - timedelta(days=1)).strftime("%Y-%m-%d")
+
+            # Archivierte Monate nur anfassen, wenn dort wieder Live-Daten liegen
+            if name not in archived or client._fetch_live_range(street, f"{name}-01", month_end):
+                count = client.archive_month(street, name, codec)
+                if count:
+                    months += 1
+                    hours += count
+                    print(f"  → {name}: {count} hours archived")
+            month = next_month
+
+        print(f"✓ Completed {street}: {months} months, {hours} hours")
+
+    print("\n" + "="*70)
+    print("Archiving completed!")
+    print("="*70)
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    archive_cold_data(older_than_days=days)
@@ -0,0 +1,127 @@
+# backend/scripts/benchmark_cluster.py
+import sys
+sys.path.append('/app')
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import config
+from database.keys import hourly_index_key
+from database.redis_client import PedestrianRedisClient
+from scripts.benchmark_storage import generate_records
+
+# Beide Ziele mit gleichem Key-Schema messen
+config.KEY_SCHEME = 'tagged'
+
+STREETS = [f"Benchmarkstraße {i}" for i in range(12)]
+
+def cleanup(client: PedestrianRedisClient):
+    for street in STREETS:
+        for key in client.client.scan_iter(match=f"*{{{street}}}*", count=1000):
+            client.client.delete(key)
+        client._ts_streets.discard(street)
+
+def load(client: PedestrianRedisClient, days: int) -> float:
+    start = time.perf_counter()
+    for street in STREETS:
+        records = generate_records(days, street=street)
+        for offset in range(0, len(records), 500):
+            client.bulk_store_hourly_data(street, records[offset:offset + 500])
+    return time.perf_counter() - start
+
+def read_throughput(client: PedestrianRedisClient, days: int, window_days: int,
+                    workers: int, duration: float) -> dict:
+    """Zufällige Zeitfenster über alle Straßen, parallel aus ``workers`` Threads"""
+    first = datetime.strptime("2022-01-01", "%Y-%m-%d")
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        latencies, records = [], 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            street = rng.choice(STREETS)
+            start = first + timedelta(days=rng.randrange(max(1, days - window_days)))
+            end = start + timedelta(days=window_days - 1)
+            t0 = time.perf_counter()
+            records += len(client.get_historical_range(
+                street, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")))
+            latencies.append((time.perf_counter() - t0) * 1000)
+        return latencies, records
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(worker, range(workers)))
+
+    latencies = sorted(l for result in results for l in result[0])
+    return {
+        'queries': len(latencies) / duration,
+        'records': sum(result[1] for result in results) / duration,
+        'p50': latencies[len(latencies) // 2] if latencies else 0,
+        'p95': latencies[int(len(latencies) * 0.95)] if latencies else 0,
+    }
+
+def slot_distribution(client: PedestrianRedisClient) -> dict:
+    """Straßen pro Cluster-Knoten (über den Slot des Index-Keys)"""
+    nodes = {}
+    for street in STREETS:
+        node = client.client.get_node_from_key(hourly_index_key(street))
+        nodes.setdefault(f"{node.host}:{node.port}", []).append(street)
+    return nodes
+
+def run_benchmark(targets: list[tuple[str, int, bool]], backend: str = 'hash', days: int = 365,
+                  window_days: int = 30, workers: int = 16, duration: float = 10.0):
+    """Range-Lesedurchsatz: lokaler Redis Cluster gegen Einzelknoten.
+
+    Lokaler Cluster mit drei Primaries (Redis Stack, damit auch RedisTimeSeries läuft):
+
+        for port in 7000 7001 7002; do
+            redis-stack-server --port $port --cluster-enabled yes \\
+                --cluster-config-file nodes-$port.conf --daemonize yes
+        done
+        redis-cli --cluster create 127.0.0.1:7000 127.0.0.1:7001 127.0.0.1:7002 --cluster-replicas 0
+
+    Aufruf: python scripts/benchmark_cluster.py 127.0.0.1:7000 [127.0.0.1:6379] [--backend=hash]
+    """
+    print("=" * 70)
+    print(f"Cluster benchmark: {len(STREETS)} streets × {days} days, "
+          f"{window_days}-day windows, {workers} threads, backend {backend}")
+    print("=" * 70)
+
+    results = []
+    for host, port, cluster in targets:
+        client = PedestrianRedisClient(host=host, port=port, storage_backend=backend, cluster=cluster, replicas=[])
+        # Redis-Zugriffe messen, nicht den Day-Cache
+        client.day_cache = None
+        cleanup(client)
+
+        label = f"{'cluster' if cluster else 'single'} {host}:{port}"
+        write_s = load(client, days)
+        if cluster:
+            for node, streets in sorted(slot_distribution(client).items()):
+                print(f"  {node}: {len(streets)} streets")
+
+        stats = read_throughput(client, days, window_days, workers, duration)
+        results.append((label, write_s, stats))
+        cleanup(client)
+
+    print(f"\n{'target':28s} {'load':>8s} {'queries/s':>10s} {'records/s':>12s} {'p50':>8s} {'p95':>8s}")
+    for label, write_s, stats in results:
+        print(f"{label:28s} {write_s:6.1f}s {stats['queries']:10.1f} {stats['records']:12.0f} "
+              f"{stats['p50']:6.1f}ms {stats['p95']:6.1f}ms")
+
+if __name__ == "__main__":
+    addresses = [arg for arg in sys.argv[1:] if not arg.startswith('--')] or ["127.0.0.1:7000"]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+
+    # Erste Adresse: Cluster-Startknoten, weitere: Einzelknoten zum Vergleich
+    targets = []
+    for i, address in enumerate(addresses):
+        host, _, port = address.partition(':')
+        targets.append((host, int(port or 6379), i == 0))
+
+    run_benchmark(
+        targets,
+        backend=options.get('backend', 'hash'),
+        days=int(options.get('days', 365)),
+        workers=int(options.get('workers', 16))
+    )
@@ -0,0 +1,98 @@
+# backend/scripts/benchmark_record_codec.py
+import sys
+sys.path.append('/app')
+
+import time
+from datetime import datetime, timedelta
+import config
+from database.encoding import encode_record, decode_record
+from database.keys import hourly_pattern, record_pattern
+from database.redis_client import PedestrianRedisClient
+from scripts.benchmark_storage import BENCH_STREET, generate_records, cleanup, timed
+
+PATTERNS = {'hash': hourly_pattern, 'struct': record_pattern}
+
+def decode_hash(raw: dict) -> dict:
+    """HGETALL (Bytes) -> dieselben Strings wie decode_record"""
+    return {k.decode(): v.decode() for k, v in raw.items()}
+
+def record_memory(client: PedestrianRedisClient, codec: str) -> tuple[int, int]:
+    """(Bytes, Anzahl) über MEMORY USAGE aller Stunden-Keys (ohne Index)"""
+    keys = list(client.client.scan_iter(match=PATTERNS[codec](BENCH_STREET), count=1000))
+    pipe = client.client.pipeline(transaction=False)
+    for key in keys:
+        pipe.memory_usage(key)
+    return sum(size or 0 for size in pipe.execute()), len(keys)
+
+def decode_throughput(client: PedestrianRedisClient, codec: str) -> tuple[float, float]:
+    """Lesen + Dekodieren aller Stunden (Pipeline): (Datensätze/s gesamt, Datensätze/s nur Dekodieren)"""
+    keys = list(client.client.scan_iter(match=PATTERNS[codec](BENCH_STREET), count=1000))
+
+    def fetch():
+        pipe = client.binary_client.pipeline(transaction=False)
+        for key in keys:
+            if codec == 'struct':
+                pipe.get(key)
+            else:
+                pipe.hgetall(key)
+        return pipe.execute()
+
+    decode = decode_record if codec == 'struct' else decode_hash
+    replies = fetch()
+    decode_ms = timed(lambda: [decode(raw) for raw in replies])
+    total_ms = timed(lambda: [decode(raw) for raw in fetch()], repeat=3)
+    return len(keys) / total_ms * 1000, len(keys) / decode_ms * 1000
+
+def run_benchmark(days: int = 365):
+    """Hash-Format gegen Record-Codec (RECORD_CODEC=struct) im hash-Backend.
+
+    Aufruf: python scripts/benchmark_record_codec.py [days]
+    """
+    records = generate_records(days)
+    start_date = records[0]['date']
+    month_end = (datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=30)).strftime("%Y-%m-%d")
+    sizes = [len(encode_record(record)) for record in records]
+
+    print("=" * 70)
+    print(f"Record codec benchmark: {len(records)} hourly records ({days} days), "
+          f"encoded value {min(sizes)}-{max(sizes)} bytes")
+    print("=" * 70)
+
+    results = []
+    for codec in ('hash', 'struct'):
+        config.RECORD_CODEC = codec
+        client = PedestrianRedisClient(
+            host=config.REDIS_HOST,
+            port=config.REDIS_PORT,
+            storage_backend='hash',
+            replicas=[]
+        )
+        # Redis-Zugriffe messen, nicht den Day-Cache
+        client.day_cache = None
+        cleanup(client)
+
+        start = time.perf_counter()
+        for offset in range(0, len(records), 500):
+            client.bulk_store_hourly_data(BENCH_STREET, records[offset:offset + 500])
+        write_ms = (time.perf_counter() - start) * 1000
+
+        memory, count = record_memory(client, codec)
+        total_rate, decode_rate = decode_throughput(client, codec)
+        read_month = timed(lambda: client.get_historical_range(BENCH_STREET, start_date, month_end))
+
+        results.append((codec, write_ms, memory / max(count, 1), total_rate, decode_rate, read_month))
+        cleanup(client)
+
+    print(f"\n{'codec':8s} {'write':>10s} {'bytes/rec':>10s} {'fetch+decode':>14s} "
+          f"{'decode only':>14s} {'30d read':>10s}")
+    for codec, write_ms, per_record, total_rate, decode_rate, read_month in results:
+        print(f"{codec:8s} {write_ms:8.0f}ms {per_record:10.0f} {total_rate:12.0f}/s "
+              f"{decode_rate:12.0f}/s {read_month:8.1f}ms")
+
+    base, packed = results
+    print(f"\nstruct vs hash: {base[2] / packed[2]:.1f}x less memory per record, "
+          f"{packed[4] / base[4]:.1f}x decode throughput")
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    run_benchmark(days)
@@ -0,0 +1,108 @@
+# backend/scripts/benchmark_storage.py
+import sys
+sys.path.append('/app')
+
+import random
+import time
+from datetime import datetime, timedelta
+import config
+from database.redis_client import PedestrianRedisClient
+
+BENCH_STREET = "Benchmarkstraße"
+
+def generate_records(days: int, start: str = "2022-01-01", street: str = BENCH_STREET) -> list[dict]:
+    """Erzeugt synthetische Stundenwerte im Format des API-Fetchers"""
+    start_dt = datetime.strptime(start, "%Y-%m-%d")
+    conditions = ['clear-day', 'partly-cloudy-day', 'cloudy', 'rain']
+    records = []
+
+    for offset in range(days * 24):
+        dt = start_dt + timedelta(hours=offset)
+        total = random.randint(0, 4000)
+        towards = random.randint(0, total)
+        records.append({
+            'id': f"{street}_{dt.strftime('%Y-%m-%d_%H')}",
+            'street': street,
+            'city': 'Wuerzburg',
+            'date': dt.strftime('%Y-%m-%d'),
+            'hour': str(dt.hour),
+            'weekday': dt.strftime('%A'),
+            'n_pedestrians': str(total),
+            'n_pedestrians_towards': str(towards),
+            'n_pedestrians_away': str(total - towards),
+            'temperature': f"{random.uniform(-5, 30):.1f}",
+            'weather_condition': random.choice(conditions),
+            'incidents': 'verified',
+            'collection_type': 'measured',
+            'timestamp': dt.strftime('%Y-%m-%dT%H:00:00')
+        })
+
+    return records
+
+def cleanup(client: PedestrianRedisClient):
+    """Entfernt alle Benchmark-Keys"""
+    for key in client.client.scan_iter(match=f"*{BENCH_STREET}*", count=1000):
+        client.client.delete(key)
+    client._ts_streets.discard(BENCH_STREET)
+
+def memory_usage(client: PedestrianRedisClient) -> int:
+    """Summe von MEMORY USAGE über alle Benchmark-Keys"""
+    total = 0
+    for key in client.client.scan_iter(match=f"*{BENCH_STREET}*", count=1000):
+        total += client.client.memory_usage(key) or 0
+    return total
+
+def timed(fn, repeat: int = 5) -> float:
+    """Median-Laufzeit in Millisekunden"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return sorted(durations)[len(durations) // 2]
+
+def run_benchmark(days: int = 730, backends: tuple = ('hash', 'packed', 'timeseries')):
+    records = generate_records(days)
+    start_date = records[0]['date']
+    end_date = records[-1]['date']
+    month_end = (datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=30)).strftime("%Y-%m-%d")
+
+    print("=" * 70)
+    print(f"Storage benchmark: {len(records)} hourly records ({days} days)")
+    print("=" * 70)
+
+    results = []
+    for backend in backends:
+        client = PedestrianRedisClient(
+            host=config.REDIS_HOST,
+            port=config.REDIS_PORT,
+            storage_backend=backend,
+            replicas=[]
+        )
+        # Redis-Zugriffe messen, nicht den Day-Cache
+        client.day_cache = None
+        cleanup(client)
+
+        start = time.perf_counter()
+        for offset in range(0, len(records), 100):
+            client.bulk_store_hourly_data(BENCH_STREET, records[offset:offset + 100])
+        write_ms = (time.perf_counter() - start) * 1000
+
+        read_month = timed(lambda: client.get_historical_range(BENCH_STREET, start_date, month_end))
+        read_all = timed(lambda: client.get_historical_range(BENCH_STREET, start_date, end_date), repeat=3)
+        rollup = timed(lambda: client.get_rollup(BENCH_STREET, 'month', start_date, end_date), repeat=3)
+        latest = timed(lambda: client.get_latest_hour_timestamp(BENCH_STREET))
+        memory = memory_usage(client)
+
+        results.append((backend, write_ms, read_month, read_all, rollup, latest, memory))
+        cleanup(client)
+
+    print(f"\n{'backend':12s} {'write':>10s} {'30d read':>10s} {'full read':>10s} "
+          f"{'monthly':>10s} {'latest':>8s} {'memory':>12s}")
+    for backend, write_ms, read_month, read_all, rollup, latest, memory in results:
+        print(f"{backend:12s} {write_ms:8.0f}ms {read_month:8.1f}ms {read_all:8.0f}ms "
+              f"{rollup:8.1f}ms {latest:6.2f}ms {memory / 1024 / 1024:10.2f}MB")
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 730
+    run_benchmark(days)
@@ -0,0 +1,79 @@
+# backend/scripts/build_calendar_bitmaps.py
+import sys
+sys.path.append('/app')
+
+import redis
+import config
+from database.connection import connect_redis
+from database.calendar_bitmaps import write_bitmap, day_offset, hour_offset
+from database.reference_data import bump_reference_version
+
+def build_calendar_bitmaps():
+    """Baut die Kalender-Bitmaps aus bereits importierten Hashes und Sets auf.
+
+    Für Installationen, deren Kalenderdaten vor Einführung der Bitmaps
+    importiert wurden (die Import-Skripte schreiben sie inzwischen selbst).
+    """
+    r = connect_redis(
+        host=config.REDIS_HOST,
+        port=config.REDIS_PORT,
+        decode_responses=True
+    )
+
+    print("="*70)
+    print("Building calendar bitmaps")
+    print("="*70)
+
+    # Tages-Flags aus den vorhandenen Index-Sets
+    day_sources = {
+        'school_holiday': 'school_holidays:all',
+        'lecture_period_jmu': 'lectures:jmu:all_dates',
+    }
+    for flag, set_key in day_sources.items():
+        dates = r.smembers(set_key)
+        count = write_bitmap(r, flag, [day_offset(d) for d in dates])
+        print(f"  → {flag}: {count} days")
+
+    # Feiertage: nationwide steht nur im Tages-Hash
+    holidays = sorted(r.smembers('holidays:all'))
+    pipe = r.pipeline(transaction=False)
+    for date in holidays:
+        pipe.hget(f"holiday:{date}", 'is_nationwide')
+    nationwide = [date for date, flag in zip(holidays, pipe.execute()) if flag == '1']
+    write_bitmap(r, 'public_holiday', [day_offset(d) for d in holidays])
+    write_bitmap(r, 'nationwide', [day_offset(d) for d in nationwide])
+    print(f"  → public_holiday: {len(holidays)} days ({len(nationwide)} nationwide)")
+
+    # Stunden-Flags aus event:{date}:{hour}
+    dates = sorted(r.smembers('events:all_dates') | r.smembers('events:concert_dates'))
+    event_offsets = []
+    concert_offsets = []
+    for offset in range(0, len(dates), 500):
+        chunk = dates[offset:offset + 500]
+        pipe = r.pipeline(transaction=False)
+        for date in chunk:
+            for hour in range(24):
+                pipe.hmget(f"event:{date}:{hour}", 'has_event', 'has_concert')
+        results = iter(pipe.execute())
+        for date in chunk:
+            for hour in range(24):
+                has_event, has_concert = next(results)
+                if has_event == '1':
+                    event_offsets.append(hour_offset(date, hour))
+                if has_concert == '1':
+                    concert_offsets.append(hour_offset(date, hour))
+
+    write_bitmap(r, 'event', event_offsets)
+    write_bitmap(r, 'concert', concert_offsets)
+    print(f"  → event: {len(event_offsets)} hours, concert: {len(concert_offsets)} hours")
+
+    # Kalender-Antworten (ETags) der API neu berechnen lassen
+    for dataset in ('holidays', 'school_holidays', 'lectures', 'events'):
+        bump_reference_version(r, dataset)
+
+    print("\n" + "="*70)
+    print("Calendar bitmaps completed!")
+    print("="*70)
+
+if __name__ == "__main__":
+    build_calendar_bitmaps()
@@ -5,33 +5,42 @@ sys.path.append('/app')
 import redis
 from datetime import datetime
 import config
+from database.redis_client import PedestrianRedisClient
+from database.keys import hourly_index_key, hourly_pattern, record_pattern, key_street, latest_key
+
+def scan_pages(r, patterns):
+    """SCAN-Seiten über mehrere Patterns (Hash- und Record-Keys)"""
+    for pattern in patterns:
+        cursor = 0
+        while True:
+            cursor, keys = r.scan(cursor=cursor, match=pattern, count=1000)
+            if keys:
+                yield keys
+            if cursor == 0:
+                break
 
 def build_sorted_set_indexes(streets: list[str] | None = None):
     """Erstellt Indizes für alle bestehenden Daten.
 
     Wenn ``streets`` nicht angegeben ist, werden alle Straßen dynamisch aus den
-    vorhandenen Keys in Redis ermittelt (Pattern ``pedestrian:hourly:*``).
+    vorhandenen Keys in Redis ermittelt (Pattern ``pedestrian:hourly:*`` und
+    ``pedestrian:record:*``). Danach wird die Datenversion jeder Straße erhöht,
+    da Range-Reads über den neuen Index andere Stunden liefern können, und der
+    Latest-Zeiger ``pedestrian:latest:{street}`` aus den Daten neu aufgebaut
+    (z.B. nach Hashes, die ohne den Client geschrieben wurden).
     """
-    r = redis.Redis(
-        host=config.REDIS_HOST,
-        port=config.REDIS_PORT,
-        decode_responses=True
-    )
+    client = PedestrianRedisClient(host=config.REDIS_HOST, port=config.REDIS_PORT, replicas=[])
+    r = client.client
 
     # Dynamische Ermittlung aller vorhandenen Straßen falls nicht übergeben
     if streets is None:
         discovered_streets = set()
-        cursor = 0
-        pattern = "pedestrian:hourly:*"
-        while True:
-            cursor, keys = r.scan(cursor=cursor, match=pattern, count=1000)
+        for keys in scan_pages(r, ("pedestrian:hourly:*", "pedestrian:record:*")):
             for key in keys:
-                parts = key.split(":")
-                # Format: pedestrian:hourly:{street}:{date}:{hour}
-                if len(parts) >= 5:
-                    discovered_streets.add(parts[2])
-            if cursor == 0:
-                break
+                # Format: pedestrian:hourly:{street}:{date}:{hour} (beide Key-Schemata)
+                street = key_street(key)
+                if street:
+                    discovered_streets.add(street)
         streets = sorted(discovered_streets)
 
     print("="*70)
@@ -40,47 +49,50 @@ def build_sorted_set_indexes(streets: list[str] | None = None):
 
     for street in streets:
         print(f"\nProcessing {street}...")
-        pattern = f"pedestrian:hourly:{street}:*"
-        index_key = f"pedestrian:index:{street}"
+        index_key = hourly_index_key(street)
         
         # Lösche alten Index falls vorhanden
         r.delete(index_key)
         
         count = 0
-        cursor = 0
-        
-        while True:
-            cursor, keys = r.scan(cursor=cursor, match=pattern, count=1000)
+        dates = set()
+        for keys in scan_pages(r, (hourly_pattern(street), record_pattern(street))):
+            pipe = r.pipeline(transaction=False)
             
-            if keys:
-                pipe = r.pipeline()
-                
-                for key in keys:
-                    # Extrahiere Datum und Stunde aus Key
-                    # Format: pedestrian:hourly:Kaiserstraße:2019-04-02:18
-                    parts = key.split(':')
-                    if len(parts) >= 5:
-                        date = parts[3]
-                        hour = parts[4]
-                        
-                        try:
-                            timestamp = f"{date}T{hour.zfill(2)}:00:00"
-                            score = datetime.fromisoformat(timestamp).timestamp()
-                            pipe.zadd(index_key, {key: score})
-                        except Exception as e:
-                            print(f"  Warning: Could not index {key}: {e}")
-                
-                pipe.expire(index_key, 60*60*24*730)
-                pipe.execute()
-                
-                count += len(keys)
-                print(f"  → Indexed {count} records...")
+            for key in keys:
+                # Extrahiere Datum und Stunde aus Key
+                # Format: pedestrian:hourly:Kaiserstraße:2019-04-02:18
+                parts = key.split(':')
+                if len(parts) >= 5:
+                    date = parts[3]
+                    hour = parts[4]
+                    
+                    try:
+                        timestamp = f"{date}T{hour.zfill(2)}:00:00"
+                        score = datetime.fromisoformat(timestamp).timestamp()
+                        pipe.zadd(index_key, {key: score})
+                        dates.add(date)
+                    except Exception as e:
+                        print(f"  Warning: Could not index {key}: {e}")
             
-            if cursor == 0:
-                break
+            if config.LIVE_DATA_TTL:
+                pipe.expire(index_key, config.LIVE_DATA_TTL)
+            pipe.execute()
+            
+            count += len(keys)
+            print(f"  → Indexed {count} records...")
         
         print(f"✓ Completed {street}: {count} total records indexed")
         
+        # ETags und Day-Cache der Straße ungültig machen
+        client._bump_version(street, dates)
+        
+        # Latest-Zeiger verwerfen; get_latest_record baut ihn aus dem Index neu auf
+        r.delete(latest_key(street))
+        latest = client.get_latest_record(street)
+        if latest:
+            print(f"  Latest record: {latest['date']} {str(latest['hour']).zfill(2)}:00")
+        
         # Verify
         index_size = r.zcard(index_key)
         print(f"  Index size: {index_size} entries")
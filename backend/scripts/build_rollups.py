@@ -0,0 +1,53 @@
+# backend/scripts/build_rollups.py
+import sys
+sys.path.append('/app')
+
+from datetime import datetime, timedelta
+import config
+from database.redis_client import PedestrianRedisClient
+
+def build_rollups(streets: list[str] | None = None):
+    """Baut die Tages-/Wochen-/Monats-Rollups aus den vorhandenen Stundenwerten auf.
+
+    Nötig für Daten, die am Client vorbei geschrieben wurden (CSV-Import).
+    Mehrfaches Ausführen ist unkritisch: unveränderte Stunden ergeben ein Delta von 0.
+    """
+    # Liest die eigenen Schreibzugriffe: ohne Read-Replicas
+    client = PedestrianRedisClient(host=config.REDIS_HOST, port=config.REDIS_PORT, replicas=[])
+
+    if streets is None:
+        streets = ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]
+
+    print("="*70)
+    print("Building daily/weekly/monthly rollups")
+    print("="*70)
+
+    for street in streets:
+        bounds, _ = client._range_context(street)
+        if bounds is None:
+            print(f"\n{street}: no indexed records, skipping")
+            continue
+
+        print(f"\nProcessing {street} ({bounds[0]} - {bounds[1]})...")
+        count = 0
+        month_start = datetime.strptime(bounds[0][:7] + "-01", "%Y-%m-%d")
+        last = datetime.strptime(bounds[1], "%Y-%m-%d")
+
+        while month_start <= last:
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            month_end = (next_month - timedelta(days=1)).strftime("%Y-%m-%d")
+            records = client._fetch_range(street, month_start.strftime("%Y-%m-%d"), month_end)
+            if records:
+                client._update_rollups(street, records)
+                count += len(records)
+                print(f"  → {month_start.strftime('%Y-%m')}: {len(records)} records")
+            month_start = next_month
+
+        print(f"✓ Completed {street}: {count} records aggregated")
+
+    print("\n" + "="*70)
+    print("Rollups completed!")
+    print("="*70)
+
+if __name__ == "__main__":
+    build_rollups()
@@ -7,12 +7,14 @@ import redis
 import json
 from datetime import datetime
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
 
 def import_counter_locations_to_redis(csv_file_path: str):
     """Importiert Zählstationen-Geodaten aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -104,6 +106,9 @@ def import_counter_locations_to_redis(csv_file_path: str):
         if imported > 0:
             create_location_indexes(r)
         
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'locations')
+        
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
     except Exception as e:
@@ -148,7 +153,7 @@ def create_location_indexes(r: redis.Redis):
 
 def get_location_info(street_name: str = None, location_id: str = None) -> dict:
     """Holt Standort-Informationen"""
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -3,9 +3,35 @@ import sys
 sys.path.append('/app')
 
 import csv
-import redis
-from datetime import datetime
+from collections import defaultdict
 import config
+from database.redis_client import PedestrianRedisClient
+
+# Zeilen pro Schreib-Batch (ein Bulk-Store und eine Versionserhöhung pro Straße)
+BATCH_SIZE = 5000
+
+def store_batch(client: PedestrianRedisClient, pending: dict) -> tuple[int, int]:
+    """
+    Schreibt gesammelte Zeilen über den Client (Speicherformat, Rollups,
+    Versionen, Latest-Zeiger). Bereits vorhandene Stunden werden übersprungen.
+    Gibt (importiert, übersprungen) zurück.
+    """
+    imported = skipped = 0
+    for street, by_slot in pending.items():
+        if not by_slot:
+            continue
+        dates = sorted({date for date, _ in by_slot})
+        existing = {
+            (rec['date'], str(int(rec['hour'])))
+            for rec in client.get_historical_range(street, dates[0], dates[-1])
+        }
+        new = [data for slot, data in by_slot.items() if slot not in existing]
+        skipped += len(by_slot) - len(new)
+        if new:
+            client.bulk_store_hourly_data(street, new)
+            imported += len(new)
+    pending.clear()
+    return imported, skipped
 
 def import_data_all_streets_to_redis(csv_file_path: str):
     """
@@ -13,19 +39,17 @@ def import_data_all_streets_to_redis(csv_file_path: str):
     Überspringt bereits vorhandene Datensätze.
     """
     
-    # Redis Verbindung
-    r = redis.Redis(
-        host=config.REDIS_HOST,
-        port=config.REDIS_PORT,
-        db=0,
-        decode_responses=True
-    )
+    # Redis Verbindung (ohne Replikas: der Abgleich liest die eigenen Schreibzugriffe)
+    client = PedestrianRedisClient(host=config.REDIS_HOST, port=config.REDIS_PORT, replicas=[])
     
     print(f"Importing data from {csv_file_path}...")
     
     imported = 0
     skipped_existing = 0
     skipped_errors = 0
+    # Straße -> (Datum, Stunde) -> Datensatz
+    pending = defaultdict(dict)
+    pending_rows = 0
     
     # Mapping für Straßennamen (Normalisierung)
     street_mapping = {
@@ -46,10 +70,9 @@ def import_data_all_streets_to_redis(csv_file_path: str):
                     date = row['date']
                     hour = row['hour']
                     
-                    # Key prüfen ob bereits vorhanden
-                    key = f"pedestrian:hourly:{street}:{date}:{hour}"
-                    
-                    if r.exists(key):
+                    # Doppelte Zeilen in der CSV: erste gewinnt
+                    slot = (date, str(int(hour)))
+                    if slot in pending[street]:
                         skipped_existing += 1
                         continue
                     
@@ -78,13 +101,14 @@ def import_data_all_streets_to_redis(csv_file_path: str):
                     # Entferne leere Werte
                     data = {k: v for k, v in data.items() if v}
                     
-                    # Speichere in bestehender Struktur
-                    r.hset(key, mapping=data)
-                    r.expire(key, 60*60*24*730)  # 2 Jahre TTL
+                    pending[street][slot] = data
+                    pending_rows += 1
                     
-                    imported += 1
-                    
-                    if imported % 1000 == 0:
+                    if pending_rows >= BATCH_SIZE:
+                        new, existing = store_batch(client, pending)
+                        imported += new
+                        skipped_existing += existing
+                        pending_rows = 0
                         print(f"  → Imported {imported} new records (skipped {skipped_existing} existing)...")
                 
                 except Exception as e:
@@ -92,6 +116,10 @@ def import_data_all_streets_to_redis(csv_file_path: str):
                     if skipped_errors < 10:  # Nur erste 10 Fehler anzeigen
                         print(f"  Warning: Error in row {row.get('id', 'unknown')}: {e}")
         
+        new, existing = store_batch(client, pending)
+        imported += new
+        skipped_existing += existing
+        
         print(f"\n✓ Import completed!")
         print(f"  New records imported: {imported}")
         print(f"  Already existing (skipped): {skipped_existing}")
@@ -99,7 +127,7 @@ def import_data_all_streets_to_redis(csv_file_path: str):
         print(f"  Total processed: {imported + skipped_existing + skipped_errors}")
         
         # Zeige Statistik pro Straße
-        show_statistics(r)
+        show_statistics(client)
         
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
@@ -108,20 +136,16 @@ def import_data_all_streets_to_redis(csv_file_path: str):
         import traceback
         traceback.print_exc()
 
-def show_statistics(r: redis.Redis):
-    """Zeigt Statistiken nach dem Import"""
+def show_statistics(client: PedestrianRedisClient):
+    """Zeigt Statistiken nach dem Import (über den Client, unabhängig vom Speicherformat)"""
     print("\n" + "="*60)
     print("Statistics per street:")
     print("="*60)
     
-    for street in ['Schönbornstraße', 'Spiegelstraße', 'Kaiserstraße']:
-        pattern = f"pedestrian:hourly:{street}:*"
-        count = 0
-        
-        # Zähle Keys
-        for _ in r.scan_iter(match=pattern, count=1000):
-            count += 1
-        
+    streets = ['Schönbornstraße', 'Spiegelstraße', 'Kaiserstraße']
+    for street in streets:
+        bounds = client.get_date_bounds(street)
+        count = client.get_range_summary(street, *bounds)['hours'] if bounds else 0
         print(f"{street:20s}: {count:,} records")
     
     # Zeige ein Beispiel-Record
@@ -129,20 +153,12 @@ def show_statistics(r: redis.Redis):
     print("Sample record structure:")
     print("="*60)
     
-    test_key = "pedestrian:hourly:Schönbornstraße:2019-04-02:18"
-    if r.exists(test_key):
-        data = r.hgetall(test_key)
-        for key, value in sorted(data.items()):
-            print(f"  {key:30s}: {value}")
-    else:
-        # Finde irgendeinen Key als Beispiel
-        pattern = "pedestrian:hourly:*"
-        for key in r.scan_iter(match=pattern, count=1):
-            data = r.hgetall(key)
-            print(f"Key: {key}")
-            for k, v in sorted(data.items()):
-                print(f"  {k:30s}: {v}")
-            break
+    data = client.get_hourly_data("Schönbornstraße", "2019-04-02", 18)
+    if not data:
+        # Irgendeinen Datensatz als Beispiel
+        data = next(filter(None, map(client.get_latest_record, streets)), None)
+    for key, value in sorted((data or {}).items()):
+        print(f"  {key:30s}: {value}")
 
 if __name__ == "__main__":
     csv_path = "/app/data/dataAllStreets.csv"
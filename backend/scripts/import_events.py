@@ -6,12 +6,15 @@ import csv
 import redis
 from datetime import datetime
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
+from database.calendar_bitmaps import write_bitmap, hour_offset
 
 def import_events_to_redis(csv_file_path: str):
     """Importiert Events aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -23,6 +26,9 @@ def import_events_to_redis(csv_file_path: str):
     imported = 0
     event_days = 0
     concert_days = 0
+    event_offsets = []
+    concert_offsets = []
+    days = {}
     
     try:
         with open(csv_file_path, 'r', encoding='utf-8-sig') as f:
@@ -53,10 +59,19 @@ def import_events_to_redis(csv_file_path: str):
                 r.hset(key, mapping=data)
                 r.expire(key, 60*60*24*365*5)
                 
+                day = days.setdefault(date_only, {'has_event': False, 'has_concert': False, 'event_hours': 0})
+                if event == '1':
+                    day['has_event'] = True
+                    day['event_hours'] += 1
+                if concert == '1':
+                    day['has_concert'] = True
+                
                 if event == '1':
                     event_days += 1
+                    event_offsets.append(hour_offset(date_only, hour))
                 if concert == '1':
                     concert_days += 1
+                    concert_offsets.append(hour_offset(date_only, hour))
                 
                 imported += 1
                 
@@ -71,6 +86,17 @@ def import_events_to_redis(csv_file_path: str):
         # Erstelle Indizes
         create_event_indexes(r)
         
+        # Tages-Aggregate (ein HGETALL pro Tag statt 24)
+        create_event_day_aggregates(r, days)
+        
+        # Stunden-Bitmaps für Range-Abfragen
+        write_bitmap(r, 'event', event_offsets)
+        write_bitmap(r, 'concert', concert_offsets)
+        print(f"  → Event bitmaps: {len(event_offsets)} event hours, {len(concert_offsets)} concert hours")
+        
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'events')
+        
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
     except Exception as e:
@@ -111,9 +137,25 @@ def create_event_indexes(r: redis.Redis):
         r.expire('events:concert_dates', 60*60*24*365*5)
         print(f"  → Days with concerts: {len(concert_dates)}")
 
+def create_event_day_aggregates(r: redis.Redis, days: dict):
+    """Schreibt event:day:{date} mit den Flags des ganzen Tages"""
+    pipe = r.pipeline(transaction=False)
+    for date, day in days.items():
+        pipe.hset(f"event:day:{date}", mapping={
+            'date': date,
+            'has_event': '1' if day['has_event'] else '0',
+            'has_concert': '1' if day['has_concert'] else '0',
+            'event_hours': str(day['event_hours'])
+        })
+        pipe.expire(f"event:day:{date}", 60*60*24*365*5)
+    # Marker: Tage ohne Aggregat haben keine Events
+    pipe.set('events:day_aggregates', datetime.now().isoformat(), ex=60*60*24*365*5)
+    pipe.execute()
+    print(f"  → Day aggregates: {len(days)} days")
+
 def get_event_info(date: str, hour: int = None) -> dict:
     """Holt Event-Informationen"""
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -3,16 +3,19 @@ import sys
 sys.path.append('/app')
 
 import csv
+import json
 import redis
 from datetime import datetime, timedelta
 from typing import List
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
 
 def import_detailed_events_to_redis(csv_file_path: str):
     """Importiert detaillierte Events mit Zeiträumen aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -23,6 +26,7 @@ def import_detailed_events_to_redis(csv_file_path: str):
     
     imported = 0
     total_hours = 0
+    days = {}
     
     try:
         with open(csv_file_path, 'r', encoding='utf-8-sig') as f:
@@ -73,6 +77,15 @@ def import_detailed_events_to_redis(csv_file_path: str):
                     
                     r.hset(hour_key, mapping=hour_data)
                     r.expire(hour_key, 60*60*24*365*5)
+                    
+                    day_events = days.setdefault(date, {})
+                    if name not in day_events:
+                        day_events[name] = {
+                            'event_name': name,
+                            'is_concert': bool(int(is_concert)),
+                            'start': start_str,
+                            'end': end_str
+                        }
                 
                 imported += 1
                 duration = (end_dt - start_dt).total_seconds() / 3600
@@ -84,6 +97,10 @@ def import_detailed_events_to_redis(csv_file_path: str):
         
         # Erstelle Indizes
         create_detailed_event_indexes(r)
+        create_detailed_event_day_aggregates(r, days)
+        
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'events')
         
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
@@ -153,9 +170,25 @@ def create_detailed_event_indexes(r: redis.Redis):
         r.expire(key, 60*60*24*365*5)
     print(f"  → Indexed {len(event_names)} different events")
 
+def create_detailed_event_day_aggregates(r: redis.Redis, days: dict):
+    """Schreibt event:detail:day:{date} mit allen Events des Tages (JSON)"""
+    pipe = r.pipeline(transaction=False)
+    for date, day_events in days.items():
+        events = sorted(day_events.values(), key=lambda e: e['start'])
+        pipe.hset(f"event:detail:day:{date}", mapping={
+            'date': date,
+            'events': json.dumps(events, ensure_ascii=False),
+            'event_count': str(len(events))
+        })
+        pipe.expire(f"event:detail:day:{date}", 60*60*24*365*5)
+    # Marker: Tage ohne Aggregat haben keine Events
+    pipe.set('events:detailed:day_aggregates', datetime.now().isoformat(), ex=60*60*24*365*5)
+    pipe.execute()
+    print(f"  → Day aggregates: {len(days)} days")
+
 def get_detailed_event_info(date: str, hour: int = None) -> dict:
     """Holt detaillierte Event-Informationen"""
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
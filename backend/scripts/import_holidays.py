@@ -6,12 +6,15 @@ import csv
 import redis
 from datetime import datetime
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
+from database.calendar_bitmaps import write_bitmap, day_offset
 
 def import_holidays_to_redis(csv_file_path: str):
     """Importiert Feiertage aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -22,6 +25,8 @@ def import_holidays_to_redis(csv_file_path: str):
     
     imported = 0
     skipped = 0
+    holiday_offsets = []
+    nationwide_offsets = []
     
     try:
         with open(csv_file_path, 'r', encoding='utf-8') as f:
@@ -47,6 +52,11 @@ def import_holidays_to_redis(csv_file_path: str):
                 # TTL: 5 Jahre
                 r.expire(key, 60*60*24*365*5)
                 
+                if public_holiday == '1':
+                    holiday_offsets.append(day_offset(date))
+                    if nationwide == '1':
+                        nationwide_offsets.append(day_offset(date))
+                
                 imported += 1
                 
                 if imported % 100 == 0:
@@ -59,6 +69,14 @@ def import_holidays_to_redis(csv_file_path: str):
         # Erstelle zusätzlichen Index für schnelle Abfragen
         create_holiday_index(r)
         
+        # Bitmaps für Range-Abfragen (siehe database/calendar_bitmaps.py)
+        write_bitmap(r, 'public_holiday', holiday_offsets)
+        write_bitmap(r, 'nationwide', nationwide_offsets)
+        print(f"  → Holiday bitmaps: {len(holiday_offsets)} days")
+        
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'holidays')
+        
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
     except Exception as e:
@@ -89,7 +107,7 @@ def create_holiday_index(r: redis.Redis):
 
 def get_holiday_info(date: str) -> dict:
     """Hilfsfunktion zum Abrufen von Feiertagsinfos"""
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
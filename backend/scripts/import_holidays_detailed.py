@@ -6,12 +6,14 @@ import csv
 import redis
 from datetime import datetime
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
 
 def import_detailed_holidays_to_redis(csv_file_path: str):
     """Importiert detaillierte Feiertage aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -63,6 +65,9 @@ def import_detailed_holidays_to_redis(csv_file_path: str):
         # Erstelle verschiedene Indizes
         create_detailed_indexes(r)
         
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'holidays')
+        
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
     except Exception as e:
@@ -121,7 +126,7 @@ def create_detailed_indexes(r: redis.Redis):
 
 def get_detailed_holiday_info(date: str) -> dict:
     """Hilfsfunktion zum Abrufen detaillierter Feiertagsinfos"""
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
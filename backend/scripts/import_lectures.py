@@ -7,12 +7,14 @@ import redis
 from datetime import datetime, timedelta
 from typing import List
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
 
 def import_lectures_to_redis(csv_file_path: str):
     """Importiert Vorlesungszeit-Perioden aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -83,6 +85,9 @@ def import_lectures_to_redis(csv_file_path: str):
         # Erstelle Indizes
         create_lecture_indexes(r)
         
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'lectures')
+        
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
     except Exception as e:
@@ -6,12 +6,15 @@ import csv
 import redis
 from datetime import datetime
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
+from database.calendar_bitmaps import write_bitmap, day_offset
 
 def import_lectures_daily_to_redis(csv_file_path: str):
     """Importiert tägliche Vorlesungszeit-Daten aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -22,6 +25,7 @@ def import_lectures_daily_to_redis(csv_file_path: str):
     
     imported = 0
     lecture_days = 0
+    lecture_offsets = []
     
     try:
         with open(csv_file_path, 'r', encoding='utf-8-sig') as f:
@@ -46,6 +50,7 @@ def import_lectures_daily_to_redis(csv_file_path: str):
                 
                 if lecture_period == '1':
                     lecture_days += 1
+                    lecture_offsets.append(day_offset(date))
                 
                 imported += 1
                 
@@ -59,6 +64,13 @@ def import_lectures_daily_to_redis(csv_file_path: str):
         # Erstelle Index
         create_lecture_daily_index(r)
         
+        # Bitmap für Range-Abfragen
+        write_bitmap(r, 'lecture_period_jmu', lecture_offsets)
+        print(f"  → Lecture period bitmap: {len(lecture_offsets)} days")
+        
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'lectures')
+        
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
     except Exception as e:
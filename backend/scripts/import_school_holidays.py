@@ -6,12 +6,15 @@ import csv
 import redis
 from datetime import datetime
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
+from database.calendar_bitmaps import write_bitmap, day_offset
 
 def import_school_holidays_to_redis(csv_file_path: str):
     """Importiert Schulferien aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -22,6 +25,7 @@ def import_school_holidays_to_redis(csv_file_path: str):
     
     imported = 0
     holiday_count = 0
+    holiday_offsets = []
     
     try:
         with open(csv_file_path, 'r', encoding='utf-8') as f:
@@ -47,6 +51,7 @@ def import_school_holidays_to_redis(csv_file_path: str):
                 imported += 1
                 if school_holiday == '1':
                     holiday_count += 1
+                    holiday_offsets.append(day_offset(date))
                 
                 if imported % 100 == 0:
                     print(f"  → Imported {imported} records...")
@@ -58,6 +63,13 @@ def import_school_holidays_to_redis(csv_file_path: str):
         # Erstelle Index
         create_school_holiday_index(r)
         
+        # Bitmap für Range-Abfragen
+        write_bitmap(r, 'school_holiday', holiday_offsets)
+        print(f"  → School holiday bitmap: {len(holiday_offsets)} days")
+        
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'school_holidays')
+        
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
     except Exception as e:
@@ -86,7 +98,7 @@ def create_school_holiday_index(r: redis.Redis):
 
 def get_school_holiday_info(date: str) -> dict:
     """Hilfsfunktion zum Abrufen von Schulferien-Infos"""
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -7,12 +7,14 @@ import redis
 from datetime import datetime, timedelta
 from typing import List
 import config
+from database.connection import connect_redis
+from database.reference_data import bump_reference_version
 
 def import_detailed_school_holidays_to_redis(csv_file_path: str):
     """Importiert detaillierte Schulferien aus CSV in Redis"""
     
     # Redis Verbindung
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -77,6 +79,9 @@ def import_detailed_school_holidays_to_redis(csv_file_path: str):
         # Erstelle Indizes
         create_detailed_school_holiday_indexes(r)
         
+        # Laufende API-Prozesse laden ihren Stammdaten-Snapshot neu
+        bump_reference_version(r, 'school_holidays')
+        
     except FileNotFoundError:
         print(f"Error: File {csv_file_path} not found!")
     except Exception as e:
@@ -145,7 +150,7 @@ def create_detailed_school_holiday_indexes(r: redis.Redis):
 
 def get_school_holiday_period(date: str) -> dict:
     """Gibt die Ferienperiode für ein Datum zurück"""
-    r = redis.Redis(
+    r = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         db=0,
@@ -7,6 +7,7 @@ import redis
 from datetime import datetime
 from typing import Callable, Optional
 import config
+from database.connection import connect_redis
 
 # Import all functions
 from scripts.import_holidays import import_holidays_to_redis
@@ -20,6 +21,7 @@ from scripts.import_lectures import import_lectures_to_redis
 from scripts.import_counter_locations import import_counter_locations_to_redis
 from scripts.import_data_all_streets import import_data_all_streets_to_redis
 from scripts.build_indexes import build_sorted_set_indexes
+from scripts.build_rollups import build_rollups
 from data_ingestion.api_fetcher import APIFetcher
 from database.redis_client import PedestrianRedisClient
 from ML.predict import run_predictions_and_store
@@ -127,11 +129,11 @@ def wait_for_redis(max_attempts: int = 30) -> bool:
     
     for i in range(max_attempts):
         try:
-            r = redis.Redis(host=config.REDIS_HOST, port=config.REDIS_PORT)
+            r = connect_redis(host=config.REDIS_HOST, port=config.REDIS_PORT)
             r.ping()
             print("✓ Redis is ready!")
             return True
-        except redis.ConnectionError:
+        except (redis.ConnectionError, redis.exceptions.RedisClusterException):
             print(f"  Attempt {i+1}/{max_attempts}: Redis not ready yet...")
             time.sleep(2)
     
@@ -320,14 +322,14 @@ def main():
         sys.exit(1)
     
     # Connect to Redis
-    redis_client = redis.Redis(
+    redis_client = connect_redis(
         host=config.REDIS_HOST,
         port=config.REDIS_PORT,
         decode_responses=True
     )
     
     results = []
-    total_tasks = len(IMPORT_TASKS) + 3  # +3 for API, indexes, predictions
+    total_tasks = len(IMPORT_TASKS) + 4  # +4 for API, indexes, rollups, predictions
     
     # ========================================================================
     # 1. CSV IMPORTS
@@ -370,9 +372,23 @@ def main():
     results.append(result)
     
     # ========================================================================
-    # 4. GENERATE PREDICTIONS
+    # 4. BUILD ROLLUPS
     # ========================================================================
-    print(f"\n[{len(IMPORT_TASKS)+3}/{total_tasks}] Generating Initial Predictions (8 days)")
+    print(f"\n[{len(IMPORT_TASKS)+3}/{total_tasks}] Building Rollups")
+    print("-" * 70)
+    
+    result = run_task(
+        name='Build Rollups',
+        function=build_rollups,
+        redis_client=redis_client,
+        skip_if_exists=False
+    )
+    results.append(result)
+    
+    # ========================================================================
+    # 5. GENERATE PREDICTIONS
+    # ========================================================================
+    print(f"\n[{len(IMPORT_TASKS)+4}/{total_tasks}] Generating Initial Predictions (8 days)")
     print("-" * 70)
     
     result = run_task(
@@ -384,7 +400,7 @@ def main():
     results.append(result)
     
     # ========================================================================
-    # 5. SUMMARY
+    # 6. SUMMARY
     # ========================================================================
     failed_count = print_summary(results)
     
@@ -0,0 +1,156 @@
+# backend/scripts/migrate_key_scheme.py
+import sys
+sys.path.append('/app')
+
+import re
+import config
+from database.connection import connect_redis
+from database.keys import KEY_MEMBER_FAMILIES, key_street, tag_key
+
+SOURCE_PATTERNS = ('pedestrian:*', 'ts:pedestrian:*', 'calendar:bitmap:*')
+BATCH_SIZE = 500
+MAX_PASSES = 5
+
+def glob_escape(value: str) -> str:
+    return re.sub(r'([*?\[\]\\])', r'\\\1', value)
+
+def street_versions(source) -> dict:
+    """Schreibversion ('all') jeder Straße, siehe database/day_cache.py"""
+    keys = list(source.scan_iter(match='pedestrian:version:*', count=1000))
+    pipe = source.pipeline(transaction=False)
+    for key in keys:
+        pipe.hget(key, 'all')
+    return {key_street(key): version for key, version in zip(keys, pipe.execute()) if key_street(key)}
+
+def copy_batch(source, binary_source, target, binary_target, keys: list[str]) -> int:
+    """Kopiert Keys per DUMP/RESTORE (inkl. TTL) unter ihrem tagged-Namen"""
+    keys = [key for key in keys if tag_key(key)]
+    if not keys:
+        return 0
+
+    pipe = binary_source.pipeline(transaction=False)
+    for key in keys:
+        pipe.dump(key)
+        pipe.pttl(key)
+    replies = pipe.execute()
+
+    copied = 0
+    pipe = binary_target.pipeline(transaction=False)
+    for key, dumped, ttl in zip(keys, replies[0::2], replies[1::2]):
+        if dumped is None:
+            # Zwischenzeitlich gelöscht oder abgelaufen
+            continue
+        new_key = tag_key(key)
+        if key.startswith(KEY_MEMBER_FAMILIES):
+            # Index-Member sind selbst Keys und werden mit umbenannt
+            entries = source.zrange(key, 0, -1, withscores=True)
+            target.delete(new_key)
+            for offset in range(0, len(entries), 5000):
+                target.zadd(new_key, {
+                    tag_key(member) or member: score for member, score in entries[offset:offset + 5000]
+                })
+            if ttl > 0:
+                target.pexpire(new_key, ttl)
+        else:
+            pipe.restore(new_key, max(ttl, 0), dumped, replace=True)
+        copied += 1
+    pipe.execute()
+    return copied
+
+def copy_matching(source, binary_source, target, binary_target, pattern: str, street: str | None = None) -> int:
+    copied = 0
+    batch = []
+    for key in source.scan_iter(match=pattern, count=1000):
+        if street is not None and key_street(key) != street:
+            continue
+        batch.append(key)
+        if len(batch) >= BATCH_SIZE:
+            copied += copy_batch(source, binary_source, target, binary_target, batch)
+            batch = []
+    if batch:
+        copied += copy_batch(source, binary_source, target, binary_target, batch)
+    return copied
+
+def delete_legacy(source, target) -> int:
+    """Entfernt Legacy-Keys, deren tagged-Kopie im Ziel existiert"""
+    deleted = 0
+    for pattern in SOURCE_PATTERNS:
+        keys = [key for key in source.scan_iter(match=pattern, count=1000) if tag_key(key)]
+        for offset in range(0, len(keys), BATCH_SIZE):
+            chunk = keys[offset:offset + BATCH_SIZE]
+            pipe = target.pipeline(transaction=False)
+            for key in chunk:
+                pipe.exists(tag_key(key))
+            copied = [key for key, exists in zip(chunk, pipe.execute()) if exists]
+
+            pipe = source.pipeline(transaction=False)
+            for key in copied:
+                pipe.delete(key)
+            pipe.execute()
+            deleted += len(copied)
+    return deleted
+
+def migrate_key_scheme(target_host: str | None = None, target_port: int | None = None,
+                       target_cluster: bool = False, drop_legacy: bool = False):
+    """Schreibt Legacy-Keys in das tagged-Schema um (siehe database/keys.py).
+
+    Online-fähig: SCAN statt KEYS, kleine Batches, Legacy-Keys bleiben erhalten.
+    Straßen, deren Schreibversion sich während eines Durchlaufs ändert (Scheduler,
+    Importe), werden erneut kopiert, bis sich nichts mehr ändert. Ablauf:
+
+      1. Skript ausführen (Ziel: derselbe Server oder ein neuer Cluster)
+      2. Dienste mit KEY_SCHEME=tagged (bzw. REDIS_CLUSTER=true) neu starten
+      3. Skript mit --drop-legacy erneut ausführen, um die alten Keys zu löschen
+    """
+    source = connect_redis(config.REDIS_HOST, config.REDIS_PORT, cluster=False)
+    binary_source = connect_redis(config.REDIS_HOST, config.REDIS_PORT, decode_responses=False, cluster=False)
+    target_host = target_host or config.REDIS_HOST
+    target_port = target_port or config.REDIS_PORT
+    target = connect_redis(target_host, target_port, cluster=target_cluster)
+    binary_target = connect_redis(target_host, target_port, decode_responses=False, cluster=target_cluster)
+
+    print("="*70)
+    print(f"Migrating keys to tagged scheme → {target_host}:{target_port}"
+          f" ({'cluster' if target_cluster else 'single node'})")
+    print("="*70)
+
+    if drop_legacy:
+        deleted = delete_legacy(source, target)
+        print(f"\n✓ Dropped {deleted} legacy keys")
+        return
+
+    before = street_versions(source)
+    total = 0
+    for pattern in SOURCE_PATTERNS:
+        copied = copy_matching(source, binary_source, target, binary_target, pattern)
+        total += copied
+        print(f"  → {pattern}: {copied} keys")
+
+    # Während der Kopie geschriebene Straßen nachziehen
+    for attempt in range(1, MAX_PASSES + 1):
+        after = street_versions(source)
+        changed = sorted(street for street in after if after[street] != before.get(street))
+        if not changed:
+            break
+        print(f"\nPass {attempt + 1}: re-copying {', '.join(changed)}")
+        for street in changed:
+            total += copy_matching(source, binary_source, target, binary_target,
+                                   f"*{glob_escape(street)}*", street)
+        before = after
+    else:
+        print("\n⚠️  Streets still receiving writes - pause the scheduler and run again before switching KEY_SCHEME")
+
+    print(f"\n✓ Copied {total} keys")
+    print("\n" + "="*70)
+    print("Key migration completed!")
+    print("="*70)
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    host, _, port = (args[0] if args else '').partition(':')
+    migrate_key_scheme(
+        target_host=host or None,
+        target_port=int(port) if port else None,
+        target_cluster='--cluster' in sys.argv,
+        drop_legacy='--drop-legacy' in sys.argv
+    )
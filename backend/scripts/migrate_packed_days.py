@@ -0,0 +1,76 @@
+# backend/scripts/migrate_packed_days.py
+import sys
+sys.path.append('/app')
+
+from collections import defaultdict
+import config
+from database.redis_client import PedestrianRedisClient
+from database.keys import hourly_index_key
+
+def migrate_to_packed_days(streets: list[str] | None = None, drop_hashes: bool = False):
+    """Überführt stündliche Hashes in Tages-Blöcke (ein Binärwert pro Straße und Tag).
+
+    Die Hashes bleiben standardmäßig erhalten, damit das Hash-Layout während der
+    Migration lesbar bleibt. Mit ``drop_hashes=True`` werden sie samt Index entfernt.
+    """
+    client = PedestrianRedisClient(
+        host=config.REDIS_HOST,
+        port=config.REDIS_PORT,
+        storage_backend='packed',
+        replicas=[]  # liest die eigenen Schreibzugriffe
+    )
+    r = client.client
+
+    if streets is None:
+        streets = ["Kaiserstraße", "Spiegelstraße", "Schönbornstraße"]
+
+    print("="*70)
+    print("Migrating hourly hashes to packed day blocks")
+    print("="*70)
+
+    for street in streets:
+        index_key = hourly_index_key(street)
+        keys = r.zrange(index_key, 0, -1)
+
+        if not keys:
+            print(f"\n{street}: no indexed records, skipping")
+            continue
+
+        print(f"\nProcessing {street} ({len(keys)} records)...")
+        days = 0
+
+        for offset in range(0, len(keys), 5000):
+            chunk = keys[offset:offset + 5000]
+            pipe = r.pipeline(transaction=False)
+            for key in chunk:
+                pipe.hgetall(key)
+
+            by_date = defaultdict(list)
+            for data in pipe.execute():
+                if data and data.get('date') and data.get('hour') is not None:
+                    by_date[data['date']].append(data)
+
+            # Bereits gepackte Stunden (z.B. neuere Upserts) nicht überschreiben
+            for date, records in by_date.items():
+                existing = client._get_range_packed_only(street, date, date)
+                packed_hours = {rec['hour'] for rec in existing}
+                merged = existing + [rec for rec in records if str(rec['hour']) not in packed_hours]
+                client.store_packed_day(street, date, merged)
+                days += 1
+
+            print(f"  → {min(offset + 5000, len(keys))}/{len(keys)} records")
+
+        print(f"✓ Completed {street}: {days} day blocks written")
+
+        if drop_hashes:
+            for offset in range(0, len(keys), 5000):
+                r.delete(*keys[offset:offset + 5000])
+            r.delete(index_key)
+            print(f"  Dropped {len(keys)} hourly hashes and index")
+
+    print("\n" + "="*70)
+    print("Migration completed!")
+    print("="*70)
+
+if __name__ == "__main__":
+    migrate_to_packed_days(drop_hashes='--drop-hashes' in sys.argv)
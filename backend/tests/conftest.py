@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# Wie im Container (/app): Pakete relativ zu backend/ importieren
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
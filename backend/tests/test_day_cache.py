@@ -0,0 +1,58 @@
+# backend/tests/test_day_cache.py
+from datetime import date, timedelta
+
+import database.day_cache as day_cache
+from database.day_cache import DayCache
+
+
+def _day(offset: int) -> str:
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+def _move_cutoff(monkeypatch, days: int):
+    """Simuliert das Verstreichen von ``days`` Tagen für das Nachlade-Fenster"""
+    real = day_cache.mutable_cutoff
+    monkeypatch.setattr(
+        day_cache, 'mutable_cutoff',
+        lambda mutable_days: (date.fromisoformat(real(mutable_days)) + timedelta(days=days)).isoformat()
+    )
+
+
+def test_closed_day_checks_history_only():
+    cache = DayCache(1 << 20, mutable_days=2)
+    old = _day(-30)
+    cache.put('K', old, [{'date': old, 'hour': '1'}], (0, 5, 0))
+
+    hits, missing = cache.lookup('K', [old], (0, 9, 0))
+    assert old in hits and not missing
+
+    hits, missing = cache.lookup('K', [old], (1, 9, 0))
+    assert not hits and missing == [old]
+
+
+def test_open_day_is_dropped_after_cutoff_passes(monkeypatch):
+    cache = DayCache(1 << 20, mutable_days=2)
+    today = _day(0)
+    partial = [{'date': today, 'hour': str(h)} for h in range(10)]
+    cache.put('K', today, partial, (0, 5, 0))
+
+    # Drei Tage später ist der Tag abgeschlossen; neue Stunden zählten nur 'all' hoch
+    _move_cutoff(monkeypatch, 3)
+    assert today < day_cache.mutable_cutoff(2)
+    hits, missing = cache.lookup('K', [today], (0, 19, 0))
+    assert not hits and missing == [today]
+
+    # Neu gelesen und als fester Tag abgelegt: ab jetzt zählt nur history
+    cache.put('K', today, partial + [{'date': today, 'hour': '23'}], (0, 19, 0))
+    hits, _ = cache.lookup('K', [today], (0, 25, 0))
+    assert len(hits[today]) == 11
+
+
+def test_open_day_valid_while_all_matches(monkeypatch):
+    cache = DayCache(1 << 20, mutable_days=2)
+    today = _day(0)
+    cache.put('K', today, [{'date': today, 'hour': '0'}], (0, 5, 0))
+    _move_cutoff(monkeypatch, 3)
+
+    hits, missing = cache.lookup('K', [today], (0, 5, 0))
+    assert today in hits and not missing
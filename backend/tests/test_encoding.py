@@ -0,0 +1,93 @@
+# backend/tests/test_encoding.py
+from datetime import datetime
+
+import numpy as np
+
+from database.archive import encode_month, month_text, month_to_records, records_to_month
+from database.encoding import (
+    DAY_SLOT_DTYPE, TS_CODED_METRICS, day_block_to_records, decode_day_text, decode_record,
+    encode_hour_slot, encode_hour_text, encode_record, timeseries_to_records
+)
+
+STREET = 'Kaiserstraße'
+
+
+def _record(hour: int, **fields) -> dict:
+    record = {
+        'id': f"{STREET}_2024-03-01_{hour:02d}", 'street': STREET, 'city': 'Wuerzburg',
+        'date': '2024-03-01', 'hour': str(hour), 'weekday': 'Friday',
+        'n_pedestrians': '120', 'n_pedestrians_towards': '70', 'n_pedestrians_away': '50',
+        'temperature': '7.5', 'weather_condition': 'rain', 'incidents': 'verified',
+        'collection_type': 'measured', 'timestamp': f"2024-03-01T{hour:02d}:00:00",
+    }
+    record.update(fields)
+    return record
+
+
+def _block(records) -> np.ndarray:
+    block = np.zeros(24, dtype=DAY_SLOT_DTYPE)
+    for data in records:
+        block[int(data['hour'])] = np.frombuffer(encode_hour_slot(data), dtype=DAY_SLOT_DTYPE)[0]
+    return block
+
+
+def test_derivable_text_needs_no_sidecar():
+    assert encode_hour_text(STREET, _record(5)) is None
+
+
+def test_day_block_keeps_original_id_and_timestamp():
+    records = [_record(5, id='4711', timestamp='2024-03-01T05:00:00+01:00'), _record(6)]
+    text = decode_day_text({
+        data['hour'].encode(): encoded.encode()
+        for data in records if (encoded := encode_hour_text(STREET, data))
+    })
+
+    assert day_block_to_records(STREET, '2024-03-01', _block(records), text=text) == records
+
+
+def test_archive_keeps_original_id_and_timestamp():
+    records = [_record(5, id='4711', timestamp='2024-03-01T05:00:00+01:00'), _record(6)]
+    raw = encode_month(records_to_month('2024-03', records), 'zlib', month_text(STREET, records))
+
+    assert month_to_records(STREET, '2024-03', raw) == records
+
+
+def _series(records) -> list:
+    """Messwerte wie _store_timeseries sie schreibt, im Format einer TS.MRANGE-Antwort"""
+    samples = {}
+    for data in records:
+        ts_ms = int(datetime.fromisoformat(f"{data['date']}T{int(data['hour']):02d}:00:00").timestamp() * 1000)
+        for metric in ('n_pedestrians', 'n_pedestrians_towards', 'n_pedestrians_away', 'temperature'):
+            samples.setdefault(metric, []).append((ts_ms, float(data[metric])))
+        for metric, codes, _ in TS_CODED_METRICS:
+            samples.setdefault(metric, []).append((ts_ms, float(codes[data[metric]])))
+    return [{f"pedestrian:ts:{STREET}:{metric}": [{}, values]} for metric, values in samples.items()]
+
+
+def test_timeseries_keeps_text_and_enum_fields():
+    records = [_record(5, id='4711', timestamp='2024-03-01T05:00:00+01:00'), _record(6)]
+    text = {'2024-03-01': decode_day_text({
+        data['hour']: encoded for data in records if (encoded := encode_hour_text(STREET, data))
+    })}
+
+    assert timeseries_to_records(STREET, _series(records), text=text) == records
+
+
+def test_record_codec_returns_hash_strings():
+    for temperature in ('7', '7.5', '7.0', '-0.25', '7.50', ''):
+        data = _record(5, temperature=temperature, n_pedestrians_towards='70.5', incidents='unknown')
+
+        assert decode_record(encode_record(data)) == data
+
+
+def test_record_codec_escapes_separator():
+    data = _record(5, id='a\x1fb\x1bc', note='x\x1f')
+
+    assert decode_record(encode_record(data)) == data
+
+
+def test_record_codec_reads_version_1():
+    raw = bytearray(encode_record(_record(5)))
+    raw[0] = 1
+
+    assert decode_record(bytes(raw)) == _record(5)
@@ -0,0 +1,22 @@
+# backend/tests/test_keys.py
+import config
+from database.keys import hourly_key, hourly_key_date, key_street, prediction_key, record_key, version_key
+
+
+def test_hourly_key_date_in_both_schemes(monkeypatch):
+    for scheme in ('legacy', 'tagged'):
+        monkeypatch.setattr(config, 'KEY_SCHEME', scheme)
+        for key in (hourly_key('K', '2024-03-01', 5), record_key('K', '2024-03-01', 5),
+                    prediction_key('K', '2024-03-01', 5)):
+            assert hourly_key_date(key) == '2024-03-01'
+
+
+def test_hourly_key_date_rejects_incomplete_keys():
+    assert hourly_key_date('pedestrian:hourly:K:2024-03-01') is None
+    assert hourly_key_date('pedestrian:index:K') is None
+
+
+def test_version_key_belongs_to_street(monkeypatch):
+    for scheme in ('legacy', 'tagged'):
+        monkeypatch.setattr(config, 'KEY_SCHEME', scheme)
+        assert key_street(version_key('Kaiserstraße')) == 'Kaiserstraße'
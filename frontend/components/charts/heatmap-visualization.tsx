@@ -2,7 +2,8 @@
 
 import React from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
-import { HourlyDataPoint } from '@/lib/types';
+import { HourlyDataPoint, HeatmapMatrix } from '@/lib/types';
+import { pedestrianAPI } from '@/lib/api';
 import { useState, useEffect } from 'react';
 
 interface HeatmapData {
@@ -25,6 +26,7 @@ interface HeatmapVisualizationProps {
 
 export function HeatmapVisualization({ hourlyData, hourlyPredictions = [], loading, street, dateRange }: HeatmapVisualizationProps) {
   const [heatmapData, setHeatmapData] = useState<HeatmapData[]>([]);
+  const [serverMatrix, setServerMatrix] = useState<HeatmapMatrix | null>(null);
   const days = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
   const hours = Array.from({ length: 24 }, (_, i) => i);
   const displayStreet = street === 'All_streets' ? 'All Streets' : street.replace(/_/g, ' ');
@@ -52,9 +54,30 @@ export function HeatmapVisualization({ hourlyData, hourlyPredictions = [], loadi
     dateStrings = weekDays.map(d => format(d, 'yyyy-MM-dd'));
   }
 
-  // Process data when hourlyData or predictions change
+  const rangeStart = dateRange ? format(dateRange.start, 'yyyy-MM-dd') : null;
+  const rangeEnd = dateRange ? format(dateRange.end, 'yyyy-MM-dd') : null;
+
+  // Fetch the weekday/hour matrix of actuals from the backend (All_streets is aggregated client-side)
+  useEffect(() => {
+    setServerMatrix(null);
+    if (!rangeStart || !rangeEnd || street === 'All_streets') return;
+
+    let cancelled = false;
+    pedestrianAPI.getHeatmap(street, rangeStart, rangeEnd)
+      .then(matrix => {
+        if (!cancelled) setServerMatrix(matrix);
+      })
+      .catch(error => {
+        console.error('Error fetching heatmap:', error);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [street, rangeStart, rangeEnd]);
+
+  // Process data when the matrix, hourlyData or predictions change
   useEffect(() => {
-    if (!hourlyData.length && !hourlyPredictions.length) return;
+    if (!serverMatrix && !hourlyData.length && !hourlyPredictions.length) return;
 
     // Map date strings to day indices for filtering
     const dateToDay = new Map<string, number>();
@@ -86,24 +109,37 @@ export function HeatmapVisualization({ hourlyData, hourlyPredictions = [], loadi
       }
     });
 
-    // Aggregate actual data by day and hour
-    hourlyData.forEach(entry => {
-      const dateStr = entry.date;
-      let day: number;
-      if (dateToDay.size > 0) {
-        if (!dateToDay.has(dateStr)) return;
-        day = dateToDay.get(dateStr)!;
-      } else {
-        const date = new Date(dateStr);
-        day = date.getDay();
-      }
-      const hour = entry.hour;
-      const key = `${day}-${hour}`;
-      accumulator[key].sum += entry.total;
-      accumulator[key].count += 1;
-      // Mark as not prediction
-      accumulator[key].isPrediction = false;
-    });
+    if (serverMatrix) {
+      // Actuals come pre-aggregated from the backend (row 0 = Sunday)
+      serverMatrix.matrix.forEach((row, day) => {
+        row.forEach((mean, hour) => {
+          const count = serverMatrix.counts[day][hour];
+          if (mean === null || count === 0) return;
+          const key = `${day}-${hour}`;
+          accumulator[key].sum += mean * count;
+          accumulator[key].count += count;
+        });
+      });
+    } else {
+      // Fallback without server matrix: aggregate actual data by day and hour
+      hourlyData.forEach(entry => {
+        const dateStr = entry.date;
+        let day: number;
+        if (dateToDay.size > 0) {
+          if (!dateToDay.has(dateStr)) return;
+          day = dateToDay.get(dateStr)!;
+        } else {
+          const date = new Date(dateStr);
+          day = date.getDay();
+        }
+        const hour = entry.hour;
+        const key = `${day}-${hour}`;
+        accumulator[key].sum += entry.total;
+        accumulator[key].count += 1;
+        // Mark as not prediction
+        accumulator[key].isPrediction = false;
+      });
+    }
 
     // Aggregate predictions for today (if no actual) and future hours/days
     hourlyPredictions.forEach(entry => {
@@ -147,7 +183,7 @@ export function HeatmapVisualization({ hourlyData, hourlyPredictions = [], loadi
     });
 
     setHeatmapData(processedData);
-  }, [hourlyData, hourlyPredictions, dateRange]);
+  }, [serverMatrix, hourlyData, hourlyPredictions, dateRange]);
 
   // Find max value for color scaling
     const maxValue = Math.max(...heatmapData.map(d => d.value)) || 1; // Prevent division by zero  // Color scale function with 5 distinct levels
@@ -17,7 +17,7 @@ function getPercentChange(today: number, yesterday: number) {
 import { Badge } from '@/components/ui/badge';
 import { Separator } from '@/components/ui/separator';
 import { TrendingUp, MapPin } from 'lucide-react';
-import { DashboardFilters, StatisticsData, HourlyDataPoint, DailyDataPoint, CalendarEvent, PredictionRecord, StreetTotal, ComparisonSeries } from '@/lib/types';
+import { DashboardFilters, StatisticsData, HourlyDataPoint, DailyDataPoint, CalendarEvent, CalendarRangeResponse, PredictionRecord, StreetTotal, ComparisonSeries } from '@/lib/types';
 import { pedestrianAPI } from '@/lib/api';
 import { StreetFilter } from './filters/street-filter';
 import { DateFilter } from './filters/date-filter';
@@ -26,7 +26,7 @@ import { DataVisualization } from './charts/data-visualization';
 import { HeatmapVisualization } from './charts/heatmap-visualization';
 import { StatisticsCards } from './statistics/statistics-cards';
 import { ThemeToggle } from './theme-toggle';
-import { eachDayOfInterval, format, isAfter, addMonths, subMonths } from 'date-fns';
+import { eachDayOfInterval, format, isAfter, addMonths, subMonths, parseISO } from 'date-fns';
 
 export function Dashboard() {
   const [filters, setFilters] = useState<DashboardFilters>({
@@ -79,39 +79,19 @@ export function Dashboard() {
   const today = new Date();
   const futureEnd = addMonths(new Date(today), 3);
 
-        const dates: Date[] = [];
-        const cur = new Date(today);
-        cur.setHours(0, 0, 0, 0);
-        futureEnd.setHours(0, 0, 0, 0);
-
-        while (cur <= futureEnd) {
-          dates.push(new Date(cur));
-          cur.setDate(cur.getDate() + 1);
-        }
-
-        const promises = dates.map(async (date) => {
-          const dateStr = date.toISOString().split('T')[0];
-          try {
-            const eventsInfo: any = await pedestrianAPI.getEventsForDate(dateStr);
-            const dateEvents: CalendarEvent[] = [];
-
-            if (eventsInfo && Array.isArray(eventsInfo.events)) {
-              eventsInfo.events.forEach((evt: any) => {
-                dateEvents.push({
-                  date: new Date(date),
-                  type: evt.is_concert ? 'concert' : 'event',
-                  name: evt.event_name ?? 'Unnamed Event',
-                  description: evt.is_concert ? 'Concert' : 'Event',
-                });
-              });
-            }
-            return dateEvents;
-          } catch {
-            return [];
-          }
-        });
-
-        const allResults = (await Promise.all(promises)).flat();
+        const calendar = await pedestrianAPI.getCalendarRange(
+          format(today, 'yyyy-MM-dd'),
+          format(futureEnd, 'yyyy-MM-dd')
+        );
+
+        const allResults: CalendarEvent[] = Object.entries(calendar.days).flatMap(([dateStr, day]) =>
+          day.events.map(evt => ({
+            date: parseISO(dateStr),
+            type: evt.is_concert ? 'concert' as const : 'event' as const,
+            name: evt.event_name ?? 'Unnamed Event',
+            description: evt.is_concert ? 'Concert' : 'Event',
+          }))
+        );
         allResults.sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime());
         setFutureEvents(allResults);
       } catch (err) {
@@ -650,14 +630,23 @@ useEffect(() => {
           }
 
           const results = await Promise.all(streets.map(st =>
-            pedestrianAPI.getHistoricalData(st, startStr, endStr)
+            pedestrianAPI.getRollup(st, startStr, endStr, 'day')
           ));
 
-          const allData = results.flatMap(r => r?.data ?? []);
-          dailyData = pedestrianAPI.transformToDailyData(allData);
+          // Sum the daily totals of all streets per date
+          const totals = new Map<string, number>();
+          results.flatMap(r => r?.rollups ?? []).forEach(r => {
+            totals.set(r.start, (totals.get(r.start) ?? 0) + r.total);
+          });
+          dailyData = Array.from(totals, ([date, total]) => ({
+            date,
+            total,
+            avgHourly: 0,
+            weekday: format(new Date(date), 'EEEE'),
+          }));
         } else {
-          const histResp = await pedestrianAPI.getHistoricalData(filters.street, startStr, endStr);
-          dailyData = pedestrianAPI.transformToDailyData(histResp?.data ?? []);
+          const rollupResp = await pedestrianAPI.getRollup(filters.street, startStr, endStr, 'day');
+          dailyData = pedestrianAPI.transformRollupToDailyData(rollupResp?.rollups ?? []);
         }
         
         if (dailyData.length > 0) {
@@ -679,70 +668,59 @@ useEffect(() => {
     const today = new Date();
     const startWindow = subMonths(new Date(today), 6);
     const endWindow = addMonths(new Date(today), 3);
-    const dates: Date[] = [];
-    const currentDate = new Date(startWindow);
-    currentDate.setHours(0, 0, 0, 0);
-    endWindow.setHours(0, 0, 0, 0);
-    while (currentDate <= endWindow) {
-      dates.push(new Date(currentDate));
-      currentDate.setDate(currentDate.getDate()+1);
+    let calendar: CalendarRangeResponse;
+    try {
+      calendar = await pedestrianAPI.getCalendarRange(
+        format(startWindow, 'yyyy-MM-dd'),
+        format(endWindow, 'yyyy-MM-dd')
+      );
+    } catch {
+      setCalendarEvents([]);
+      return;
     }
 
-    const promises = dates.map(async (date) => {
-      const dateStr = date.toISOString().split('T')[0];
-      try {
-        const [calendarInfo, eventsInfo] = await Promise.all([
-          pedestrianAPI.getCalendarInfo(dateStr),
-          pedestrianAPI.getEventsForDate(dateStr),
-        ]);
-
-        const dateEvents: CalendarEvent[] = [];
+    const allEvents = Object.entries(calendar.days).flatMap(([dateStr, calendarInfo]) => {
+      const date = parseISO(dateStr);
+      const dateEvents: CalendarEvent[] = [];
 
-        if (calendarInfo.is_public_holiday) {
-          dateEvents.push({
-            date: new Date(date),
-            type: 'holiday',
-            name: calendarInfo.public_holiday_name || 'Public Holiday',
-            description: calendarInfo.is_nationwide_holiday ? 'National Holiday' : 'Regional Holiday',
-          });
-        }
+      if (calendarInfo.is_public_holiday) {
+        dateEvents.push({
+          date,
+          type: 'holiday',
+          name: calendarInfo.public_holiday_name || 'Public Holiday',
+          description: calendarInfo.is_nationwide_holiday ? 'National Holiday' : 'Regional Holiday',
+        });
+      }
 
-        if (calendarInfo.is_school_holiday) {
-          dateEvents.push({
-            date: new Date(date),
-            type: 'school_holiday',
-            name: calendarInfo.school_holiday_name || 'School Holiday',
-            description: 'School break period',
-          });
-        }
+      if (calendarInfo.is_school_holiday) {
+        dateEvents.push({
+          date,
+          type: 'school_holiday',
+          name: calendarInfo.school_holiday_name || 'School Holiday',
+          description: 'School break period',
+        });
+      }
 
-        if (calendarInfo.is_jmu_lecture_period || calendarInfo.is_thws_lecture_period) {
-          dateEvents.push({
-            date: new Date(date),
-            type: 'lecture',
-            name: 'University Lecture Period',
-            description: 'Regular semester period',
-          });
-        }
+      if (calendarInfo.is_jmu_lecture_period || calendarInfo.is_thws_lecture_period) {
+        dateEvents.push({
+          date,
+          type: 'lecture',
+          name: 'University Lecture Period',
+          description: 'Regular semester period',
+        });
+      }
 
-        if (eventsInfo.has_events) {
-          eventsInfo.events.forEach(event => {
-            dateEvents.push({
-              date: new Date(date),
-              type: event.is_concert ? 'concert' : 'event',
-              name: event.event_name,
-              description: event.is_concert ? 'Concert' : 'Event',
-            });
-          });
-        }
+      calendarInfo.events.forEach(event => {
+        dateEvents.push({
+          date,
+          type: event.is_concert ? 'concert' : 'event',
+          name: event.event_name,
+          description: event.is_concert ? 'Concert' : 'Event',
+        });
+      });
 
-        return dateEvents;
-      } catch {
-        return [];
-      }
+      return dateEvents;
     });
-
-    const allEvents = (await Promise.all(promises)).flat();
     allEvents.sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime());
     setCalendarEvents(allEvents);
   };
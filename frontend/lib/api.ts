@@ -2,9 +2,14 @@ import {
   PedestrianData,
   StreetsResponse,
   CalendarInfo,
+  CalendarRangeResponse,
   EventsResponse,
   HistoricalDataResponse,
   StatisticsData,
+  HeatmapMatrix,
+  RollupGranularity,
+  RollupResponse,
+  Rollup,
   HourlyDataPoint,
   DailyDataPoint
 } from './types';
@@ -67,6 +72,16 @@ class PedestrianAPI {
     return this.fetchWithErrorHandling(`/api/calendar/${date}`) as Promise<CalendarInfo>;
   }
 
+  // Calendar for a whole window (one request instead of one per day)
+  async getCalendarRange(startDate: string, endDate: string): Promise<CalendarRangeResponse> {
+    const params = new URLSearchParams({
+      start_date: startDate,
+      end_date: endDate,
+    });
+
+    return this.fetchWithErrorHandling(`/api/calendar?${params}`) as Promise<CalendarRangeResponse>;
+  }
+
   // Events API
   async getEventsForDate(date: string): Promise<EventsResponse> {
     return this.fetchWithErrorHandling(`/api/events/${date}`) as Promise<EventsResponse>;
@@ -102,91 +117,53 @@ class PedestrianAPI {
     }
   }
 
-  // Statistics calculation
+  // Statistics (computed server-side, see /api/pedestrians/statistics)
   async getStatistics(
     street: string,
     startDate: string,
     endDate: string
   ): Promise<StatisticsData> {
-    const data = await this.getHistoricalData(street, startDate, endDate);
-
-    if (data.data.length === 0) {
-      return {
-        totalPedestrians: 0,
-        avgHourlyCount: 0,
-        peakHour: 0,
-        peakCount: 0,
-        directionRatio: 0,
-        weatherImpact: 'low'
-      };
-    }
-
-    const total = data.data.reduce((sum, item) => sum + item.n_pedestrians, 0);
-    const avgHourly = total / data.data.length;
-
-    // Find peak hour
-    const hourlyGroups = data.data.reduce((acc, item) => {
-      const hour = parseInt(item.hour);
-      if (!acc[hour]) acc[hour] = [];
-      acc[hour].push(item.n_pedestrians);
-      return acc;
-    }, {} as Record<number, number[]>);
-
-    let peakHour = 0;
-    let peakCount = 0;
-    Object.entries(hourlyGroups).forEach(([hour, counts]) => {
-      const hourTotal = counts.reduce((sum, count) => sum + count, 0);
-      if (hourTotal > peakCount) {
-        peakCount = hourTotal;
-        peakHour = parseInt(hour);
-      }
+    const params = new URLSearchParams({
+      street,
+      start_date: startDate,
+      end_date: endDate,
     });
 
-    // Direction ratio (towards / total)
-    const towardsTotal = data.data.reduce((sum, item) => sum + item.n_pedestrians_towards, 0);
-    const directionRatio = total > 0 ? (towardsTotal / total) * 100 : 0;
-
-    // Simple weather impact calculation
-    const weatherImpact = this.calculateWeatherImpact(data.data);
-
-    return {
-      totalPedestrians: total,
-      avgHourlyCount: Math.round(avgHourly),
-      peakHour,
-      peakCount,
-      directionRatio: Math.round(directionRatio),
-      weatherImpact
-    };
+    return this.fetchWithErrorHandling(`/api/pedestrians/statistics?${params}`) as Promise<StatisticsData>;
   }
 
-  private calculateWeatherImpact(data: PedestrianData[]): 'low' | 'medium' | 'high' {
-    // Simple heuristic based on temperature correlation
-    const validData = data.filter(item => item.temperature !== null && item.temperature !== undefined);
-    if (validData.length < 10) return 'low';
-
-    const temps = validData.map(item => item.temperature!);
-    const counts = validData.map(item => item.n_pedestrians);
-
-    const correlation = this.calculateCorrelation(temps, counts);
-    const absCorrelation = Math.abs(correlation);
+  // Weekday x hour matrix (computed server-side, see /api/pedestrians/heatmap)
+  async getHeatmap(
+    street: string,
+    startDate: string,
+    endDate: string,
+    metric: string = 'mean'
+  ): Promise<HeatmapMatrix> {
+    const params = new URLSearchParams({
+      street,
+      start_date: startDate,
+      end_date: endDate,
+      metric,
+    });
 
-    if (absCorrelation > 0.7) return 'high';
-    if (absCorrelation > 0.4) return 'medium';
-    return 'low';
+    return this.fetchWithErrorHandling(`/api/pedestrians/heatmap?${params}`) as Promise<HeatmapMatrix>;
   }
 
-  private calculateCorrelation(x: number[], y: number[]): number {
-    const n = x.length;
-    const sumX = x.reduce((a, b) => a + b, 0);
-    const sumY = y.reduce((a, b) => a + b, 0);
-    const sumXY = x.reduce((sum, xi, i) => sum + xi * y[i], 0);
-    const sumX2 = x.reduce((sum, xi) => sum + xi * xi, 0);
-    const sumY2 = y.reduce((sum, yi) => sum + yi * yi, 0);
-
-    const numerator = n * sumXY - sumX * sumY;
-    const denominator = Math.sqrt((n * sumX2 - sumX * sumX) * (n * sumY2 - sumY * sumY));
+  // Daily / ISO week / monthly totals (maintained server-side, see /api/pedestrians/rollup)
+  async getRollup(
+    street: string,
+    startDate: string,
+    endDate: string,
+    granularity: RollupGranularity = 'day'
+  ): Promise<RollupResponse> {
+    const params = new URLSearchParams({
+      street,
+      start_date: startDate,
+      end_date: endDate,
+      granularity,
+    });
 
-    return denominator === 0 ? 0 : numerator / denominator;
+    return this.fetchWithErrorHandling(`/api/pedestrians/rollup?${params}`) as Promise<RollupResponse>;
   }
 
   // Data transformation helpers
@@ -256,6 +233,17 @@ class PedestrianAPI {
     });
   }
 
+  // Daily rollups in the DailyDataPoint shape (no weather condition, rollups only keep counts and temperature)
+  transformRollupToDailyData(rollups: Rollup[]): DailyDataPoint[] {
+    return rollups.map(r => ({
+      date: r.start,
+      total: r.total,
+      avgHourly: r.hours > 0 ? Math.round(r.total / r.hours) : 0,
+      weekday: new Date(r.start).toLocaleDateString('en-US', { weekday: 'long' }),
+      temperature: r.avg_temperature !== null ? Math.round(r.avg_temperature) : undefined,
+    }));
+  }
+
   // Add this helper function to get the most frequent weather condition
   private getMostFrequent(arr: string[]): string {
     return arr.sort((a,b) =>
@@ -63,6 +63,17 @@ export interface EventsResponse {
   events: EventInfo[];
 }
 
+export interface CalendarDay extends Omit<CalendarInfo, 'date'> {
+  events: EventInfo[];
+}
+
+export interface CalendarRangeResponse {
+  start_date: string;
+  end_date: string;
+  count: number;
+  days: Record<string, CalendarDay>; // yyyy-MM-dd -> day
+}
+
 export interface HistoricalDataResponse {
   street: string;
   period: {
@@ -82,6 +93,41 @@ export interface StatisticsData {
   weatherImpact: 'low' | 'medium' | 'high';
 }
 
+export type RollupGranularity = 'day' | 'week' | 'month';
+
+export interface Rollup {
+  period: string;          // 2024-03-05 | 2024-W10 | 2024-03
+  start: string;           // first day of the period
+  total: number;
+  towards: number;
+  away: number;
+  hours: number;           // hours counted
+  peak_value: number | null;
+  peak_hour: string | null;
+  avg_temperature: number | null;
+}
+
+export interface RollupResponse {
+  street: string;
+  granularity: RollupGranularity;
+  start_date: string;
+  end_date: string;
+  count: number;
+  rollups: Rollup[];
+}
+
+export interface HeatmapMatrix {
+  street: string;
+  start_date: string;
+  end_date: string;
+  metric: string;          // mean | median | total | p1-p99
+  days: string[];          // rows, 0 = Sunday (like Date.getDay())
+  matrix: (number | null)[][]; // 7 x 24, null = no data
+  counts: number[][];      // hours per cell
+  hours: number;
+  cached: boolean;
+}
+
 export interface DashboardFilters {
   street: string;
   dateRange: {